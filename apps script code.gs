@@ -2427,6 +2427,63 @@ function JSON파일생성() {
   }
 }
 
+/**
+ * 🆕 제출기록/장기오프 내보내기 (Python 출석 집계용, doGet action=exportRecords)
+ * - 제출기록 시트를 한 번만 읽어 날짜를 yyyy-MM-dd로 정규화한 행 목록으로 반환
+ * - 장기오프는 승인된(또는 자동 승인) 기간만 포함
+ * @returns {Object} {생성일시, 조원, 열, 기록: [[...]], 장기오프: [{이름, 시작, 끝, 사유}]}
+ */
+function 제출기록내보내기() {
+  const ss = SpreadsheetApp.getActiveSpreadsheet();
+  const records = ss.getSheetByName(CONFIG.SHEET_NAME)?.getDataRange().getValues() || [];
+  const longOffRows = ss.getSheetByName(CONFIG.LONG_OFF_SHEET)?.getDataRange().getValues() || [];
+  const toDateStr = value => typeof value === 'string'
+    ? value
+    : Utilities.formatDate(new Date(value), 'Asia/Seoul', 'yyyy-MM-dd');
+
+  const 기록 = [];
+  for (let i = 1; i < records.length; i++) {
+    const [timestamp, name, dateStr, fileCount, links, folderLink, status, weekNum, reason] = records[i];
+    if (!name || !dateStr) continue;
+    기록.push([
+      String(timestamp),
+      name,
+      toDateStr(dateStr),
+      fileCount || 0,
+      links || '',
+      folderLink || '',
+      status,
+      weekNum,
+      reason || ''
+    ]);
+  }
+
+  const 장기오프 = [];
+  for (let i = 1; i < longOffRows.length; i++) {
+    const row = longOffRows[i];
+    const approved = row[CONFIG.FORM_COLUMNS.APPROVED];
+    if (!CONFIG.LONG_OFF_AUTO_APPROVE && approved !== 'O' && approved !== 'o') continue;
+    try {
+      장기오프.push({
+        이름: String(row[CONFIG.FORM_COLUMNS.NAME]).trim(),
+        시작: toDateStr(row[CONFIG.FORM_COLUMNS.START_DATE]),
+        끝: toDateStr(row[CONFIG.FORM_COLUMNS.END_DATE]),
+        사유: row[CONFIG.FORM_COLUMNS.REASON] || '장기오프'
+      });
+    } catch (e) {
+      Logger.log(`장기오프 내보내기 날짜 오류 (${i + 1}행): ${e.message}`);
+    }
+  }
+
+  return {
+    생성일시: new Date().toISOString(),
+    조원: Object.keys(CONFIG.MEMBERS),
+    열: ['타임스탬프', '이름', '날짜', '파일수', '링크', '폴더링크', '출석상태', '주차', '사유'],
+    기록,
+    장기오프
+  };
+}
+
 /**
  * 특정 월의 데이터를 폴더에서 수동 수집
  * @param {string} yearMonth - 년월 (yyyy-MM)
@@ -3703,6 +3760,13 @@ function doGet(e) {
         .setMimeType(ContentService.MimeType.JSON);
     }
 
+    // 2-1. 🆕 제출기록 내보내기 (action=exportRecords, Python 출석 집계용)
+    if (params.action === 'exportRecords') {
+      return ContentService
+        .createTextOutput(JSON.stringify(제출기록내보내기()))
+        .setMimeType(ContentService.MimeType.JSON);
+    }
+
     // 3. 출석/주간 통계 JSON (month 파라미터)
     const month = params.month || Utilities.formatDate(new Date(), Session.getScriptTimeZone(), 'yyyy-MM');
     const type = params.type || 'attendance';
@@ -0,0 +1,393 @@
+"""
+출석 집계 (Python)
+
+Apps Script의 월별주간집계/주간인증계산/JSON파일생성은 호출할 때마다 제출기록 시트를
+getDataRange().getValues()로 다시 읽고, 회원×날짜마다 출석확인/장기오프확인을 반복한다.
+이 모듈은 제출기록 내보내기(CSV 또는 Apps Script action=exportRecords JSON)를 한 번 읽어
+- 회원×날짜 상태 행렬(NumPy)을 만들고
+- 주간 인증/결석, 월간 출석/결석/오프, 경고·벌칙 후보를 벡터 연산 한 번으로 계산한 뒤
+- 웹 뷰가 읽는 형식 그대로 output/attendance/에 저장한다.
+    attendance_summary_YYYY-MM.json  (JSON파일생성 형식)
+    weekly_summary_YYYY-MM.json      (주간집계JSON저장 형식 + 주차정보, 벌칙후보)
+저장된 파일을 JSON_FOLDER_ID 폴더에 올리면 웹 뷰(doGet)가 그대로 사용한다.
+
+사용법:
+    python main.py --attendance                          # 이번 달 (Apps Script에서 내보내기)
+    python main.py --attendance 2026-01                  # 지정 월
+    python main.py --attendance 2026-01 --export 제출기록.csv   # 시트에서 내려받은 CSV/JSON 사용
+"""
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import APPS_SCRIPT_URL, OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+ATTENDANCE_OUTPUT_DIR = OUTPUT_DIR / "attendance"
+
+# 제출기록 시트 열 (출석기록추가의 헤더 순서)
+SHEET_COLUMNS = ["타임스탬프", "이름", "날짜", "파일수", "링크", "폴더링크", "출석상태", "주차", "사유"]
+COLUMN_NAMES = ["timestamp", "name", "date", "file_count", "links", "folder_link", "status", "week_num", "reason"]
+
+# 상태 행렬 값 (NONE: 기록 없음, ABSENT: O/OFF/LONG_OFF 외의 상태)
+NONE, PRESENT, OFF, LONG_OFF, ABSENT = range(5)
+STATUS_CODES = {"O": PRESENT, "OFF": OFF, "LONG_OFF": LONG_OFF}
+
+# 주간 규칙: 주 4회 인증 (장기오프 일수만큼 차감), 월 결석 3회 경고 / 4회 이상 벌칙
+WEEKLY_REQUIRED = 4
+WARNING_ABSENCES = 3
+PENALTY_ABSENCES = 4
+
+WEEK_GUIDE = {
+    "주기준": "월요일 시작",
+    "설명": "각 주는 월요일부터 일요일까지입니다. 월요일이 속한 달의 주로 계산됩니다.",
+    "예시": "11월 25일(월)~12월 1일(일) → 11월 4주차",
+}
+
+
+# =========================================
+# 내보내기 읽기
+# =========================================
+
+def fetch_export() -> dict:
+    """
+    Apps Script 웹앱에서 제출기록 내보내기 (action=exportRecords)
+
+    Raises:
+        RuntimeError: URL 미설정 또는 요청 실패 시
+    """
+    import requests
+
+    from drive_scanner import get_http_session
+    from resilience import call_with_retry
+
+    if not APPS_SCRIPT_URL:
+        raise RuntimeError("APPS_SCRIPT_URL이 설정되지 않았습니다. .env 파일을 확인하세요.")
+
+    def _get():
+        resp = get_http_session().get(APPS_SCRIPT_URL, params={"action": "exportRecords"}, timeout=120)
+        resp.raise_for_status()
+        return resp.json()
+
+    try:
+        return call_with_retry("apps_script", _get, max_attempts=3, base_delay=5, label="제출기록 내보내기")
+    except (requests.RequestException, ValueError) as e:
+        raise RuntimeError(f"제출기록 내보내기 실패: {e}")
+
+
+def load_export(path: Optional[Path] = None) -> Tuple[pd.DataFrame, pd.DataFrame, List[str]]:
+    """
+    제출기록 내보내기 읽기 (path가 없으면 Apps Script에서 가져옴)
+
+    - .csv: 제출기록 시트를 CSV로 내려받은 파일 (헤더 포함, 장기오프는 LONG_OFF 기록만 반영)
+    - .json: 제출기록내보내기() 결과
+
+    Returns:
+        (제출 기록 DataFrame, 장기오프 기간 DataFrame[name, start, end], 조원 목록)
+    """
+    if path is not None and Path(path).suffix.lower() == ".csv":
+        records = pd.read_csv(path, dtype=str, keep_default_na=False)
+        records = records.reindex(columns=SHEET_COLUMNS, fill_value="")
+        long_off = []
+        members: List[str] = []
+    else:
+        data = json.loads(Path(path).read_text(encoding="utf-8")) if path else fetch_export()
+        records = pd.DataFrame(data.get("기록", []), columns=data.get("열", SHEET_COLUMNS))
+        long_off = [(r["이름"], r["시작"], r["끝"]) for r in data.get("장기오프", [])]
+        members = list(data.get("조원", []))
+
+    records = records.reindex(columns=SHEET_COLUMNS)
+    records.columns = COLUMN_NAMES
+    records = records[records["name"].astype(str).str.strip() != ""].copy()
+    records["name"] = records["name"].astype(str).str.strip()
+    records["date"] = pd.to_datetime(records["date"].astype(str).str[:10], errors="coerce")
+    records = records.dropna(subset=["date"]).reset_index(drop=True)
+    records["status"] = records["status"].fillna("").astype(str).str.strip()
+    records["file_count"] = pd.to_numeric(records["file_count"], errors="coerce").fillna(0).astype(int)
+    for column in ("links", "folder_link", "reason", "week_num"):
+        records[column] = records[column].fillna("").astype(str)
+
+    long_off_df = pd.DataFrame(long_off, columns=["name", "start", "end"])
+    long_off_df["start"] = pd.to_datetime(long_off_df["start"].astype(str).str[:10], errors="coerce")
+    long_off_df["end"] = pd.to_datetime(long_off_df["end"].astype(str).str[:10], errors="coerce")
+    long_off_df = long_off_df.dropna()
+    return records, long_off_df, members
+
+
+# =========================================
+# 회원×날짜 행렬
+# =========================================
+
+def month_weeks(year: int, month: int) -> List[date]:
+    """월별주목록가져오기와 같은 규칙: 이 달에 속한 월요일 목록 (각 주는 월~일)"""
+    first = date(year, month, 1)
+    monday = first + timedelta(days=(7 - first.weekday()) % 7)
+    weeks = []
+    while monday.month == month:
+        weeks.append(monday)
+        monday += timedelta(days=7)
+    return weeks
+
+
+class AttendanceMatrix:
+    """
+    회원×날짜 상태 행렬
+
+    같은 회원/날짜에 기록이 여러 개면 O를 우선하고, 그 외에는 마지막 기록을 사용한다
+    (출석데이터인덱싱과 같은 O 우선 규칙, 관리자 수정처럼 나중에 추가된 기록 반영).
+    """
+
+    def __init__(self, records: pd.DataFrame, long_off: pd.DataFrame, members: List[str],
+                 start: date, end: date):
+        self.members = list(members)
+        self.start = pd.Timestamp(start)
+        self.days = pd.date_range(start, end, freq="D")
+        shape = (len(self.members), len(self.days))
+
+        cells = pd.DataFrame({
+            "member": pd.Index(self.members).get_indexer(records["name"]),
+            "day": (records["date"] - self.start).dt.days.to_numpy(),
+            "code": records["status"].map(STATUS_CODES).fillna(ABSENT).astype(np.int8).to_numpy(),
+            "row": np.arange(len(records)),
+        })
+        cells = cells[(cells["member"] >= 0) & (cells["day"] >= 0) & (cells["day"] < shape[1])]
+        # 회원/날짜별 기록 하나만 남김: (O 여부, 행 순서)로 정렬해 마지막 것 (O 또는 마지막 기록)
+        cells = (
+            cells.assign(present=cells["code"] == PRESENT)
+            .sort_values(["present", "row"], kind="stable")
+            .drop_duplicates(["member", "day"], keep="last")
+        )
+        member_idx, day_idx = cells["member"].to_numpy(), cells["day"].to_numpy()
+
+        self.status = np.full(shape, NONE, dtype=np.int8)
+        self.status[member_idx, day_idx] = cells["code"].to_numpy()
+        # 칸별로 사용된 기록 행 번호 (-1: 기록 없음)
+        self.row = np.full(shape, -1, dtype=np.int64)
+        self.row[member_idx, day_idx] = cells["row"].to_numpy()
+
+        # 장기오프: LONG_OFF 기록 + 승인된 신청 기간 (주간 집계에서 출석보다 우선)
+        self.long_off = self.status == LONG_OFF
+        by_name = {name.lower(): m for m, name in enumerate(self.members)}
+        for name, first, last in long_off.itertuples(index=False):
+            # 장기오프확인과 같이 이름은 대소문자 무시
+            m = by_name.get(str(name).lower())
+            if m is None:
+                continue
+            lo = max(0, (first - self.start).days)
+            hi = min(shape[1], (last - self.start).days + 1)
+            if lo < hi:
+                self.long_off[m, lo:hi] = True
+
+    def columns(self, first: date, days: int) -> slice:
+        offset = (pd.Timestamp(first) - self.start).days
+        return slice(offset, offset + days)
+
+
+# =========================================
+# 집계 (벡터 연산)
+# =========================================
+
+def weekly_summary(matrix: AttendanceMatrix, year: int, month: int, today: Optional[date] = None) -> Dict:
+    """
+    주간인증계산을 모든 회원×주에 한 번에 적용
+
+    Returns:
+        {"weeks": [월요일, ...], "인증"/"장기오프"/"필요"/"결석": (회원, 주) 배열,
+         "전체장기오프": bool 배열, "완료": (주,) bool 배열, "총결석": (회원,) 배열}
+    """
+    today = today or date.today()
+    weeks = month_weeks(year, month)
+    n_members, n_weeks = len(matrix.members), len(weeks)
+    if n_weeks == 0:
+        empty = np.zeros((n_members, 0), dtype=int)
+        return {"weeks": [], "인증": empty, "장기오프": empty, "필요": empty, "결석": empty,
+                "전체장기오프": empty.astype(bool), "완료": np.zeros(0, dtype=bool),
+                "총결석": np.zeros(n_members, dtype=int)}
+
+    span = matrix.columns(weeks[0], 7 * n_weeks)
+    status = matrix.status[:, span].reshape(n_members, n_weeks, 7)
+    long_off = matrix.long_off[:, span].reshape(n_members, n_weeks, 7)
+
+    certified = ((status == PRESENT) & ~long_off).sum(axis=2)
+    long_off_days = long_off.sum(axis=2)
+    all_long_off = long_off_days == 7
+    required = np.where(all_long_off, 0, np.maximum(0, WEEKLY_REQUIRED - long_off_days))
+    # 주가 끝난(일요일이 지난) 주만 결석 확정
+    completed = np.array([monday + timedelta(days=6) < today for monday in weeks])
+    shortfall = np.minimum(WEEKLY_REQUIRED, np.maximum(0, required - certified))
+    absences = np.where(completed[None, :] & ~all_long_off, shortfall, 0)
+
+    return {
+        "weeks": weeks,
+        "인증": certified,
+        "장기오프": long_off_days,
+        "필요": required,
+        "결석": absences,
+        "전체장기오프": all_long_off,
+        "완료": completed,
+        "총결석": absences.sum(axis=1),
+    }
+
+
+def penalty_candidates(members: List[str], total_absences: np.ndarray) -> Dict[str, List[str]]:
+    """월 결석 횟수 기준 경고/벌칙 후보"""
+    total = np.asarray(total_absences)
+    names = np.array(members, dtype=object)
+    return {
+        "벌칙": names[total >= PENALTY_ABSENCES].tolist(),
+        "경고": names[total == WARNING_ABSENCES].tolist(),
+    }
+
+
+def monthly_summary(matrix: AttendanceMatrix, records: pd.DataFrame, year: int, month: int) -> Dict[str, dict]:
+    """JSON파일생성 형식의 월간 출석 요약 (회원별 출석/결석/오프/장기오프, 날짜별 기록, 주차별 통계)"""
+    first = date(year, month, 1)
+    n_days = (date(year + month // 12, month % 12 + 1, 1) - first).days
+    span = matrix.columns(first, n_days)
+    status = matrix.status[:, span]
+    counts = {
+        label: (status == code).sum(axis=1)
+        for label, code in (("출석", PRESENT), ("결석", ABSENT), ("오프", OFF), ("장기오프", LONG_OFF))
+    }
+
+    # 기록이 있는 칸만 모아 한 번에 표 만들기
+    member_pos, day_pos = np.nonzero(status != NONE)
+    cells = records.iloc[matrix.row[:, span][member_pos, day_pos]].reset_index(drop=True)
+    cells["member"] = np.array(matrix.members, dtype=object)[member_pos]
+    cells["day"] = day_pos + 1
+    cells["code"] = status[member_pos, day_pos]
+    first_link = cells["links"].str.split("\n").str[0].str.split(": ").str[1]
+    cells["link"] = cells["folder_link"].where(cells["folder_link"] != "", first_link.fillna(cells["links"]))
+
+    if cells.empty:
+        cells["week_num"] = pd.Series(dtype=str)
+    weekly = (
+        cells.assign(week=cells["week_num"].str.replace(r"\.0$", "", regex=True) + "주차")
+        .pivot_table(index=["member", "week"], columns="code", values="day", aggfunc="count", fill_value=0)
+        .reindex(columns=[PRESENT, ABSENT, OFF, LONG_OFF], fill_value=0)
+    )
+
+    summary = {}
+    for m, name in enumerate(matrix.members):
+        absences = int(counts["결석"][m])
+        summary[name] = {
+            "출석": int(counts["출석"][m]),
+            "결석": absences,
+            "오프": int(counts["오프"][m]),
+            "장기오프": int(counts["장기오프"][m]),
+            "경고": absences == WARNING_ABSENCES,
+            "벌칙": absences >= PENALTY_ABSENCES,
+            "기록": {},
+            "주간통계": {},
+        }
+
+    for row in cells.itertuples(index=False):
+        summary[row.member]["기록"][str(row.day)] = {
+            "status": row.status,
+            "link": row.link,
+            "fileCount": int(row.file_count),
+            "reason": row.reason,
+        }
+    for (name, week), row in weekly.iterrows():
+        summary[name]["주간통계"][week] = {
+            "출석": int(row[PRESENT]),
+            "결석": int(row[ABSENT]),
+            "오프": int(row[OFF]),
+            "장기오프": int(row[LONG_OFF]),
+        }
+    return summary
+
+
+def weekly_json(year_month: str, members: List[str], weekly: Dict) -> Dict:
+    """주간집계JSON저장 형식 (+ 웹 뷰가 날짜 표시에 쓰는 주차정보, 벌칙후보)"""
+    data = {
+        "년월": year_month,
+        "생성일시": datetime.now().isoformat(timespec="seconds"),
+        "안내": WEEK_GUIDE,
+        "주차정보": [
+            {"주차": i + 1, "시작": f"{monday:%Y-%m-%d}", "끝": f"{monday + timedelta(days=6):%Y-%m-%d}"}
+            for i, monday in enumerate(weekly["weeks"])
+        ],
+        "조원별집계": {},
+        "벌칙후보": penalty_candidates(members, weekly["총결석"]),
+    }
+    for m, name in enumerate(members):
+        data["조원별집계"][name] = {
+            "총결석": int(weekly["총결석"][m]),
+            "주차별": [
+                {
+                    "주차": w + 1,
+                    "인증": int(weekly["인증"][m, w]),
+                    "필요": int(weekly["필요"][m, w]),
+                    "장기오프": int(weekly["장기오프"][m, w]),
+                    "결석": int(weekly["결석"][m, w]),
+                    "상태": "완료" if weekly["완료"][w] else "진행중",
+                    "전체장기오프": bool(weekly["전체장기오프"][m, w]),
+                }
+                for w in range(len(weekly["weeks"]))
+            ],
+        }
+    return data
+
+
+def save_results(year_month: str, summary: Dict, weekly: Dict) -> Tuple[Path, Path]:
+    ATTENDANCE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    summary_path = ATTENDANCE_OUTPUT_DIR / f"attendance_summary_{year_month}.json"
+    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    weekly_path = ATTENDANCE_OUTPUT_DIR / f"weekly_summary_{year_month}.json"
+    weekly_path.write_text(json.dumps(weekly, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info(f"  💾 저장: {summary_path}, {weekly_path}")
+    return summary_path, weekly_path
+
+
+def run_attendance(year_month: Optional[str] = None, export_path: Optional[str] = None) -> bool:
+    """출석 집계 실행 (월 생략 시 이번 달)"""
+    from drive_scanner import _load_member_names
+
+    year_month = year_month or date.today().strftime("%Y-%m")
+    year, month = (int(x) for x in year_month.split("-"))
+    started = time.perf_counter()
+    logger.info("=" * 50)
+    logger.info(f"🗓️ {year_month} 출석 집계 시작")
+    logger.info("=" * 50)
+
+    try:
+        records, long_off, members = load_export(Path(export_path) if export_path else None)
+    except (OSError, ValueError, RuntimeError) as e:
+        logger.error(f"❌ 제출기록 읽기 실패: {e}")
+        return False
+    members = members or _load_member_names()
+    if not members:
+        logger.error("❌ 조원 목록이 없습니다. (내보내기의 조원 또는 members.json)")
+        return False
+    logger.info(f"  제출기록 {len(records)}행, 장기오프 {len(long_off)}건, 조원 {len(members)}명")
+
+    # 마지막 주가 다음 달로 넘어갈 수 있으므로 주 범위까지 포함
+    weeks = month_weeks(year, month)
+    first = date(year, month, 1)
+    last = max(date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1),
+               weeks[-1] + timedelta(days=6) if weeks else first)
+    matrix = AttendanceMatrix(records, long_off, members, first, last)
+
+    weekly = weekly_summary(matrix, year, month)
+    summary = monthly_summary(matrix, records, year, month)
+    weekly_data = weekly_json(year_month, members, weekly)
+    logger.info(f"  📈 집계 완료 ({time.perf_counter() - started:.2f}초)",
+                extra={"stage": "attendance", "duration": time.perf_counter() - started})
+
+    candidates = weekly_data["벌칙후보"]
+    for name in candidates["벌칙"]:
+        logger.warning(f"  🚨 벌칙 대상: {name} (결석 {weekly_data['조원별집계'][name]['총결석']}회)")
+    for name in candidates["경고"]:
+        logger.warning(f"  ⚠️ 경고: {name} (결석 {WARNING_ABSENCES}회)")
+
+    save_results(year_month, summary, weekly_data)
+    logger.info(f"✅ 출석 집계 완료 ({time.perf_counter() - started:.2f}초)")
+    return True
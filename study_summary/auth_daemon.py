@@ -0,0 +1,203 @@
+"""
+NotebookLM 세션 유지 데몬
+
+keep_auth.py는 실행할 때마다 Playwright와 Chromium을 새로 띄운다.
+이 데몬은 영구 프로필 브라우저 컨텍스트 하나를 계속 열어두고
+- 쿠키 만료 일정(auth_schedule.py)에 맞춰 storage_state.json을 갱신하고
+- 로컬 소켓(127.0.0.1:AUTH_DAEMON_PORT)으로 즉시 갱신 요청을 받는다.
+파이프라인의 인증 복구(main.ensure_notebooklm_auth)는 데몬이 떠 있으면
+브라우저 실행 없이 몇 초 만에 끝난다.
+
+사용법:
+    python auth_daemon.py            # 데몬 실행
+    python auth_daemon.py refresh    # 즉시 갱신 요청
+    python auth_daemon.py status     # 실행 여부 확인
+    python auth_daemon.py stop       # 데몬 종료
+"""
+import logging
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from config import AUTH_DAEMON_PORT, AUTH_REFRESH_INTERVAL_HOURS
+from keep_auth import (
+    BROWSER_PROFILE,
+    launch_context,
+    refresh_in_context,
+)
+
+logger = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"
+# 갱신 요청 응답 대기 시간 (페이지 로드 timeout 60초 + 여유)
+REFRESH_TIMEOUT = 90
+
+# 브라우저 스레드로 전달되는 명령: (명령, 응답 큐)
+_commands: "queue.Queue[tuple]" = queue.Queue()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """한 줄 명령 → 한 줄 응답 (refresh / ping / stop)"""
+
+    def handle(self):
+        command = self.rfile.readline().decode("utf-8", "replace").strip().lower()
+        if command == "ping":
+            self.wfile.write(b"pong\n")
+            return
+        if command not in ("refresh", "stop"):
+            self.wfile.write(b"error unknown command\n")
+            return
+
+        reply: "queue.Queue[str]" = queue.Queue(maxsize=1)
+        _commands.put((command, reply))
+        try:
+            result = reply.get(timeout=REFRESH_TIMEOUT)
+        except queue.Empty:
+            result = "timeout"
+        self.wfile.write(f"{result}\n".encode("utf-8"))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def run_daemon(interval_hours: float = AUTH_REFRESH_INTERVAL_HOURS):
+    """
+    데몬 실행. Playwright sync API는 스레드 안전하지 않으므로
+    브라우저 조작은 모두 이 (메인) 스레드에서 하고, 소켓 스레드는 명령만 전달한다.
+    """
+    from playwright.sync_api import sync_playwright
+
+    if not BROWSER_PROFILE.exists():
+        logger.error(f"브라우저 프로필이 없습니다: {BROWSER_PROFILE}")
+        return False
+
+    server = _Server((HOST, AUTH_DAEMON_PORT), _Handler)
+    threading.Thread(target=server.serve_forever, name="auth-daemon-socket", daemon=True).start()
+    logger.info(f"세션 유지 데몬 시작: {HOST}:{AUTH_DAEMON_PORT} (주기 {interval_hours}시간)")
+
+    interval = interval_hours * 3600
+    next_refresh = time.monotonic()  # 시작하자마자 1회 갱신
+    context = None
+
+    with sync_playwright() as p:
+        try:
+            while True:
+                timeout = max(0.0, next_refresh - time.monotonic())
+                try:
+                    command, reply = _commands.get(timeout=timeout)
+                except queue.Empty:
+                    command, reply = "refresh", None
+
+                if command == "stop":
+                    if reply:
+                        reply.put("ok")
+                    break
+
+                started = time.monotonic()
+                try:
+                    if context is None:
+                        logger.info("  브라우저 컨텍스트 실행...")
+                        context = launch_context(p)
+                    ok = refresh_in_context(context)
+                except Exception as e:
+                    # 브라우저가 죽었으면 다음 요청에서 다시 띄움
+                    logger.error(f"세션 갱신 오류: {e}")
+                    ok = False
+                    if context is not None:
+                        try:
+                            context.close()
+                        except Exception:
+                            pass
+                        context = None
+
+                logger.info(f"  세션 갱신 {'성공' if ok else '실패'} ({time.monotonic() - started:.1f}초)")
+                if reply:
+                    reply.put("ok" if ok else "fail")
+                next_refresh = time.monotonic() + _seconds_until_next_refresh(interval, ok)
+        finally:
+            server.shutdown()
+            if context is not None:
+                context.close()
+
+    logger.info("세션 유지 데몬 종료")
+    return True
+
+
+def _seconds_until_next_refresh(interval: float, last_ok: bool) -> float:
+    """
+    쿠키 만료 일정상 다음 갱신까지 남은 초 (최대 interval).
+    실패 직후에는 일정이 '지금'을 가리키므로 최소 5분 간격을 둔다.
+    """
+    from auth_schedule import plan_next_refresh
+
+    when, reason = plan_next_refresh()
+    wait = (when - datetime.now()).total_seconds()
+    wait = min(interval, max(wait, 60 if last_ok else 300))
+    logger.info(f"  다음 갱신: {wait / 60:.0f}분 후 ({reason})")
+    return wait
+
+
+def _send_command(command: str, timeout: float) -> Optional[str]:
+    """데몬에 명령 전송, 데몬이 없으면 None"""
+    try:
+        with socket.create_connection((HOST, AUTH_DAEMON_PORT), timeout=timeout) as sock:
+            sock.sendall(f"{command}\n".encode("utf-8"))
+            with sock.makefile("r", encoding="utf-8") as f:
+                return f.readline().strip()
+    except OSError:
+        return None
+
+
+def is_running() -> bool:
+    """데몬 실행 여부"""
+    return _send_command("ping", timeout=2) == "pong"
+
+
+def request_refresh(timeout: float = REFRESH_TIMEOUT) -> Optional[bool]:
+    """
+    데몬에 즉시 세션 갱신 요청
+
+    Returns:
+        True/False: 갱신 결과, None: 데몬이 실행 중이 아님
+    """
+    result = _send_command("refresh", timeout=timeout)
+    if result is None:
+        return None
+    return result == "ok"
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+
+    if command == "run":
+        from log_setup import setup_logging
+        # keep_auth.py 예약 실행(logs/keep_auth.jsonl)과 로그 파일을 공유하지 않음
+        setup_logging("auth_daemon")
+        return run_daemon()
+    if command == "refresh":
+        result = request_refresh()
+        print({None: "데몬이 실행 중이 아닙니다", True: "갱신 성공", False: "갱신 실패"}[result])
+        return bool(result)
+    if command == "status":
+        running = is_running()
+        print("실행 중" if running else "실행 중이 아님")
+        return running
+    if command == "stop":
+        result = _send_command("stop", timeout=REFRESH_TIMEOUT)
+        print("종료됨" if result == "ok" else "데몬이 실행 중이 아닙니다")
+        return result == "ok"
+
+    print(__doc__)
+    return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
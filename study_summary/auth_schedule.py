@@ -0,0 +1,113 @@
+"""
+NotebookLM 세션 갱신 일정 계산
+
+storage_state.json의 Google 인증 쿠키 만료 시각을 읽어 다음 갱신 시각을 정한다.
+- 가장 먼저 만료되는 핵심 쿠키의 만료 AUTH_EXPIRY_MARGIN_MINUTES 전
+- 마지막 갱신 후 AUTH_MAX_SESSION_AGE_HOURS가 지나기 전 (서버 측 세션 만료 대비)
+- 매일 파이프라인 실행(DAILY_RUN_TIME) 시점에 세션이 오래되었으면
+  실행 AUTH_PRE_RUN_LEAD_MINUTES 전에 갱신
+이 중 가장 이른 시각이 다음 갱신 시각이다.
+"""
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config import (
+    AUTH_EXPIRY_MARGIN_MINUTES,
+    AUTH_MAX_SESSION_AGE_HOURS,
+    AUTH_PRE_RUN_LEAD_MINUTES,
+)
+from keep_auth import STORAGE_PATH
+
+# 갱신 직후 재갱신 방지 (갱신해도 만료 시각이 늘지 않는 쿠키가 있을 때 반복 실행 방지)
+MIN_REFRESH_GAP = timedelta(minutes=30)
+
+# 만료되면 NotebookLM 인증이 끊기는 Google 쿠키
+CRITICAL_COOKIES = {
+    "SID", "HSID", "SSID", "APISID", "SAPISID",
+    "__Secure-1PSID", "__Secure-3PSID",
+    "__Secure-1PSIDTS", "__Secure-3PSIDTS",
+}
+
+
+def load_cookie_expiries(path: Path = STORAGE_PATH) -> Dict[str, datetime]:
+    """
+    storage_state.json에서 핵심 쿠키별 만료 시각 추출
+    (세션 쿠키(expires=-1)는 제외, 같은 이름은 가장 이른 만료 시각)
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+    expiries = {}
+    for cookie in data.get("cookies", []):
+        name = cookie.get("name")
+        expires = cookie.get("expires", -1)
+        if name not in CRITICAL_COOKIES or not expires or expires <= 0:
+            continue
+        when = datetime.fromtimestamp(expires)
+        if name not in expiries or when < expiries[name]:
+            expiries[name] = when
+    return expiries
+
+
+def last_refresh_time(path: Path = STORAGE_PATH) -> Optional[datetime]:
+    """마지막 갱신 시각 (storage_state.json 수정 시각)"""
+    try:
+        return datetime.fromtimestamp(path.stat().st_mtime)
+    except OSError:
+        return None
+
+
+def next_pipeline_run(now: datetime) -> datetime:
+    """다음 파이프라인 실행 시각 (파이프라인 데몬과 같은 DAILY_RUN_TIME 기준)"""
+    from pipeline_daemon import next_daily_run
+    return next_daily_run(now)
+
+
+def plan_next_refresh(now: Optional[datetime] = None, path: Path = STORAGE_PATH) -> Tuple[datetime, str]:
+    """
+    다음 세션 갱신 시각과 사유
+
+    Returns:
+        (갱신 시각, 사유) - 갱신 시각이 now 이전이면 지금 갱신해야 함
+    """
+    now = now or datetime.now()
+    last = last_refresh_time(path)
+    if last is None:
+        return now, "storage_state.json 없음"
+
+    candidates = []
+
+    expiries = load_cookie_expiries(path)
+    if expiries:
+        name, expires = min(expiries.items(), key=lambda item: item[1])
+        candidates.append((
+            expires - timedelta(minutes=AUTH_EXPIRY_MARGIN_MINUTES),
+            f"쿠키 {name} 만료 ({expires:%m-%d %H:%M})",
+        ))
+    else:
+        candidates.append((now, "핵심 쿠키 없음"))
+
+    candidates.append((
+        last + timedelta(hours=AUTH_MAX_SESSION_AGE_HOURS),
+        f"마지막 갱신 후 {AUTH_MAX_SESSION_AGE_HOURS}시간",
+    ))
+
+    # 파이프라인 실행 시점에 세션이 최대 수명의 절반보다 오래되었으면 실행 직전에 갱신
+    run = next_pipeline_run(now)
+    pre_run = run - timedelta(minutes=AUTH_PRE_RUN_LEAD_MINUTES)
+    if last < run - timedelta(hours=AUTH_MAX_SESSION_AGE_HOURS / 2):
+        candidates.append((pre_run, f"{run:%m-%d %H:%M} 파이프라인 실행 전"))
+
+    when, reason = min(candidates, key=lambda c: c[0])
+    return max(when, last + MIN_REFRESH_GAP), reason
+
+
+def is_refresh_due(now: Optional[datetime] = None, path: Path = STORAGE_PATH) -> Tuple[bool, datetime, str]:
+    """지금 갱신해야 하는지 여부 (due, 예정 시각, 사유)"""
+    now = now or datetime.now()
+    when, reason = plan_next_refresh(now, path)
+    return when <= now, when, reason
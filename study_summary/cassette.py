@@ -0,0 +1,364 @@
+"""
+외부 응답 녹화/재생 (카세트) - 성능 회귀 비교용
+
+실제 실행 중 외부 서비스 응답을 녹화해 두었다가, 같은 입력으로 파이프라인을 다시 돌린다.
+- Apps Script digest HTML (drive_scanner.fetch_digest_html)
+- NotebookLM 인포그래픽 원본 이미지와 생성 소요 시간 (infographic_generator)
+- Slack API 응답 (slack_sender / slack_delivery 클라이언트, 메서드+채널/DM 상대별)
+
+재생 시에는 네트워크를 전혀 사용하지 않고, 녹화된 소요 시간만큼 기다리거나(realtime)
+바로 응답한다. 전송 원장/실행 기록/DM 채널 캐시/제출 색인은 카세트 안의 scratch 폴더를 사용하므로
+실제 기록에 영향이 없다.
+
+사용법:
+    python main.py --date 2026-01-14 --record 0114        # 실제 실행하며 녹화
+    python main.py --replay 0114                           # 대기 없이 재생 (파싱/파이프라인 비용만)
+    python main.py --replay 0114 --realtime                # 녹화된 속도로 재생
+
+카세트 구조 (CASSETTE_DIR/<이름>/):
+    index.json                 {"meta": {...}, "entries": {"종류|키": [응답, ...]}}
+    <종류>_<번호>.txt/.bin     큰 응답 본문 (HTML, 이미지)
+"""
+import asyncio
+import json
+import logging
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_DIR = CACHE_DIR / "cassettes"
+
+RECORD = "record"
+REPLAY = "replay"
+
+# 녹화되지 않은 Slack 호출에 재생 시 돌려줄 응답 (네트워크 호출 없이 성공 처리)
+SLACK_REPLAY_DEFAULTS = {
+    "conversations_open": {"ok": True, "channel": {"id": "D_REPLAY"}},
+}
+
+
+class CassetteMissError(RuntimeError):
+    """재생할 녹화 응답이 없음"""
+
+
+class RecordedError(RuntimeError):
+    """녹화 당시 발생한 오류 (재생 시 다시 발생)"""
+
+
+class Cassette:
+    """카세트 1개 (종류|키별 응답 목록, 같은 키는 호출 순서대로 재생)"""
+
+    def __init__(self, name: str, mode: str, realtime: bool = False):
+        self.name = name
+        self.mode = mode
+        self.realtime = realtime
+        self.path = CASSETTE_DIR / name
+        self.meta: Dict = {}
+        self.entries: Dict[str, List[dict]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+        if mode == REPLAY:
+            index = json.loads((self.path / "index.json").read_text(encoding="utf-8"))
+            self.meta = index.get("meta", {})
+            self.entries = index.get("entries", {})
+        else:
+            if self.path.exists():
+                shutil.rmtree(self.path)
+            self.path.mkdir(parents=True)
+            self.meta = {"recorded_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+    # ----- 녹화 -----
+
+    def record(self, kind: str, key: str, duration: float, value=None, error: dict = None):
+        """응답 1건 녹화 (str/bytes는 파일로, 나머지는 JSON으로 저장)"""
+        entry = {"duration": round(duration, 3)}
+        with self._lock:
+            self._counter += 1
+            if error is not None:
+                entry["error"] = error
+            elif isinstance(value, (str, bytes)):
+                binary = isinstance(value, bytes)
+                filename = f"{kind}_{self._counter:04d}.{'bin' if binary else 'txt'}"
+                if binary:
+                    (self.path / filename).write_bytes(value)
+                else:
+                    (self.path / filename).write_text(value, encoding="utf-8")
+                entry["file"] = filename
+            else:
+                entry["json"] = value
+            self.entries.setdefault(f"{kind}|{key}", []).append(entry)
+
+    def record_error(self, kind: str, key: str, duration: float, e: Exception):
+        """오류 1건 녹화 (재생 시 body()에서 같은 종류로 다시 발생)"""
+        self.record(kind, key, duration, error=_encode_error(e))
+
+    def save(self):
+        index = {"meta": self.meta, "entries": self.entries}
+        (self.path / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+        total = sum(len(v) for v in self.entries.values())
+        logger.info(f"📼 카세트 저장: {self.path} ({total}건)")
+
+    # ----- 재생 -----
+
+    def next(self, kind: str, key: str) -> Optional[dict]:
+        """다음 녹화 응답 (같은 키를 녹화보다 더 많이 호출하면 마지막 응답 반복, 없으면 None)"""
+        name = f"{kind}|{key}"
+        with self._lock:
+            recorded = self.entries.get(name)
+            if not recorded:
+                return None
+            index = self._cursors.get(name, 0)
+            self._cursors[name] = index + 1
+            return recorded[min(index, len(recorded) - 1)]
+
+    def body(self, entry: dict):
+        """녹화 응답 본문 (오류면 다시 발생)"""
+        if "error" in entry:
+            raise _decode_error(entry["error"])
+        filename = entry.get("file")
+        if filename is None:
+            return entry.get("json")
+        path = self.path / filename
+        return path.read_bytes() if filename.endswith(".bin") else path.read_text(encoding="utf-8")
+
+    def pause(self, entry: dict):
+        if self.realtime:
+            time.sleep(entry.get("duration", 0))
+
+    async def apause(self, entry: dict):
+        if self.realtime:
+            await asyncio.sleep(entry.get("duration", 0))
+
+
+_current: Optional[Cassette] = None
+
+
+def start(name: str, mode: str, realtime: bool = False) -> Cassette:
+    """녹화/재생 시작 (재생이면 원장/실행 기록/DM 캐시를 카세트의 scratch 폴더로 돌림)"""
+    global _current
+    _current = Cassette(name, mode, realtime)
+    if mode == REPLAY:
+        _isolate(_current.path / "scratch")
+    else:
+        _fresh_dm_channels(_current.path / "scratch")
+    logger.info(
+        f"📼 카세트 {'녹화' if mode == RECORD else '재생'}: {name}"
+        + (" (녹화 속도)" if mode == REPLAY and realtime else "")
+    )
+    return _current
+
+
+def stop():
+    """녹화 종료 시 저장"""
+    global _current
+    if _current is not None and _current.mode == RECORD:
+        _current.save()
+    _current = None
+
+
+def current() -> Optional[Cassette]:
+    return _current
+
+
+def recording() -> bool:
+    return _current is not None and _current.mode == RECORD
+
+
+def replaying() -> bool:
+    return _current is not None and _current.mode == REPLAY
+
+
+def set_meta(**fields):
+    """녹화 메타 정보 (대상 날짜 등) - 재생 시 기본값으로 사용"""
+    if recording():
+        _current.meta.update(fields)
+
+
+def _fresh_dm_channels(scratch: Path):
+    """
+    녹화 중에는 DM 채널 캐시를 비워 conversations_open을 회원별로 녹화
+    (Slack 응답은 채널별로 녹화되므로, 재생 때 같은 채널 ID를 받아야 전송 응답과 이어짐)
+    """
+    import slack_sender
+
+    scratch.mkdir(parents=True, exist_ok=True)
+    slack_sender.DM_CHANNEL_CACHE_FILE = scratch / slack_sender.DM_CHANNEL_CACHE_FILE.name
+    slack_sender._dm_channels.clear()
+
+
+def _isolate(scratch: Path):
+    """재생 실행이 실제 원장/실행 기록/DM 채널 캐시/제출 색인을 건드리지 않도록 경로 교체"""
+    import content_index
+    import delivery_ledger
+    import infographic_generator
+    import run_db
+    import slack_sender
+
+    if scratch.exists():
+        shutil.rmtree(scratch)
+    scratch.mkdir(parents=True)
+    delivery_ledger.LEDGER_FILE = scratch / delivery_ledger.LEDGER_FILE.name
+    delivery_ledger._conn = None
+    run_db.RUN_DB_FILE = scratch / run_db.RUN_DB_FILE.name
+    run_db._conn = None
+    slack_sender.DM_CHANNEL_CACHE_FILE = scratch / slack_sender.DM_CHANNEL_CACHE_FILE.name
+    slack_sender._dm_channels.clear()
+    content_index.INDEX_FILE = scratch / content_index.INDEX_FILE.name
+    content_index._conn = None
+    infographic_generator.SOURCE_DIR = scratch / infographic_generator.SOURCE_DIR.name
+
+
+# =========================================
+# 오류 직렬화 (재생 시 같은 종류로 다시 발생)
+# =========================================
+
+def _encode_error(e: Exception) -> dict:
+    from slack_sdk.errors import SlackApiError
+
+    if isinstance(e, SlackApiError):
+        return {
+            "type": "slack",
+            "message": str(e),
+            "data": dict(e.response.data) if isinstance(e.response.data, dict) else {},
+            "headers": dict(e.response.headers or {}),
+        }
+    return {"type": type(e).__name__, "message": str(e)}
+
+
+class _ReplayResponse(dict):
+    """SlackApiError.response 대용 (["error"], .headers, .data)"""
+
+    def __init__(self, data: dict, headers: dict):
+        super().__init__(data)
+        self.data = data
+        self.headers = headers
+
+
+def _decode_error(error: dict) -> Exception:
+    if error.get("type") == "slack":
+        from slack_sdk.errors import SlackApiError
+        return SlackApiError(error["message"], _ReplayResponse(error["data"], error["headers"]))
+    return RecordedError(f"{error.get('type')}: {error.get('message')}")
+
+
+# =========================================
+# 가로채기
+# =========================================
+
+def through(kind: str, key: str, func: Callable):
+    """
+    func() 호출을 녹화/재생 (카세트가 없으면 그대로 호출)
+
+    Raises:
+        CassetteMissError: 재생 중 녹화 응답이 없는 경우
+    """
+    if _current is None:
+        return func()
+    if _current.mode == REPLAY:
+        entry = _current.next(kind, key)
+        if entry is None:
+            raise CassetteMissError(f"녹화 응답 없음: {kind}|{key}")
+        _current.pause(entry)
+        return _current.body(entry)
+
+    started = time.perf_counter()
+    try:
+        value = func()
+    except Exception as e:
+        _current.record(kind, key, time.perf_counter() - started, error=_encode_error(e))
+        raise
+    _current.record(kind, key, time.perf_counter() - started, value)
+    return value
+
+
+def _slack_key(method: str, kwargs: dict) -> str:
+    """
+    Slack 응답 녹화 키: 메서드 + 채널(또는 DM 상대)
+
+    동시 전송은 완료 순서대로 녹화되므로 메서드만으로 묶으면 재생 시 다른 회원의 응답
+    (channel_not_found, ratelimited 등)이 섞인다. digest를 날짜별로 묶는 것과 같이 대상별로 묶는다.
+    """
+    target = kwargs.get("channel") or kwargs.get("users")
+    if isinstance(target, (list, tuple)):
+        target = ",".join(target)
+    return f"{method}|{target}" if target else method
+
+
+def _slack_data(response):
+    """SlackResponse → dict (녹화용)"""
+    data = getattr(response, "data", response)
+    return data if isinstance(data, dict) else {}
+
+
+class _SlackProxy:
+    """Slack Web API 클라이언트 감싸기 (메서드 호출 단위로 녹화/재생)"""
+
+    def __init__(self, client, is_async: bool):
+        self._client = client
+        self._is_async = is_async
+
+    def __getattr__(self, method: str):
+        if replaying():
+            # 재생 중에는 실제 클라이언트를 건드리지 않음
+            return self._replay_call(method)
+        target = getattr(self._client, method)
+        if not callable(target):
+            return target
+        return self._async_call(method, target) if self._is_async else self._sync_call(method, target)
+
+    def _replay_call(self, method: str):
+        def entry(kwargs):
+            recorded = _current.next("slack", _slack_key(method, kwargs))
+            if recorded is None:
+                # 메서드 단위로 녹화된 예전 카세트
+                recorded = _current.next("slack", method)
+            if recorded is None:
+                return {"duration": 0, "json": dict(SLACK_REPLAY_DEFAULTS.get(method, {"ok": True}))}
+            return recorded
+
+        def call(**kwargs):
+            recorded = entry(kwargs)
+            _current.pause(recorded)
+            return _current.body(recorded)
+
+        async def acall(**kwargs):
+            recorded = entry(kwargs)
+            await _current.apause(recorded)
+            return _current.body(recorded)
+
+        return acall if self._is_async else call
+
+    def _sync_call(self, method: str, target):
+        def call(**kwargs):
+            return through("slack", _slack_key(method, kwargs), lambda: _slack_data(target(**kwargs)))
+        return call
+
+    def _async_call(self, method: str, target):
+        async def call(**kwargs):
+            if not recording():
+                return await target(**kwargs)
+            key = _slack_key(method, kwargs)
+            started = time.perf_counter()
+            try:
+                response = await target(**kwargs)
+            except Exception as e:
+                _current.record_error("slack", key, time.perf_counter() - started, e)
+                raise
+            _current.record("slack", key, time.perf_counter() - started, _slack_data(response))
+            return response
+        return call
+
+
+def wrap_slack(client, is_async: bool = False):
+    """녹화/재생 중이면 Slack 클라이언트를 감싸서 반환 (아니면 그대로)"""
+    if _current is None:
+        return client
+    return _SlackProxy(client, is_async)
@@ -13,26 +13,61 @@ load_dotenv()
 PROJECT_DIR = Path(__file__).parent
 OUTPUT_DIR = PROJECT_DIR / os.getenv("OUTPUT_DIR", "output")
 LOG_DIR = PROJECT_DIR / os.getenv("LOG_DIR", "logs")
+CACHE_DIR = PROJECT_DIR / os.getenv("CACHE_DIR", "cache")
 
 # 폴더 생성
 OUTPUT_DIR.mkdir(exist_ok=True)
 LOG_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 
 # Apps Script 웹앱 URL (Drive 스캔 대체)
 APPS_SCRIPT_URL = os.getenv("APPS_SCRIPT_URL", "")
 
 # Gemini API 설정
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+# Gemini 할당량: 분당 요청 수 / 분당 토큰 수, 동시 요청 수
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "15"))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", "1000000"))
+GEMINI_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", "8"))
+
+# 요약 캐시 (SQLite) - 보관 일수 / 최대 항목 수 (초과 시 오래 안 쓴 항목부터 삭제)
+SUMMARY_CACHE_TTL_DAYS = int(os.getenv("SUMMARY_CACHE_TTL_DAYS", "30"))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000"))
 
 # Slack 설정
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN", "")
 SLACK_USER_ID = os.getenv("SLACK_USER_ID", "")
+# 비동기 전송 엔진 동시 요청 수
+SLACK_CONCURRENCY = int(os.getenv("SLACK_CONCURRENCY", "4"))
+
+# NotebookLM 세션 유지 데몬 (auth_daemon.py): 로컬 포트 / 주기적 갱신 간격 (시간)
+AUTH_DAEMON_PORT = int(os.getenv("AUTH_DAEMON_PORT", "8765"))
+AUTH_REFRESH_INTERVAL_HOURS = float(os.getenv("AUTH_REFRESH_INTERVAL_HOURS", "8"))
+# 세션 갱신 일정 (auth_schedule.py): 쿠키 만료 몇 분 전에 갱신할지 / 최대 세션 수명 (시간)
+# / 파이프라인 실행 몇 분 전에 갱신할지
+AUTH_EXPIRY_MARGIN_MINUTES = int(os.getenv("AUTH_EXPIRY_MARGIN_MINUTES", "120"))
+AUTH_MAX_SESSION_AGE_HOURS = float(os.getenv("AUTH_MAX_SESSION_AGE_HOURS", "24"))
+AUTH_PRE_RUN_LEAD_MINUTES = int(os.getenv("AUTH_PRE_RUN_LEAD_MINUTES", "30"))
+
+# 파이프라인 데몬 (main.py --daemon): 로컬 제어 포트 / 매일 자동 실행 시각 (HH:MM)
+PIPELINE_DAEMON_PORT = int(os.getenv("PIPELINE_DAEMON_PORT", "8766"))
+DAILY_RUN_TIME = os.getenv("DAILY_RUN_TIME", "05:00")
+# watch 모드 (main.py --watch): digest 확인 간격 (분) / 같은 내용이 몇 번 연속 확인되면 처리할지
+WATCH_INTERVAL_MINUTES = float(os.getenv("WATCH_INTERVAL_MINUTES", "15"))
+WATCH_SETTLE_POLLS = int(os.getenv("WATCH_SETTLE_POLLS", "2"))
+# 실행 1회 시간 예산 (분, 0이면 무제한): 넘기면 남은 재시도를 하지 않고 실패 처리
+RUN_TIME_BUDGET_MINUTES = float(os.getenv("RUN_TIME_BUDGET_MINUTES", "90"))
 
 # =========================================
 # 회원 목록 및 폴더 ID 매핑 (members.json에서 로드)
 # =========================================
 MEMBERS_FILE = PROJECT_DIR / "members.json"
 MEMBERS = {}
+# 회원별 Slack 수신자 (사용자 ID U... 또는 채널 ID C...), members.json의 "slack" 필드
+MEMBER_SLACK_TARGETS = {}
+# 회원별 생성 우선순위 (클수록 먼저, 기본 0) / 마감 시각 ("HH:MM") - "priority", "deadline" 필드
+MEMBER_PRIORITIES = {}
+MEMBER_DEADLINES = {}
 if MEMBERS_FILE.exists():
     with open(MEMBERS_FILE, "r", encoding="utf-8") as _f:
         _members_data = json.load(_f)
@@ -41,6 +76,31 @@ if MEMBERS_FILE.exists():
         for m in _members_data.get("members", [])
         if m.get("active") and m.get("name") and m.get("folder_id")
     }
+    MEMBER_SLACK_TARGETS = {
+        m["name"]: m["slack"]
+        for m in _members_data.get("members", [])
+        if m.get("active") and m.get("name") and m.get("slack")
+    }
+    MEMBER_PRIORITIES = {
+        m["name"]: int(m["priority"])
+        for m in _members_data.get("members", [])
+        if m.get("active") and m.get("name") and m.get("priority") is not None
+    }
+    MEMBER_DEADLINES = {
+        m["name"]: m["deadline"]
+        for m in _members_data.get("members", [])
+        if m.get("active") and m.get("name") and m.get("deadline")
+    }
+
+# 인포그래픽 동시 생성 수 (scheduler.py가 예측 시간이 긴 회원부터 배정)
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "2"))
+
+# 회원별 직접 전송: true면 "slack"이 지정된 회원은 본인에게 바로 전송
+# (지정되지 않은 회원은 기존처럼 SLACK_USER_ID로 전송)
+SLACK_MEMBER_DELIVERY = os.getenv("SLACK_MEMBER_DELIVERY", "false").lower() == "true"
+
+# 관리자 DM 전송 방식: images(회원별 이미지) / digest(하나의 합본 PDF)
+SLACK_DELIVERY_MODE = os.getenv("SLACK_DELIVERY_MODE", "images").lower()
 
 # =========================================
 # 이미지 생성 설정
@@ -57,3 +117,31 @@ IMAGE_STYLE_PROMPT = """
 
 # 마감 시간 (새벽 5시 이전 실행 시 전날 날짜 사용)
 DEADLINE_HOUR = 5
+# 결과 전달 마감: 제출 마감(DEADLINE_HOUR시) + 오프셋(분). 남은 시간에 맞춰 동시 생성 수/상세도를 조정
+RESULT_DEADLINE_OFFSET_MINUTES = int(os.getenv("RESULT_DEADLINE_OFFSET_MINUTES", "180"))
+# 마감을 맞추기 위해 늘릴 수 있는 최대 동시 생성 수 (기본은 GENERATION_WORKERS)
+GENERATION_MAX_WORKERS = int(os.getenv("GENERATION_MAX_WORKERS", "4"))
+# 과거 제출과 거의 같은 내용 판단 기준 (SimHash 해밍 거리, 0~3)
+NEAR_DUPLICATE_MAX_DISTANCE = min(3, max(0, int(os.getenv("NEAR_DUPLICATE_MAX_DISTANCE", "3"))))
+# 거의 같은 내용일 때: "cheap" = 간략 모드로 생성, "warn" = 경고만 하고 그대로 생성
+NEAR_DUPLICATE_ACTION = os.getenv("NEAR_DUPLICATE_ACTION", "cheap").lower()
+
+# =========================================
+# 보존 정책 (retention.py) - 0이면 해당 기준 미적용
+# =========================================
+OUTPUT_RETENTION_DAYS = int(os.getenv("OUTPUT_RETENTION_DAYS", "30"))
+OUTPUT_MAX_FILES = int(os.getenv("OUTPUT_MAX_FILES", "500"))
+OUTPUT_MAX_MB = int(os.getenv("OUTPUT_MAX_MB", "1024"))
+LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "14"))
+LOG_MAX_FILES = int(os.getenv("LOG_MAX_FILES", "200"))
+LOG_MAX_MB = int(os.getenv("LOG_MAX_MB", "100"))
+# 로그 로테이션 (log_setup.py): 파일당 최대 용량(MB) / 보관할 이전 파일 수
+LOG_FILE_MAX_MB = int(os.getenv("LOG_FILE_MAX_MB", "10"))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+MARKER_RETENTION_DAYS = int(os.getenv("MARKER_RETENTION_DAYS", "90"))
+# 날짜별 digest 파싱 결과 (월간 분석용, cache/digests)
+DIGEST_CACHE_RETENTION_DAYS = int(os.getenv("DIGEST_CACHE_RETENTION_DAYS", "400"))
+# 라벨 오버레이 전 인포그래픽 원본 (같은 내용 재제출 시 재사용, cache/infographic_sources)
+INFOGRAPHIC_SOURCE_RETENTION_DAYS = int(os.getenv("INFOGRAPHIC_SOURCE_RETENTION_DAYS", "180"))
+# 증분 정리 최소 간격 (시간)
+GC_INTERVAL_HOURS = int(os.getenv("GC_INTERVAL_HOURS", "24"))
@@ -0,0 +1,178 @@
+"""
+제출 내용 색인 모듈
+- 회원별 과거 제출 내용의 정규화 해시(완전 동일)와 64비트 SimHash(거의 동일)를 SQLite에 기록
+- SimHash는 16비트 4구간(band)으로 나눠 색인: 해밍 거리 3 이하인 두 값은 적어도 한 구간이
+  같으므로(비둘기집 원리) 구간 색인 조회 몇 번으로 후보를 찾고 후보만 거리 계산
+- 모든 조회는 (회원, 해시) / (회원, 구간, 값) 기본 키 색인을 타므로 기록이 수년치로 늘어도
+  회원 1명 조회가 1ms 미만
+"""
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from config import CACHE_DIR, NEAR_DUPLICATE_MAX_DISTANCE
+from delivery_ledger import make_content_hash
+
+INDEX_FILE = CACHE_DIR / "content_index.sqlite3"
+
+SIMHASH_BITS = 64
+BAND_BITS = 16
+BANDS = SIMHASH_BITS // BAND_BITS
+# SimHash 특징: 공백/문장부호를 뺀 글자 n-gram (한국어는 띄어쓰기가 달라도 같은 내용으로 취급)
+SHINGLE_SIZE = 4
+_NOISE = re.compile(r"[\W_]+", re.UNICODE)
+
+EXACT = "exact"
+NEAR = "near"
+
+_conn = None
+_lock = threading.Lock()
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(str(INDEX_FILE), check_same_thread=False)
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS submissions (
+                member TEXT NOT NULL,
+                date TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                simhash INTEGER NOT NULL,
+                content_length INTEGER,
+                indexed_at REAL NOT NULL,
+                PRIMARY KEY (member, date)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS submissions_hash ON submissions (member, content_hash);
+            CREATE TABLE IF NOT EXISTS simhash_bands (
+                member TEXT NOT NULL,
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                PRIMARY KEY (member, band, value, date)
+            ) WITHOUT ROWID;
+        """)
+        _conn.commit()
+    return _conn
+
+
+@dataclass
+class ContentMatch:
+    """과거 제출과 일치한 결과"""
+    kind: str          # EXACT / NEAR
+    date: str          # 일치한 과거 제출 날짜
+    distance: int      # SimHash 해밍 거리 (EXACT면 0)
+    lookup_ms: float   # 조회 시간
+
+
+def _shingle_hashes(compact: str) -> np.ndarray:
+    """글자 n-gram별 64비트 해시 (다항식 롤링 해시 + splitmix64 섞기, 프로세스와 무관하게 고정)"""
+    codes = np.frombuffer(compact.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    size = min(SHINGLE_SIZE, len(codes))
+    count = len(codes) - size + 1
+    h = np.zeros(count, dtype=np.uint64)
+    for k in range(size):
+        h = h * np.uint64(1_000_003) + codes[k:k + count]
+    h ^= h >> np.uint64(30)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(27)
+    h *= np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(31)
+    return h
+
+
+def simhash(text_content: str) -> int:
+    """64비트 SimHash (부호 없는 정수)"""
+    compact = _NOISE.sub("", text_content.lower())
+    if not compact:
+        return 0
+    hashes, counts = np.unique(_shingle_hashes(compact), return_counts=True)
+    # 특징별 64비트를 펼쳐 등장 횟수 가중 투표 (1이면 +, 0이면 -)
+    bits = np.unpackbits(hashes.astype(">u8").view(np.uint8).reshape(-1, 8), axis=1)
+    votes = counts @ (2 * bits.astype(np.int64) - 1)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+def _to_signed(value: int) -> int:
+    """SQLite INTEGER(부호 있는 64비트)로 저장하기 위한 변환"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _bands(value: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (band * BAND_BITS)) & mask for band in range(BANDS)]
+
+
+def find_match(member: str, date: str, text_content: str,
+               max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE) -> Optional[ContentMatch]:
+    """
+    같은 회원의 다른 날짜 제출 중 같은(또는 거의 같은) 내용 찾기
+
+    완전 동일이 우선이고, 여러 건이면 가장 최근 날짜. 거의 동일은 해밍 거리가 가장 작은 건.
+    max_distance는 구간 수 - 1(=3) 이하여야 후보 누락이 없다.
+
+    Returns:
+        ContentMatch 또는 None
+    """
+    started = time.perf_counter()
+    content_hash = make_content_hash(text_content)
+    with _lock:
+        row = _get_conn().execute(
+            "SELECT date FROM submissions WHERE member = ? AND content_hash = ? AND date != ? "
+            "ORDER BY date DESC LIMIT 1",
+            (member, content_hash, date),
+        ).fetchone()
+    if row is not None:
+        return ContentMatch(EXACT, row[0], 0, (time.perf_counter() - started) * 1000)
+
+    value = simhash(text_content)
+    bands = _bands(value)
+    with _lock:
+        candidates = _get_conn().execute(
+            "SELECT s.date, s.simhash FROM submissions s WHERE s.member = ? AND s.date != ? AND s.date IN ("
+            + " UNION ".join(
+                "SELECT date FROM simhash_bands WHERE member = ? AND band = ? AND value = ?" for _ in bands
+            )
+            + ")",
+            (member, date, *[x for band, v in enumerate(bands) for x in (member, band, v)]),
+        ).fetchall()
+
+    best = None
+    for other_date, other in candidates:
+        distance = bin(value ^ (other & ((1 << 64) - 1))).count("1")
+        if distance <= max_distance and (best is None or (distance, other_date) < (best[0], best[1])):
+            best = (distance, other_date)
+    if best is None:
+        return None
+    return ContentMatch(NEAR, best[1], best[0], (time.perf_counter() - started) * 1000)
+
+
+def record_submission(member: str, date: str, text_content: str):
+    """제출 내용 색인 (같은 회원/날짜는 덮어씀)"""
+    value = simhash(text_content)
+    with _lock:
+        conn = _get_conn()
+        old = conn.execute(
+            "SELECT simhash FROM submissions WHERE member = ? AND date = ?", (member, date)
+        ).fetchone()
+        if old is not None:
+            conn.executemany(
+                "DELETE FROM simhash_bands WHERE member = ? AND band = ? AND value = ? AND date = ?",
+                [(member, band, v, date) for band, v in enumerate(_bands(old[0] & ((1 << 64) - 1)))],
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO submissions"
+            "(member, date, content_hash, simhash, content_length, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (member, date, make_content_hash(text_content), _to_signed(value),
+             len(text_content.strip()), time.time()),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO simhash_bands(member, band, value, date) VALUES (?, ?, ?, ?)",
+            [(member, band, v, date) for band, v in enumerate(_bands(value))],
+        )
+        conn.commit()
@@ -1,20 +1,271 @@
 """
 콘텐츠 요약 모듈
 - Gemini API를 사용하여 공부 내용 요약
+- asyncio 기반: 분당 요청/토큰 제한, 동시 요청 수 제한, 429 재시도
 """
-from typing import Dict, List
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
 
-from config import GEMINI_API_KEY
+from config import (
+    GEMINI_API_KEY,
+    GEMINI_RPM,
+    GEMINI_TPM,
+    GEMINI_CONCURRENCY,
+    CACHE_DIR,
+    SUMMARY_CACHE_TTL_DAYS,
+    SUMMARY_CACHE_MAX_ENTRIES,
+)
+from extractive import estimate_tokens, extract_to_budget
+from rate_limit import AsyncTokenBucket, backoff_delay, run_sync
+
+GEMINI_MODEL_NAME = 'gemini-2.0-flash'
+
+# 프롬프트를 바꾸면 올려서 기존 캐시를 무효화
+PROMPT_VERSION = 2
+
+# 회원별 내용 토큰 예산 (넘으면 extractive.extract_to_budget으로 중요 문장만 추림)
+CONTENT_TOKEN_BUDGET = 600
+
+# 일괄 요약 요청 1회당 입력 토큰 예산 (넘으면 여러 요청으로 나눠 동시 전송)
+BATCH_TOKEN_BUDGET = 30000
+
+# 429 응답 시 최대 시도 횟수
+GEMINI_MAX_RETRIES = 5
+
+# 프로세스 내에서 재사용하는 모델 객체
+_model = None
+
+# Gemini 할당량에 맞춘 공유 레이트 리미터 (분당 요청 수 / 분당 토큰 수)
+_request_bucket = AsyncTokenBucket(GEMINI_RPM)
+_token_bucket = AsyncTokenBucket(GEMINI_TPM)
+
+# 이벤트 루프별 동시 요청 수 제한
+_semaphores = weakref.WeakKeyDictionary()
 
 
 def init_gemini():
-    """Gemini API 초기화"""
+    """
+    Gemini API 초기화 (모델 객체는 한 번만 만들고 재사용)
+
+    모델의 비동기 gRPC 클라이언트는 처음 쓴 이벤트 루프에 묶이므로, 비동기 호출은
+    rate_limit.run_sync의 공용 루프(또는 그 안의 await)에서만 한다.
+    """
+    global _model
+    if _model is not None:
+        return _model
+
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
     
     genai.configure(api_key=GEMINI_API_KEY)
-    return genai.GenerativeModel('gemini-2.0-flash')
+    _model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _model
+
+
+class SummaryCache:
+    """
+    요약 결과 SQLite 캐시
+    - 키: (정규화된 내용, max_length, 모델 이름, 프롬프트 버전)의 SHA-256
+    - TTL이 지난 항목은 조회 시 무시, 최대 항목 수 초과 시 오래 안 쓴 항목부터 삭제
+    - 적중/실패 횟수를 DB에 누적 (main.py --cache-stats)
+    """
+
+    def __init__(
+        self,
+        path=CACHE_DIR / "summary_cache.sqlite3",
+        ttl_days: int = SUMMARY_CACHE_TTL_DAYS,
+        max_entries: int = SUMMARY_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries(last_used);
+            CREATE TABLE IF NOT EXISTS stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(text_content: str, max_length: int, model_name: str = GEMINI_MODEL_NAME) -> str:
+        """캐시 키 생성 (공백 차이는 같은 내용으로 취급)"""
+        normalized = " ".join(text_content.split())
+        raw = f"{PROMPT_VERSION}\x00{model_name}\x00{max_length}\x00{normalized}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _bump(self, name: str):
+        self._conn.execute(
+            "INSERT INTO stats(name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (만료 항목은 없는 것으로 취급)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row and (not self.ttl or now - row[1] <= self.ttl):
+                self._conn.execute(
+                    "UPDATE summaries SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._bump("hits")
+                self._conn.commit()
+                return row[0]
+
+            self._bump("misses")
+            self._conn.commit()
+            return None
+
+    def put(self, key: str, summary: str):
+        """캐시 저장 후 TTL/최대 항목 수 정리"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries(key, summary, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, summary, now, now),
+            )
+            if self.ttl:
+                self._conn.execute(
+                    "DELETE FROM summaries WHERE created_at < ?", (now - self.ttl,)
+                )
+            if self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM summaries WHERE key IN ("
+                    "  SELECT key FROM summaries ORDER BY last_used DESC LIMIT -1 OFFSET ?"
+                    ")",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """적중률 통계"""
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM stats").fetchall())
+            entries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        total = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+
+_cache = None
+
+
+def get_cache() -> SummaryCache:
+    """프로세스 내에서 공유하는 요약 캐시"""
+    global _cache
+    if _cache is None:
+        _cache = SummaryCache()
+    return _cache
+
+
+def print_cache_stats() -> bool:
+    """요약 캐시 통계 출력 (main.py --cache-stats)"""
+    stats = get_cache().stats()
+    print("=" * 50)
+    print("🗃️ 요약 캐시 통계")
+    print("=" * 50)
+    print(f"  저장 항목: {stats['entries']}개")
+    print(f"  적중: {stats['hits']}회 / 실패: {stats['misses']}회")
+    print(f"  적중률: {stats['hit_rate']:.1%}")
+    return True
+
+
+def _clean_summary(summary: str, max_length: int) -> str:
+    """모델 응답을 한 줄 요약으로 정리"""
+    summary = summary.strip()
+
+    # 줄바꿈이 있으면 첫 줄만
+    if '\n' in summary:
+        summary = summary.split('\n')[0]
+
+    # 너무 길면 자르기
+    if len(summary) > max_length + 10:
+        summary = summary[:max_length] + "..."
+
+    return summary
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """429 (ResourceExhausted) 여부 - 메시지 문자열은 보지 않음 (다른 오류 본문의 "429"/"quota" 오인 방지)"""
+    return isinstance(error, ResourceExhausted) or getattr(error, "code", None) == 429
+
+
+async def _generate_async(prompt: str, generation_config: dict = None) -> str:
+    """
+    레이트 리밋 + 동시성 제한 + 429 재시도를 적용한 Gemini 호출
+
+    Raises:
+        마지막 시도의 예외 (429가 아닌 오류는 재시도하지 않음)
+    """
+    model = init_gemini()
+    # 응답 토큰도 분당 토큰 제한에 포함되므로 여유분을 더함
+    tokens = estimate_tokens(prompt) + 256
+
+    async with _get_semaphore():
+        for attempt in range(1, GEMINI_MAX_RETRIES + 1):
+            await _request_bucket.acquire(1)
+            await _token_bucket.acquire(tokens)
+            try:
+                response = await model.generate_content_async(
+                    prompt, generation_config=generation_config
+                )
+                return response.text
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == GEMINI_MAX_RETRIES:
+                    raise
+                wait = backoff_delay(attempt)
+                # 다른 요청도 함께 멈추도록 공유 버킷에 반영
+                _request_bucket.penalize(wait)
+                print(f"  ⏳ Gemini 레이트 리밋 (시도 {attempt}/{GEMINI_MAX_RETRIES}) - {wait:.1f}초 대기...")
+
+
+async def generate_text_async(prompt: str, generation_config: dict = None) -> str:
+    """
+    요약 외 다른 모듈(월간 분석 등)용 Gemini 호출 - 같은 레이트 리밋/동시성 제한을 공유
+
+    Raises:
+        마지막 시도의 예외
+    """
+    return await _generate_async(prompt, generation_config)
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """이벤트 루프별 동시 요청 수 제한 세마포어"""
+    loop = asyncio.get_running_loop()
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(GEMINI_CONCURRENCY)
+        _semaphores[loop] = sem
+    return sem
 
 
 def summarize_content(text_content: str, max_length: int = 50) -> str:
@@ -28,11 +279,31 @@ def summarize_content(text_content: str, max_length: int = 50) -> str:
     Returns:
         요약된 내용 (짧은 문장 또는 키워드)
     """
+    return run_sync(summarize_content_async(text_content, max_length))
+
+
+async def summarize_content_async(text_content: str, max_length: int = 50) -> str:
+    """summarize_content()의 비동기 버전"""
     if not text_content.strip():
         return "내용 없음"
-    
-    model = init_gemini()
-    
+
+    cache = get_cache()
+    key = cache.make_key(text_content, max_length)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    summary = await _request_summary_async(text_content, max_length)
+    if summary is None:
+        return "요약 생성 실패"
+
+    cache.put(key, summary)
+    return summary
+
+
+async def _request_summary_async(text_content: str, max_length: int) -> Optional[str]:
+    """Gemini에 단일 요약 요청 (캐시 미사용), 실패 시 None"""
+    content = extract_to_budget(text_content, CONTENT_TOKEN_BUDGET)
     prompt = f"""다음 공부 인증 내용을 {max_length}자 이내로 아주 간결하게 요약해주세요.
 핵심 키워드나 주제만 추출하세요. 존댓말 없이 명사형으로 끝내세요.
 
@@ -42,26 +313,153 @@ def summarize_content(text_content: str, max_length: int = 50) -> str:
 - "React useState 훅 정리"
 
 공부 내용:
-{text_content[:2000]}  # 너무 길면 자름
+{content}
 
 요약:"""
 
     try:
-        response = model.generate_content(prompt)
-        summary = response.text.strip()
-        
-        # 줄바꿈이 있으면 첫 줄만
-        if '\n' in summary:
-            summary = summary.split('\n')[0]
-        
-        # 너무 길면 자르기
-        if len(summary) > max_length + 10:
-            summary = summary[:max_length] + "..."
-        
-        return summary
+        text = await _generate_async(prompt)
+        return _clean_summary(text, max_length)
     except Exception as e:
         print(f"요약 실패: {e}")
-        return "요약 생성 실패"
+        return None
+
+
+def _parse_batch_response(text: str) -> Dict[str, str]:
+    """일괄 요약 응답(JSON 객체)을 {회원 이름: 요약} 으로 파싱"""
+    text = text.strip()
+    # ```json ... ``` 코드 블록으로 감싸 오는 경우
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"JSON 객체가 아닙니다: {type(data).__name__}")
+
+    return {
+        str(name): value.strip()
+        for name, value in data.items()
+        if isinstance(value, str) and value.strip()
+    }
+
+
+def _chunk_by_tokens(contents: Dict[str, str], budget: int) -> List[Dict[str, str]]:
+    """회원별 내용을 요청당 토큰 예산 이내 묶음으로 분할 (순서 유지)"""
+    chunks = []
+    current = {}
+    used = 0
+    for name, text in contents.items():
+        tokens = estimate_tokens(text)
+        if current and used + tokens > budget:
+            chunks.append(current)
+            current, used = {}, 0
+        current[name] = text
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _summarize_chunk_async(chunk: Dict[str, str], max_length: int) -> Dict[str, str]:
+    """묶음 하나를 한 번의 요청으로 요약, 실패 시 빈 dict"""
+    payload = json.dumps(chunk, ensure_ascii=False, indent=1)
+    prompt = f"""다음은 회원별 공부 인증 내용입니다 (JSON 객체, 키: 회원 이름, 값: 공부 내용).
+각 회원의 내용을 {max_length}자 이내로 아주 간결하게 요약해주세요.
+핵심 키워드나 주제만 추출하세요. 존댓말 없이 명사형으로 끝내세요.
+
+예시 요약:
+- "JavaScript 화살표 함수 학습"
+- "알고리즘 문제 5개 풀이"
+- "React useState 훅 정리"
+
+출력 형식: 입력과 같은 회원 이름을 키로, 요약 문자열을 값으로 하는 JSON 객체만 출력하세요.
+
+회원별 공부 내용:
+{payload}"""
+
+    try:
+        text = await _generate_async(
+            prompt,
+            generation_config={"response_mime_type": "application/json"},
+        )
+        return _parse_batch_response(text)
+    except Exception as e:
+        print(f"일괄 요약 실패, 회원별 요약으로 전환: {e}")
+        return {}
+
+
+def summarize_batch(contents: Dict[str, str], max_length: int = 50) -> Dict[str, str]:
+    """
+    여러 회원의 공부 내용을 한 번의 요청으로 요약
+
+    캐시에 있는 회원은 요청에서 제외하고, 응답에서 누락되었거나 파싱에 실패한
+    회원만 개별 요청한다.
+
+    Args:
+        contents: {회원 이름: 원본 텍스트}
+        max_length: 요약 최대 길이 (글자 수)
+
+    Returns:
+        {회원 이름: 요약}
+    """
+    return run_sync(summarize_batch_async(contents, max_length))
+
+
+async def summarize_batch_async(contents: Dict[str, str], max_length: int = 50) -> Dict[str, str]:
+    """
+    summarize_batch()의 비동기 버전
+
+    내용이 BATCH_TOKEN_BUDGET을 넘으면 여러 묶음으로 나눠 동시에 요청하고,
+    개별 요청도 동시에 보낸다 (동시성/레이트 리밋은 _generate_async에서 제한).
+    """
+    results = {name: "내용 없음" for name, text in contents.items() if not text.strip()}
+
+    # 캐시에 있는 회원은 요청에서 제외
+    cache = get_cache()
+    keys = {}
+    pending = {}
+    for name, text in contents.items():
+        if name in results:
+            continue
+        keys[name] = cache.make_key(text, max_length)
+        cached = cache.get(keys[name])
+        if cached is not None:
+            results[name] = cached
+        else:
+            pending[name] = text
+    if not pending:
+        return results
+
+    truncated = {
+        name: extract_to_budget(text, CONTENT_TOKEN_BUDGET)
+        for name, text in pending.items()
+    }
+    chunk_results = await asyncio.gather(*(
+        _summarize_chunk_async(chunk, max_length)
+        for chunk in _chunk_by_tokens(truncated, BATCH_TOKEN_BUDGET)
+    ))
+    parsed = {}
+    for chunk_result in chunk_results:
+        parsed.update(chunk_result)
+
+    # 누락/파싱 실패한 회원만 개별 요청
+    missing = [name for name in pending if name not in parsed]
+    fallbacks = await asyncio.gather(*(
+        _request_summary_async(pending[name], max_length) for name in missing
+    ))
+    for name, summary in zip(missing, fallbacks):
+        if summary is not None:
+            parsed[name] = summary
+
+    for name in pending:
+        if name in parsed:
+            results[name] = _clean_summary(parsed[name], max_length)
+            cache.put(keys[name], results[name])
+        else:
+            results[name] = "요약 생성 실패"
+
+    return results
 
 
 def summarize_from_files(files: List[Dict]) -> str:
@@ -101,6 +499,18 @@ def summarize_all_members(scan_results: List[Dict]) -> List[Dict]:
         요약 정보가 추가된 결과 리스트
     """
     summarized = []
+
+    # 텍스트 내용이 있는 회원은 한 번의 요청으로 일괄 요약
+    contents = {
+        result["name"]: result["text_content"]
+        for result in scan_results
+        if result["has_submission"] and result.get("text_content")
+    }
+    if contents:
+        print(f"  📝 {len(contents)}명 내용 일괄 요약 중...")
+        batch_summaries = summarize_batch(contents)
+    else:
+        batch_summaries = {}
     
     for result in scan_results:
         member_summary = {
@@ -113,9 +523,8 @@ def summarize_all_members(scan_results: List[Dict]) -> List[Dict]:
         if not result["has_submission"]:
             member_summary["summary"] = "미제출"
         elif result.get("text_content"):
-            # 텍스트 내용이 있으면 AI로 요약
-            print(f"  📝 {result['name']} 내용 요약 중...")
-            member_summary["summary"] = summarize_content(result["text_content"])
+            # 텍스트 내용이 있으면 AI 요약 결과 사용
+            member_summary["summary"] = batch_summaries[result["name"]]
         else:
             # 텍스트 없으면 파일 목록으로 요약
             member_summary["summary"] = summarize_from_files(result.get("files", []))
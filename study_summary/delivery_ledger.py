@@ -0,0 +1,87 @@
+"""
+Slack 전송 원장 모듈
+- (날짜, 회원, 내용 해시)별로 이미 전송한 Slack 파일 ID와 시각을 기록
+- 재실행/백필 시 이미 전송한 회원은 생성과 업로드를 모두 건너뜀
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import CACHE_DIR
+
+LEDGER_FILE = CACHE_DIR / "delivery_ledger.sqlite3"
+
+# (date, member, content_hash)
+LedgerKey = Tuple[str, str, str]
+
+_conn = None
+_lock = threading.Lock()
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(str(LEDGER_FILE), check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS deliveries (
+                date TEXT NOT NULL,
+                member TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                channel TEXT,
+                file_id TEXT,
+                delivered_at REAL NOT NULL,
+                PRIMARY KEY (date, member, content_hash)
+            )
+        """)
+        _conn.commit()
+    return _conn
+
+
+def make_content_hash(text_content: str) -> str:
+    """학습 내용 해시 (공백 차이는 같은 내용으로 취급)"""
+    normalized = " ".join(text_content.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def make_key(date: str, member: str, text_content: str) -> LedgerKey:
+    """원장 키 생성"""
+    return (date, member, make_content_hash(text_content))
+
+
+def get_delivery(key: LedgerKey) -> Optional[Dict]:
+    """전송 기록 조회 (없으면 None)"""
+    with _lock:
+        row = _get_conn().execute(
+            "SELECT channel, file_id, delivered_at FROM deliveries "
+            "WHERE date = ? AND member = ? AND content_hash = ?",
+            key,
+        ).fetchone()
+    if row is None:
+        return None
+    return {"channel": row[0], "file_id": row[1], "delivered_at": row[2]}
+
+
+def is_delivered(key: LedgerKey) -> bool:
+    """이미 전송했는지 여부"""
+    return get_delivery(key) is not None
+
+
+def record_delivery(key: LedgerKey, channel: str = None, file_id: str = None):
+    """전송 완료 기록"""
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO deliveries"
+            "(date, member, content_hash, channel, file_id, delivered_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, channel, file_id, time.time()),
+        )
+        conn.commit()
+
+
+def file_ids_from_response(response) -> Dict[str, str]:
+    """files_upload_v2 응답에서 {파일 이름: 파일 ID} 추출"""
+    files = response.get("files") or ([response["file"]] if response.get("file") else [])
+    return {f.get("name") or f.get("title"): f.get("id") for f in files if f.get("id")}
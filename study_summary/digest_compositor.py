@@ -0,0 +1,177 @@
+"""
+일일 다이제스트 합본 모듈
+- 날짜별 회원 인포그래픽을 한 장씩 페이지로 넣은 PDF 생성 → Slack 업로드 1회
+- 페이지를 하나씩 디스크에 바로 쓰므로 회원 수와 관계없이 메모리 사용량이 일정
+- 이미지 디코딩/JPEG 인코딩은 스레드 풀에서 병렬 처리 (Pillow는 디코딩 중 GIL 해제)
+"""
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+from config import OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+# 페이지 이미지 최대 높이 (px) - 세로로 긴 인포그래픽을 이 크기로 축소
+MAX_PAGE_HEIGHT = 2400
+JPEG_QUALITY = 85
+DECODE_WORKERS = 4
+
+
+def _encode_page(path: Path) -> Tuple[int, int, bytes]:
+    """이미지 하나를 디코딩 → 축소 → JPEG 인코딩 (너비, 높이, JPEG bytes)"""
+    with Image.open(path) as img:
+        img = img.convert("RGB")
+        if img.height > MAX_PAGE_HEIGHT:
+            ratio = MAX_PAGE_HEIGHT / img.height
+            img = img.resize((int(img.width * ratio), MAX_PAGE_HEIGHT), Image.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+        return img.width, img.height, buffer.getvalue()
+
+
+def _encoded_pages(paths: List[Path], workers: int) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    페이지를 순서대로 생성. 최대 workers개만 미리 인코딩해 두어
+    메모리에 올라가는 페이지 수를 제한한다.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for path in paths:
+            futures.append(executor.submit(_encode_page, path))
+            if len(futures) > workers:
+                yield futures.pop(0).result()
+        for future in futures:
+            yield future.result()
+
+
+class _StreamingPdfWriter:
+    """
+    JPEG 이미지 페이지만 담는 최소 PDF 작성기.
+    객체를 쓰는 즉시 파일로 내보내고 오프셋만 기억한다.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.offsets = {}
+        self.page_ids = []
+        self._next_id = 3  # 1: Catalog, 2: Pages (마지막에 기록)
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes):
+        self.fp.write(data)
+
+    def _alloc(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _begin(self, obj_id: int):
+        self.offsets[obj_id] = self.fp.tell()
+        self._write(f"{obj_id} 0 obj\n".encode())
+
+    def _object(self, obj_id: int, body: bytes):
+        self._begin(obj_id)
+        self._write(body + b"\nendobj\n")
+
+    def _stream(self, obj_id: int, header: str, data: bytes):
+        self._begin(obj_id)
+        self._write(f"<< {header} /Length {len(data)} >>\nstream\n".encode())
+        self._write(data)
+        self._write(b"\nendstream\nendobj\n")
+
+    def add_jpeg_page(self, width: int, height: int, jpeg: bytes):
+        """이미지 크기(px = pt)와 같은 크기의 페이지 추가"""
+        image_id, content_id, page_id = self._alloc(), self._alloc(), self._alloc()
+        self._stream(
+            image_id,
+            f"/Type /XObject /Subtype /Image /Width {width} /Height {height} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode",
+            jpeg,
+        )
+        self._stream(content_id, "", f"q {width} 0 0 {height} 0 0 cm /Im0 Do Q".encode())
+        self._object(
+            page_id,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+            f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> "
+            f"/Contents {content_id} 0 R >>".encode(),
+        )
+        self.page_ids.append(page_id)
+
+    def close(self):
+        kids = " ".join(f"{pid} 0 R" for pid in self.page_ids)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode())
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref_offset = self.fp.tell()
+        size = self._next_id
+        self._write(f"xref\n0 {size}\n".encode())
+        self._write(b"0000000000 65535 f \n")
+        for obj_id in range(1, size):
+            self._write(f"{self.offsets[obj_id]:010d} 00000 n \n".encode())
+        self._write(
+            f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+        )
+
+
+def find_daily_images(date: str, output_dir: Path = OUTPUT_DIR) -> List[Path]:
+    """해당 날짜의 회원별 인포그래픽 목록 (이름순)"""
+    return sorted(output_dir.glob(f"infographic_*_{date}.png"))
+
+
+def build_daily_pdf(
+    date: str,
+    images: Optional[List[Path]] = None,
+    output_dir: Path = OUTPUT_DIR,
+    workers: int = DECODE_WORKERS,
+) -> Optional[Path]:
+    """
+    회원별 인포그래픽을 페이지로 묶은 일일 다이제스트 PDF 생성
+
+    Args:
+        date: 대상 날짜 (YYYY-MM-DD)
+        images: 포함할 이미지 목록 (None이면 output 폴더에서 해당 날짜 이미지 검색)
+        output_dir: 출력 디렉토리
+        workers: 병렬 디코딩 스레드 수
+
+    Returns:
+        생성된 PDF 경로, 이미지가 없으면 None
+
+    Raises:
+        이미지 디코딩/쓰기 오류 (작성 중이던 .pdf.part 파일은 지우고 다시 발생)
+    """
+    if images is None:
+        images = find_daily_images(date, output_dir)
+    if not images:
+        logger.warning(f"  {date} 합본할 인포그래픽이 없습니다.")
+        return None
+
+    pdf_path = output_dir / f"digest_{date}.pdf"
+    tmp_path = pdf_path.with_suffix(".pdf.part")
+    try:
+        with open(tmp_path, "wb") as fp:
+            writer = _StreamingPdfWriter(fp)
+            for width, height, jpeg in _encoded_pages(images, workers):
+                writer.add_jpeg_page(width, height, jpeg)
+            writer.close()
+        tmp_path.replace(pdf_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"  📄 다이제스트 PDF 생성: {pdf_path} ({len(images)}페이지)")
+    return pdf_path
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 2:
+        print("사용법: python digest_compositor.py YYYY-MM-DD")
+        sys.exit(1)
+    result = build_daily_pdf(sys.argv[1])
+    sys.exit(0 if result else 1)
@@ -7,7 +7,6 @@ import os
 import json
 import re
 import logging
-import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pathlib import Path
@@ -20,13 +19,29 @@ if sys.platform == "win32" and hasattr(sys.stdout, "reconfigure"):
 import requests
 from bs4 import BeautifulSoup
 
-from config import APPS_SCRIPT_URL
+from config import APPS_SCRIPT_URL, CACHE_DIR
 
 logger = logging.getLogger(__name__)
 
 # members.json 경로
 MEMBERS_FILE = Path(__file__).parent / "members.json"
 
+# 날짜별 parse_digest_html() 결과 보관 폴더 (월간 분석이 Apps Script 없이 한 달치를 모을 때 사용)
+DIGEST_CACHE_DIR = CACHE_DIR / "digests"
+
+# 프로세스 내에서 재사용하는 HTTP 세션 (keep-alive 연결 유지)
+_session = None
+# members.json 캐시: (수정 시각, 활성 회원 이름 목록)
+_member_names_cache = None
+
+
+def get_http_session() -> requests.Session:
+    """Apps Script 요청용 HTTP 세션 (한 번만 만들고 재사용)"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
 
 def get_target_date() -> str:
     """대상 날짜 계산: 항상 전날 날짜 반환 (스케줄이 매일 05:00 실행)"""
@@ -36,16 +51,24 @@ def get_target_date() -> str:
 
 
 def _load_member_names() -> List[str]:
-    """members.json에서 활성 회원 이름 목록 로드"""
-    if not MEMBERS_FILE.exists():
+    """members.json에서 활성 회원 이름 목록 로드 (파일이 바뀌지 않았으면 캐시 사용)"""
+    global _member_names_cache
+    try:
+        mtime = MEMBERS_FILE.stat().st_mtime
+    except OSError:
         return []
+    if _member_names_cache is not None and _member_names_cache[0] == mtime:
+        return list(_member_names_cache[1])
+
     with open(MEMBERS_FILE, "r", encoding="utf-8") as f:
         data = json.load(f)
-    return [
+    names = [
         m["name"]
         for m in data.get("members", [])
         if m.get("active") and m.get("name")
     ]
+    _member_names_cache = (mtime, names)
+    return list(names)
 
 
 def _extract_inner_html(raw_html: str) -> str:
@@ -116,47 +139,52 @@ def fetch_digest_html(date: str, max_retries: int = 3) -> str:
         실제 콘텐츠 HTML 문자열 (iframe wrapper 제거됨)
 
     Raises:
-        RuntimeError: 요청 실패 시
+        RuntimeError: 요청 실패 시 (브레이커 차단/실행 시간 예산 초과 포함)
     """
-    if not APPS_SCRIPT_URL:
+    import cassette
+    from resilience import call_with_retry
+
+    if not APPS_SCRIPT_URL and not cassette.replaying():
         raise RuntimeError("APPS_SCRIPT_URL이 설정되지 않았습니다. .env 파일을 확인하세요.")
 
     url = f"{APPS_SCRIPT_URL}?date={date}"
 
-    for attempt in range(1, max_retries + 1):
-        try:
-            logger.info(f"  Apps Script 요청 (시도 {attempt}/{max_retries}): {date}")
-            resp = requests.get(url, timeout=60)
-            resp.raise_for_status()
-
-            raw_text = resp.text
-            raw_len = len(raw_text)
-            html = _extract_inner_html(raw_text)
-            extracted_len = len(html)
-            logger.info(f"  응답: raw={raw_len} chars → extracted={extracted_len} chars")
-
-            # 추출 성공 여부 판단: 추출 후 크기가 변했거나, raw 자체가 콘텐츠인 경우
-            extraction_ok = (html is not raw_text) or raw_len < 100000
-            if extraction_ok:
-                return html
-
+    def _get_raw() -> str:
+        resp = get_http_session().get(url, timeout=60)
+        resp.raise_for_status()
+        return resp.text
+
+    def _fetch_once():
+        logger.info(f"  Apps Script 요청: {date}")
+        raw_text = cassette.through("digest", date, _get_raw)
+        raw_len = len(raw_text)
+        html = _extract_inner_html(raw_text)
+        logger.info(f"  응답: raw={raw_len} chars → extracted={len(html)} chars")
+
+        # 추출 성공 여부 판단: 추출 후 크기가 변했거나, raw 자체가 콘텐츠인 경우
+        extraction_ok = (html is not raw_text) or raw_len < 100000
+        if not extraction_ok:
             # 추출 실패: raw HTML이 그대로 반환됨 (iframe wrapper 추출 실패)
-            logger.warning(f"  iframe wrapper 추출 실패 (시도 {attempt}/{max_retries}), raw={raw_len} chars")
-            if attempt < max_retries:
-                wait = attempt * 5
-                logger.info(f"  {wait}초 후 재시도...")
-                time.sleep(wait)
-        except requests.RequestException as e:
-            logger.warning(f"  요청 실패 (시도 {attempt}/{max_retries}): {e}")
-            if attempt < max_retries:
-                wait = attempt * 5
-                logger.info(f"  {wait}초 후 재시도...")
-                time.sleep(wait)
-            else:
-                raise RuntimeError(f"Apps Script 요청 {max_retries}회 실패: {e}")
-
-    # 모든 재시도 후에도 추출 실패하면 마지막 결과 반환
-    logger.warning("  모든 재시도 완료. 마지막 추출 결과 반환")
+            logger.warning(f"  iframe wrapper 추출 실패, raw={raw_len} chars")
+        return html, extraction_ok
+
+    try:
+        # 추출 실패는 서비스 장애가 아니므로 브레이커 실패로 세지 않음
+        html, extraction_ok = call_with_retry(
+            "apps_script",
+            _fetch_once,
+            max_attempts=max_retries,
+            base_delay=5,
+            retry_if=lambda r: not r[1],
+            result_is_failure=False,
+            label="Apps Script 요청",
+        )
+    except requests.RequestException as e:
+        raise RuntimeError(f"Apps Script 요청 {max_retries}회 실패: {e}")
+
+    if not extraction_ok:
+        # 모든 재시도 후에도 추출 실패하면 마지막 결과 반환
+        logger.warning("  모든 재시도 완료. 마지막 추출 결과 반환")
     return html
 
 
@@ -198,6 +226,46 @@ def parse_digest_html(html: str) -> List[Dict]:
     return members
 
 
+def submitted_results(parsed: List[Dict], target_date: str) -> List[Dict]:
+    """parse_digest_html() 결과 → scan_all_members() 형식 (제출한 회원만)"""
+    return [
+        {
+            "name": m["name"],
+            "date": target_date,
+            "has_submission": True,
+            "text_content": m["text_content"],
+            "files": [{"name": f, "type": "unknown"} for f in m["files"]],
+        }
+        for m in parsed
+    ]
+
+
+def _digest_cache_path(date: str) -> Path:
+    return DIGEST_CACHE_DIR / f"{date}.json"
+
+
+def save_parsed_digest(date: str, parsed: List[Dict]):
+    """parse_digest_html() 결과를 날짜별로 로컬 보관 (월간 분석용, 빈 결과는 저장하지 않음)"""
+    if not parsed:
+        return
+    try:
+        DIGEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _digest_cache_path(date)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(parsed, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning(f"  digest 캐시 저장 실패 ({date}): {e}")
+
+
+def load_parsed_digest(date: str) -> Optional[List[Dict]]:
+    """로컬에 보관한 parse_digest_html() 결과 (없으면 None)"""
+    try:
+        return json.loads(_digest_cache_path(date).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
 def scan_all_members(target_date: Optional[str] = None) -> List[Dict]:
     """
     모든 회원의 학습 데이터 수집 (Apps Script 웹앱 경유)
@@ -209,30 +277,23 @@ def scan_all_members(target_date: Optional[str] = None) -> List[Dict]:
     if target_date is None:
         target_date = get_target_date()
 
-    print(f"📅 대상 날짜: {target_date}")
+    logger.info(f"📅 대상 날짜: {target_date}")
 
     # 1) 웹앱에서 HTML 가져오기
-    print("  🌐 Apps Script 웹앱에서 데이터 가져오는 중...")
+    logger.info("  🌐 Apps Script 웹앱에서 데이터 가져오는 중...")
     html = fetch_digest_html(target_date)
     logger.info(f"  fetch_digest_html 결과: {len(html)} chars, has_member_section={'member-section' in html}")
 
     # 2) HTML 파싱 → 제출한 회원 데이터
     parsed = parse_digest_html(html)
+    save_parsed_digest(target_date, parsed)
     submitted_names = {m["name"] for m in parsed}
-    print(f"  📊 HTML에서 {len(parsed)}명 데이터 파싱 완료")
+    logger.info(f"  📊 HTML에서 {len(parsed)}명 데이터 파싱 완료")
     if len(parsed) == 0:
         logger.warning(f"  파싱 결과 0명! HTML 앞부분: {html[:500]}")
 
     # 3) 결과 조립
-    results = []
-    for m in parsed:
-        results.append({
-            "name": m["name"],
-            "date": target_date,
-            "has_submission": True,
-            "text_content": m["text_content"],
-            "files": [{"name": f, "type": "unknown"} for f in m["files"]],
-        })
+    results = submitted_results(parsed, target_date)
 
     # 4) members.json에서 미제출 회원 추가
     all_names = _load_member_names()
@@ -248,10 +309,10 @@ def scan_all_members(target_date: Optional[str] = None) -> List[Dict]:
 
     # 5) 요약 출력
     submitted_count = sum(1 for r in results if r["has_submission"])
-    print(f"  👥 전체: {len(results)}명 (제출 {submitted_count} / 미제출 {len(results) - submitted_count})")
+    logger.info(f"  👥 전체: {len(results)}명 (제출 {submitted_count} / 미제출 {len(results) - submitted_count})")
     for r in results:
         status = "✅" if r["has_submission"] else "❌"
-        print(f"    {status} {r['name']}")
+        logger.info(f"    {status} {r['name']}", extra={"member": r["name"]})
 
     return results
 
@@ -260,22 +321,24 @@ def test_connection() -> bool:
     """Apps Script 웹앱 연결 테스트"""
     try:
         if not APPS_SCRIPT_URL:
-            print("❌ APPS_SCRIPT_URL이 설정되지 않았습니다.")
+            logger.error("❌ APPS_SCRIPT_URL이 설정되지 않았습니다.")
             return False
 
-        print(f"  URL: {APPS_SCRIPT_URL}")
+        logger.info(f"  URL: {APPS_SCRIPT_URL}")
         target_date = get_target_date()
         html = fetch_digest_html(target_date)
 
         parsed = parse_digest_html(html)
-        print(f"✅ Apps Script 웹앱 연결 성공! ({len(parsed)}명 데이터 수신)")
+        logger.info(f"✅ Apps Script 웹앱 연결 성공! ({len(parsed)}명 데이터 수신)")
         return True
     except Exception as e:
-        print(f"❌ Apps Script 웹앱 연결 실패: {e}")
+        logger.error(f"❌ Apps Script 웹앱 연결 실패: {e}")
         return False
 
 
 if __name__ == "__main__":
+    from log_setup import setup_logging
+    setup_logging("drive_scanner")
     print("=== Apps Script 웹앱 연결 테스트 ===")
     if test_connection():
         print("\n=== 회원 데이터 스캔 테스트 ===")
@@ -0,0 +1,192 @@
+"""
+추출 요약 모듈
+- 요약 프롬프트에 넣기 전, 회원 텍스트에서 중요한 문장/제목을 골라 토큰 예산 안에 채움
+- 글자 수로 앞부분만 자르는 방식보다 프롬프트가 짧고 핵심 내용이 남음
+
+점수: 문장 내 단어의 TF-IDF 합(문서 = 회원 텍스트의 각 문장) + 제목 가중치 + 앞쪽 위치 보너스
+"""
+import math
+import re
+import sys
+import time
+from collections import Counter
+from typing import List, Tuple
+
+# 제목(#, ##, ...) 가중치: 수준이 높을수록 큼
+HEADING_WEIGHTS = {1: 3.0, 2: 2.0, 3: 1.5}
+DEFAULT_HEADING_WEIGHT = 1.2
+
+# 문장 분리: 줄바꿈, 또는 종결 부호 뒤 공백
+_SENTENCE_SPLIT = re.compile(r"\n+|(?<=[.!?。])\s+")
+# 단어: 한글/영문/숫자 연속 (한글은 2글자 이상만 의미 있는 단어로 취급)
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9_+#.-]*|[0-9]+|[가-힣]{2,}")
+_HEADING = re.compile(r"^(#{1,6})\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Gemini 토큰 수 대략 추정
+    - ASCII는 약 4글자당 1토큰, 한글 등 비ASCII는 약 1.5글자당 1토큰
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return int(ascii_chars / 4 + other_chars / 1.5) + 1
+
+
+def split_units(text: str) -> List[str]:
+    """텍스트를 문장/제목/목록 항목 단위로 분리 (빈 줄 제거)"""
+    return [u.strip() for u in _SENTENCE_SPLIT.split(text) if u and u.strip()]
+
+
+def _tokenize(unit: str) -> List[str]:
+    return [w.lower() for w in _WORD.findall(unit)]
+
+
+def _heading_weight(unit: str) -> float:
+    match = _HEADING.match(unit)
+    if not match:
+        return 1.0
+    return HEADING_WEIGHTS.get(len(match.group(1)), DEFAULT_HEADING_WEIGHT)
+
+
+def score_units(units: List[str]) -> List[float]:
+    """단위별 중요도 점수 (TF-IDF 평균 × 제목 가중치 + 위치 보너스)"""
+    tokenized = [_tokenize(u) for u in units]
+    n = len(units)
+    df = Counter()
+    for words in tokenized:
+        df.update(set(words))
+
+    scores = []
+    for i, (unit, words) in enumerate(zip(units, tokenized)):
+        if words:
+            tf = Counter(words)
+            tfidf = sum(
+                count * (math.log((1 + n) / (1 + df[w])) + 1)
+                for w, count in tf.items()
+            )
+            # 긴 문장이 무조건 유리하지 않도록 단어 수의 제곱근으로 정규화
+            base = tfidf / math.sqrt(len(words))
+        else:
+            base = 0.1
+        position_bonus = 0.5 * (1 - i / n) if n > 1 else 0.5
+        scores.append(base * _heading_weight(unit) + position_bonus)
+    return scores
+
+
+def extract_to_budget(text: str, token_budget: int) -> str:
+    """
+    텍스트가 토큰 예산을 넘으면 중요한 단위만 골라 원래 순서대로 이어붙임
+
+    Args:
+        text: 원본 텍스트
+        token_budget: 추정 토큰 수 상한
+
+    Returns:
+        예산 이내의 텍스트 (원본이 예산 이내면 그대로)
+    """
+    text = text.strip()
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    units = split_units(text)
+    scores = score_units(units)
+
+    chosen = []
+    seen = set()
+    used = 0
+    for idx in sorted(range(len(units)), key=lambda i: scores[i], reverse=True):
+        # 같은 문장이 반복되면 한 번만 포함
+        if units[idx] in seen:
+            continue
+        cost = estimate_tokens(units[idx]) + 1
+        if used + cost > token_budget:
+            continue
+        chosen.append(idx)
+        seen.add(units[idx])
+        used += cost
+
+    if not chosen:
+        # 한 단위도 들어가지 않으면 가장 중요한 단위를 글자 수로 잘라 사용
+        best = units[max(range(len(units)), key=lambda i: scores[i])]
+        ratio = token_budget / estimate_tokens(best)
+        return best[: max(1, int(len(best) * ratio))]
+
+    return "\n".join(units[i] for i in sorted(chosen))
+
+
+def _measure_gemini_latency(content: str) -> float:
+    """요약 프롬프트 1회 호출 지연 시간 (초)"""
+    from content_summarizer import init_gemini
+
+    model = init_gemini()
+    start = time.perf_counter()
+    model.generate_content(f"다음 공부 인증 내용을 50자 이내로 요약해주세요.\n\n{content}\n\n요약:")
+    return time.perf_counter() - start
+
+
+def benchmark(
+    texts: List[Tuple[str, str]],
+    token_budget: int,
+    char_limit: int = 2000,
+    live: bool = False,
+):
+    """
+    기존 글자 수 자르기(text[:char_limit])와 추출 요약의 프롬프트 크기/처리 시간 비교
+
+    Args:
+        texts: [(이름, 원본 텍스트), ...]
+        token_budget: 추출 요약 토큰 예산
+        char_limit: 기존 방식 글자 수
+        live: True면 Gemini에 실제 요청해 두 방식의 응답 지연 시간도 비교
+    """
+    print(f"{'이름':<20} {'원본':>8} {'slice':>8} {'extract':>8} {'extract ms':>11}")
+    total_slice = total_extract = 0
+    for name, text in texts:
+        sliced = text[:char_limit]
+        start = time.perf_counter()
+        extracted = extract_to_budget(text, token_budget)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        slice_tokens = estimate_tokens(sliced)
+        extract_tokens = estimate_tokens(extracted)
+        total_slice += slice_tokens
+        total_extract += extract_tokens
+        print(
+            f"{name[:20]:<20} {estimate_tokens(text):>8} {slice_tokens:>8} "
+            f"{extract_tokens:>8} {elapsed_ms:>11.2f}"
+        )
+        if live:
+            slice_latency = _measure_gemini_latency(sliced)
+            extract_latency = _measure_gemini_latency(extracted)
+            print(f"{'':<20} Gemini 지연: slice {slice_latency:.2f}s / extract {extract_latency:.2f}s")
+
+    if total_slice:
+        print(f"\n프롬프트 토큰 합계: slice {total_slice} → extract {total_extract} "
+              f"({(1 - total_extract / total_slice):.0%} 감소)")
+
+
+if __name__ == "__main__":
+    # 사용법: python extractive.py [--live] [토큰 예산] [텍스트 파일 ...]
+    # 파일을 주지 않으면 표본 텍스트를 반복해 만든 긴 입력으로 비교
+    args = sys.argv[1:]
+    live = "--live" in args
+    args = [a for a in args if a != "--live"]
+    budget = int(args[0]) if args else 400
+    paths = args[1:]
+    if paths:
+        samples = [(p, open(p, encoding="utf-8").read()) for p in paths]
+    else:
+        sample = """
+# React 상태 관리 정리
+## useState
+- 함수형 컴포넌트에서 상태를 선언한다. const [count, setCount] = useState(0);
+- 상태 업데이트는 비동기로 처리되므로 이전 상태 기반 업데이트는 함수형으로 작성한다.
+## useReducer
+- 복잡한 상태 전이는 reducer 함수로 분리하면 테스트가 쉬워진다.
+- dispatch로 action 객체를 전달한다.
+## 오늘 느낀 점
+오늘은 컨디션이 좋지 않아서 오래 집중하지 못했다. 내일은 Context API와 Redux를 비교해 볼 예정이다.
+"""
+        samples = [(f"sample x{n}", sample * n) for n in (1, 3, 10, 30)]
+    benchmark(samples, budget, live=live)
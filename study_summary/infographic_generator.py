@@ -4,12 +4,18 @@
 NotebookLM API를 사용하여 회원별 학습 인포그래픽을 생성합니다.
 """
 import asyncio
+import io
 import logging
+import shutil
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
-from config import OUTPUT_DIR
+import cassette
+from config import CACHE_DIR, OUTPUT_DIR
+from scheduler import CHEAP_DETAIL, CHEAP_MODE_FACTOR, DEFAULT_DETAIL
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +23,23 @@ MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
 GENERATION_TIMEOUT = 180.0  # seconds
 
+# 라벨 오버레이 전 원본 (같은 내용을 다시 제출하면 새 날짜 라벨만 얹어 재사용)
+SOURCE_DIR = CACHE_DIR / "infographic_sources"
 
-def _overlay_label(image_path: Path, member_name: str, date: str):
-    """인포그래픽 이미지 상단에 이름과 날짜 라벨을 오버레이한다."""
+# 최근 생성한 이미지의 최종 PNG bytes (Slack 전송 시 디스크 재읽기 생략용)
+RENDERED_CACHE_SIZE = 32
+_rendered = OrderedDict()
+_rendered_lock = threading.Lock()
+
+
+def take_rendered_bytes(image_path: Path) -> bytes | None:
+    """생성 직후 메모리에 남겨둔 이미지 bytes를 꺼냄 (없으면 None)"""
+    with _rendered_lock:
+        return _rendered.pop(Path(image_path), None)
+
+
+def _overlay_label(image_path: Path, member_name: str, date: str) -> bytes:
+    """인포그래픽 이미지 상단에 이름과 날짜 라벨을 오버레이하고 최종 PNG bytes를 반환한다."""
     img = Image.open(image_path)
     draw = ImageDraw.Draw(img)
 
@@ -58,8 +78,13 @@ def _overlay_label(image_path: Path, member_name: str, date: str):
         fill=(255, 255, 255),
     )
 
-    img.save(image_path)
+    # 한 번만 인코딩해서 파일 저장과 메모리 전송에 같이 사용
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    data = buffer.getvalue()
+    image_path.write_bytes(data)
     logger.info(f"  라벨 오버레이 완료: {label}")
+    return data
 
 
 async def _generate_infographic_async(
@@ -67,6 +92,8 @@ async def _generate_infographic_async(
     study_content: str,
     date: str,
     output_dir: Path = OUTPUT_DIR,
+    timeout: float = GENERATION_TIMEOUT,
+    detail: str = DEFAULT_DETAIL,
 ) -> Path | None:
     """
     NotebookLM을 사용하여 인포그래픽을 비동기 생성합니다.
@@ -76,14 +103,24 @@ async def _generate_infographic_async(
         study_content: 학습 내용 텍스트
         date: 대상 날짜 (YYYY-MM-DD)
         output_dir: 출력 디렉토리
+        timeout: 생성 완료 대기 시간 (초)
+        detail: 상세도 (InfographicDetail 이름, 소문자)
 
     Returns:
-        생성된 이미지 파일 경로, 실패 시 None
+        생성된 이미지 파일 경로, 생성이 실패로 끝나 결과물이 없으면 None
+
+    Raises:
+        NotebookLM 연결/서비스 오류 (호출자의 브레이커가 장애로 셈)
     """
+    cassette_key = f"{member_name}|{date}"
+    if cassette.replaying():
+        return await _replay_infographic(member_name, date, output_dir, cassette_key)
+
     from notebooklm import NotebookLMClient, InfographicOrientation, InfographicDetail
 
     output_dir.mkdir(parents=True, exist_ok=True)
     notebook = None
+    started = time.perf_counter()
 
     try:
         async with await NotebookLMClient.from_storage() as client:
@@ -107,7 +144,7 @@ async def _generate_infographic_async(
                 notebook.id,
                 language="ko",
                 orientation=InfographicOrientation.PORTRAIT,
-                detail_level=InfographicDetail.DETAILED,
+                detail_level=InfographicDetail[detail.upper()],
                 instructions=(
                     "이 인포그래픽은 한국어 사용자를 위한 것입니다. 원본 내용을 최대한 자세히 포함하되, 다음 규칙을 반드시 지켜주세요:\n"
                     "1. 모든 한글 텍스트는 충분히 큰 폰트 크기로 렌더링하여 글자가 뭉개지거나 깨지지 않도록 하세요.\n"
@@ -120,11 +157,17 @@ async def _generate_infographic_async(
             logger.info(f"  인포그래픽 생성 요청 완료, 대기 중...")
 
             # 4. 완료 대기
-            await client.artifacts.wait_for_completion(
+            final = await client.artifacts.wait_for_completion(
                 notebook.id,
                 status.task_id,
-                timeout=GENERATION_TIMEOUT,
+                timeout=timeout,
             )
+            if getattr(final, "is_failed", False):
+                # 서비스는 정상 응답, 이 내용으로 결과물을 만들지 못함
+                logger.error(f"  인포그래픽 생성 실패 (결과물 없음)")
+                if cassette.recording():
+                    cassette.current().record("notebooklm", cassette_key, time.perf_counter() - started, None)
+                return None
             logger.info(f"  인포그래픽 생성 완료")
 
             # 5. 다운로드
@@ -134,14 +177,74 @@ async def _generate_infographic_async(
             )
             logger.info(f"  다운로드 완료: {output_path}")
 
-            # 5-1. 이름/날짜 오버레이
-            _overlay_label(output_path, member_name, date)
+            if cassette.recording():
+                cassette.current().record(
+                    "notebooklm", cassette_key, time.perf_counter() - started, output_path.read_bytes()
+                )
 
+            # 5-1. 이름/날짜 오버레이
+            _finish_output(output_path, member_name, date)
             return output_path
 
     except Exception as e:
         logger.error(f"  인포그래픽 생성 오류: {e}")
+        if cassette.recording():
+            # 재생 시 같은 오류로 다시 발생 (cassette.RecordedError)
+            cassette.current().record_error("notebooklm", cassette_key, time.perf_counter() - started, e)
+        raise
+
+
+def source_path(member_name: str, date: str) -> Path:
+    """라벨 오버레이 전 원본 보관 경로"""
+    return SOURCE_DIR / f"infographic_{member_name}_{date}.png"
+
+
+def _finish_output(output_path: Path, member_name: str, date: str):
+    """원본 보관, 라벨 오버레이 후 최종 bytes를 전송용 메모리 캐시에 보관"""
+    source = source_path(member_name, date)
+    if source != output_path:
+        SOURCE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output_path, source)
+    rendered = _overlay_label(output_path, member_name, date)
+    with _rendered_lock:
+        _rendered[output_path] = rendered
+        while len(_rendered) > RENDERED_CACHE_SIZE:
+            _rendered.popitem(last=False)
+
+
+async def _replay_infographic(member_name: str, date: str, output_dir: Path, key: str) -> Path | None:
+    """카세트에 녹화된 NotebookLM 결과 재생 (녹화된 생성 시간만큼 대기 가능)"""
+    entry = cassette.current().next("notebooklm", key)
+    if entry is None:
+        logger.error(f"  녹화된 인포그래픽 없음: {key}")
         return None
+    await cassette.current().apause(entry)
+    data = cassette.current().body(entry)  # 녹화된 오류는 여기서 다시 발생
+    if data is None:
+        logger.error("  인포그래픽 생성 오류 (녹화된 실패 재생)")
+        return None
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / f"infographic_{member_name}_{date}.png"
+    output_path.write_bytes(data)
+    _finish_output(output_path, member_name, date)
+    return output_path
+
+
+def reuse_infographic(member_name: str, date: str, source_date: str, output_dir: Path = OUTPUT_DIR) -> Path | None:
+    """
+    같은 내용으로 source_date에 만든 인포그래픽 원본에 새 날짜 라벨을 얹어 재사용
+
+    Returns:
+        이미지 파일 경로, 원본이 없으면 None
+    """
+    source = source_path(member_name, source_date)
+    if not source.exists():
+        return None
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / f"infographic_{member_name}_{date}.png"
+    shutil.copyfile(source, output_path)
+    _finish_output(output_path, member_name, date)
+    return output_path
 
 
 def generate_infographic(
@@ -149,33 +252,67 @@ def generate_infographic(
     study_content: str,
     date: str,
     output_dir: Path = OUTPUT_DIR,
+    detail: str = DEFAULT_DETAIL,
+    expected_seconds: float = 0.0,
 ) -> Path | None:
     """
     인포그래픽 생성 (동기 래퍼, 최대 3회 재시도).
+    NotebookLM 브레이커가 열려 있거나 실행 시간 예산이 부족하면 바로 None을 반환합니다.
 
     Args:
         member_name: 회원 이름
         study_content: 학습 내용 텍스트
         date: 대상 날짜 (YYYY-MM-DD)
         output_dir: 출력 디렉토리
+        detail: 상세도 ("detailed" / "standard" / "concise")
+        expected_seconds: 1회 생성 예상 시간 - 재시도 때 남은 예산이 이보다 적으면 간략 모드로 낮춤
 
     Returns:
         생성된 이미지 파일 경로, 실패 시 None
     """
-    for attempt in range(1, MAX_RETRIES + 1):
-        logger.info(f"  [{member_name}] 시도 {attempt}/{MAX_RETRIES}")
-        result = asyncio.run(
-            _generate_infographic_async(member_name, study_content, date, output_dir)
-        )
-        if result is not None:
-            return result
+    from resilience import BudgetExceededError, CircuitOpenError, call_with_retry, remaining_budget
+
+    current = {"detail": detail, "attempt": 0}
+
+    def _attempt():
+        current["attempt"] += 1
+        if (current["attempt"] > 1 and current["detail"] != CHEAP_DETAIL
+                and remaining_budget() < expected_seconds):
+            logger.warning(
+                f"  [{member_name}] 남은 예산 {remaining_budget():.0f}초 < 예상 {expected_seconds:.0f}초 "
+                f"- 재시도는 간략 모드로 생성",
+                extra={"member": member_name, "stage": "degrade"},
+            )
+            current["detail"] = CHEAP_DETAIL
+        # 남은 실행 예산보다 오래 기다리지 않음
+        timeout = min(GENERATION_TIMEOUT, remaining_budget())
+        return asyncio.run(_generate_infographic_async(
+            member_name, study_content, date, output_dir, timeout, current["detail"]
+        ))
 
-        if attempt < MAX_RETRIES:
-            logger.warning(f"  [{member_name}] 재시도 대기 {RETRY_DELAY}초...")
-            time.sleep(RETRY_DELAY)
+    try:
+        result = call_with_retry(
+            "notebooklm",
+            _attempt,
+            max_attempts=MAX_RETRIES,
+            base_delay=RETRY_DELAY,
+            retry_if=lambda r: r is None,
+            # 결과물 없음은 내용 문제이므로 브레이커 실패로 세지 않음 (연결/서비스 오류만 셈)
+            result_is_failure=False,
+            # 간략 모드로도 끝낼 수 없는 재시도는 하지 않음
+            attempt_seconds=expected_seconds * CHEAP_MODE_FACTOR,
+            label=f"[{member_name}] 인포그래픽 생성",
+        )
+    except (CircuitOpenError, BudgetExceededError) as e:
+        logger.error(f"  [{member_name}] 생성 중단: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"  [{member_name}] {MAX_RETRIES}회 시도 모두 실패: {e}")
+        return None
 
-    logger.error(f"  [{member_name}] {MAX_RETRIES}회 시도 모두 실패")
-    return None
+    if result is None:
+        logger.error(f"  [{member_name}] {MAX_RETRIES}회 시도 모두 실패")
+    return result
 
 
 # main.py 호환 별칭
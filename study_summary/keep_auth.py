@@ -5,6 +5,12 @@ Playwright 영구 브라우저 프로필을 사용하여 Google 세션 쿠키를
 주기적으로 갱신합니다. 작업 스케줄러로 8~12시간마다 실행하면
 storage_state.json의 쿠키가 만료되기 전에 자동 갱신됩니다.
 
+기본은 가벼운 갱신 모드(이미지/폰트/미디어 차단, 리다이렉트 완료까지만 대기)이며
+--full 옵션을 주면 기존처럼 networkidle까지 전체 페이지를 로드합니다.
+
+--if-due 옵션을 주면 쿠키 만료 시각 기반 일정(auth_schedule.py)상
+갱신이 필요할 때만 브라우저를 띄웁니다. 이 경우 1시간마다 실행하면 됩니다.
+
 동작 원리:
 1. Playwright Chromium을 영구 프로필로 열기 (headless)
 2. NotebookLM 페이지 방문 → 브라우저 프로필의 쿠키로 자동 인증
@@ -15,34 +21,130 @@ storage_state.json의 쿠키가 만료되기 전에 자동 갱신됩니다.
 import sys
 import json
 import logging
+import time
 from pathlib import Path
-from datetime import datetime
 
 # notebooklm-py 패키지 경로
 NOTEBOOKLM_HOME = Path.home() / ".notebooklm"
 STORAGE_PATH = NOTEBOOKLM_HOME / "storage_state.json"
 BROWSER_PROFILE = NOTEBOOKLM_HOME / "browser_profile"
-LOG_DIR = Path(__file__).parent / "logs"
+
+NOTEBOOKLM_URL = "https://notebooklm.google.com/"
+
+# 가벼운 갱신 모드에서 차단할 리소스 (쿠키 갱신과 최종 URL 확인에는 필요 없음)
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+# 리다이렉트가 끝났다고 판단할 URL 무변화 시간 / 최대 대기 시간 (ms)
+URL_SETTLE_MS = 1000
+URL_SETTLE_TIMEOUT_MS = 15000
 
 logger = logging.getLogger(__name__)
 
 
 def setup_logging():
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    log_file = LOG_DIR / f"keep_auth_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[
-            logging.FileHandler(log_file, encoding="utf-8"),
-            logging.StreamHandler(sys.stdout),
+    """logs/keep_auth.jsonl + 콘솔 (큐 기반, log_setup.py)"""
+    from log_setup import setup_logging as _setup
+    _setup("keep_auth")
+
+
+def _block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def launch_context(p, lean: bool = True):
+    """Playwright 영구 프로필로 Chromium 컨텍스트 실행
+
+    Args:
+        lean: True면 이미지/폰트/미디어 요청을 차단
+    """
+    # headless shell은 persistent context를 지원하지 않으므로
+    # 전체 Chromium을 --headless=new 모드로 실행
+    context = p.chromium.launch_persistent_context(
+        user_data_dir=str(BROWSER_PROFILE),
+        headless=False,
+        args=[
+            "--headless=new",
+            "--disable-gpu",
+            "--disable-blink-features=AutomationControlled",
+            "--password-store=basic",
         ],
+        ignore_default_args=["--enable-automation"],
     )
+    if lean:
+        context.route("**/*", _block_heavy_resources)
+    return context
+
+
+def _wait_for_url_settle(page):
+    """URL이 URL_SETTLE_MS 동안 바뀌지 않을 때까지 대기 (JS 리다이렉트 포함)"""
+    deadline = time.monotonic() + URL_SETTLE_TIMEOUT_MS / 1000
+    last_url = page.url
+    stable_since = time.monotonic()
+    while time.monotonic() < deadline:
+        page.wait_for_timeout(200)
+        if page.url != last_url:
+            last_url = page.url
+            stable_since = time.monotonic()
+        elif time.monotonic() - stable_since >= URL_SETTLE_MS / 1000:
+            return
+
+
+def refresh_in_context(context, lean: bool = True) -> bool:
+    """이미 열린 브라우저 컨텍스트로 NotebookLM 방문 후 storage_state 갱신.
 
+    Args:
+        lean: True면 networkidle까지 기다리지 않고 DOM 로드 후 리다이렉트가
+              멈추는 시점까지만 대기
 
-def refresh_session() -> bool:
+    Returns:
+        True: 세션 갱신 성공
+        False: 인증 만료로 수동 로그인 필요
+    """
+    started = time.perf_counter()
+    page = context.pages[0] if context.pages else context.new_page()
+
+    # NotebookLM 방문
+    logger.info(f"  NotebookLM 페이지 로드 중... ({'lean' if lean else 'full'})")
+    if lean:
+        page.goto(NOTEBOOKLM_URL, wait_until="domcontentloaded", timeout=60000)
+        _wait_for_url_settle(page)
+    else:
+        page.goto(NOTEBOOKLM_URL, wait_until="networkidle", timeout=60000)
+
+    final_url = page.url
+    logger.info(f"  최종 URL: {final_url} (로드 {time.perf_counter() - started:.1f}초)")
+
+    # 로그인 페이지로 리다이렉트되었는지 확인
+    if "accounts.google.com" in final_url:
+        logger.error("인증 만료: Google 로그인 페이지로 리다이렉트됨")
+        logger.error("수동으로 'notebooklm login'을 실행해주세요.")
+        return False
+
+    if "notebooklm.google.com" not in final_url:
+        logger.warning(f"예상치 못한 URL: {final_url}")
+        return False
+
+    # storage_state 저장
+    context.storage_state(path=str(STORAGE_PATH))
+    logger.info("storage_state.json 갱신 완료!")
+
+    # 검증: 저장된 파일 확인
+    data = json.loads(STORAGE_PATH.read_text(encoding="utf-8"))
+    cookie_count = len(data.get("cookies", []))
+    logger.info(f"  저장된 쿠키 수: {cookie_count}")
+    logger.info(f"  갱신 소요 시간: {time.perf_counter() - started:.1f}초")
+
+    return True
+
+
+def refresh_session(lean: bool = True) -> bool:
     """Playwright 영구 프로필로 NotebookLM 방문 후 storage_state 갱신.
 
+    Args:
+        lean: True면 이미지/폰트/미디어를 차단하고 리다이렉트 완료까지만 대기
+
     Returns:
         True: 세션 갱신 성공
         False: 인증 만료로 수동 로그인 필요
@@ -62,67 +164,32 @@ def refresh_session() -> bool:
     logger.info(f"  브라우저 프로필: {BROWSER_PROFILE}")
     logger.info(f"  저장 경로: {STORAGE_PATH}")
 
+    started = time.perf_counter()
     with sync_playwright() as p:
-        # headless shell은 persistent context를 지원하지 않으므로
-        # 전체 Chromium을 --headless=new 모드로 실행
-        context = p.chromium.launch_persistent_context(
-            user_data_dir=str(BROWSER_PROFILE),
-            headless=False,
-            args=[
-                "--headless=new",
-                "--disable-gpu",
-                "--disable-blink-features=AutomationControlled",
-                "--password-store=basic",
-            ],
-            ignore_default_args=["--enable-automation"],
-        )
-
+        context = launch_context(p, lean=lean)
         try:
-            page = context.pages[0] if context.pages else context.new_page()
-
-            # NotebookLM 방문
-            logger.info("  NotebookLM 페이지 로드 중...")
-            response = page.goto(
-                "https://notebooklm.google.com/",
-                wait_until="networkidle",
-                timeout=60000,
-            )
-
-            final_url = page.url
-            logger.info(f"  최종 URL: {final_url}")
-
-            # 로그인 페이지로 리다이렉트되었는지 확인
-            if "accounts.google.com" in final_url:
-                logger.error("인증 만료: Google 로그인 페이지로 리다이렉트됨")
-                logger.error("수동으로 'notebooklm login'을 실행해주세요.")
-                return False
-
-            if "notebooklm.google.com" not in final_url:
-                logger.warning(f"예상치 못한 URL: {final_url}")
-                return False
-
-            # storage_state 저장
-            context.storage_state(path=str(STORAGE_PATH))
-            logger.info("storage_state.json 갱신 완료!")
-
-            # 검증: 저장된 파일 확인
-            data = json.loads(STORAGE_PATH.read_text(encoding="utf-8"))
-            cookie_count = len(data.get("cookies", []))
-            logger.info(f"  저장된 쿠키 수: {cookie_count}")
-
-            return True
-
+            return refresh_in_context(context, lean=lean)
         finally:
             context.close()
+            logger.info(f"  전체 소요 시간 (브라우저 실행 포함): {time.perf_counter() - started:.1f}초")
 
 
-def main():
+def main(if_due: bool = False, lean: bool = True):
     setup_logging()
     logger.info("=" * 50)
     logger.info("NotebookLM 세션 유지 실행")
     logger.info("=" * 50)
 
-    success = refresh_session()
+    if if_due:
+        # 쿠키 만료 일정상 아직 갱신할 필요가 없으면 브라우저를 띄우지 않음
+        from auth_schedule import is_refresh_due
+        due, when, reason = is_refresh_due()
+        if not due:
+            logger.info(f"갱신 불필요 - 다음 예정: {when:%Y-%m-%d %H:%M} ({reason})")
+            return True
+        logger.info(f"갱신 필요: {reason}")
+
+    success = refresh_session(lean=lean)
 
     if success:
         logger.info("세션 갱신 성공")
@@ -133,5 +200,5 @@ def main():
 
 
 if __name__ == "__main__":
-    success = main()
+    success = main(if_due="--if-due" in sys.argv[1:], lean="--full" not in sys.argv[1:])
     sys.exit(0 if success else 1)
@@ -0,0 +1,122 @@
+"""
+로깅 설정 모듈
+- 모든 로거는 QueueHandler로 큐에 넣기만 하고, 파일/콘솔 기록은 QueueListener 스레드가 담당
+  → 느린 콘솔이나 디스크가 파이프라인(및 동시 작업자)을 막지 않음
+- 파일은 JSON Lines 형식 (member/stage/duration 필드 포함), 크기 기준 로테이션
+- 콘솔은 기존과 같은 사람이 읽는 형식
+
+사용:
+    from log_setup import setup_logging
+    setup_logging("run")
+    logger.info("생성 완료", extra={"member": "홍길동", "duration": 42.0})
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime
+from typing import Optional
+
+from config import LOG_DIR, LOG_FILE_MAX_MB, LOG_BACKUP_COUNT
+
+# 로그 레코드의 extra로 전달하면 JSON에 별도 필드로 기록
+STRUCTURED_FIELDS = ("member", "stage", "duration")
+
+CONSOLE_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonLineFormatter(logging.Formatter):
+    """로그 레코드 → JSON 한 줄"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage().strip(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = round(value, 3) if isinstance(value, float) else value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    예외를 별도 필드로 보존하는 QueueHandler
+
+    기본 prepare()는 traceback을 msg에 합치고 exc_info를 지우므로, 리스너 쪽 JSON에서
+    exc 필드를 만들 수 없다. 여기서는 메시지만 확정하고 traceback은 exc_text로 따로 넘긴다
+    (콘솔 Formatter도 exc_text를 메시지 아래에 그대로 출력).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.message = record.msg
+        record.args = None
+        # traceback 객체는 스레드 간에 넘기지 않음
+        record.exc_info = None
+        return record
+
+
+def setup_logging(name: str = "run", level: int = logging.INFO) -> logging.Logger:
+    """
+    루트 로거에 큐 핸들러 연결 (여러 번 호출해도 한 번만 설정)
+
+    Args:
+        name: 로그 파일 이름 (LOG_DIR/{name}.jsonl)
+        level: 로그 레벨
+
+    Returns:
+        루트 로거
+    """
+    global _listener
+    root = logging.getLogger()
+    if _listener is not None:
+        return root
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_DIR / f"{name}.jsonl",
+        maxBytes=LOG_FILE_MAX_MB * 1024 * 1024,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(JsonLineFormatter())
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    # 종료 시 큐에 남은 로그를 모두 기록
+    atexit.register(shutdown_logging)
+
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(StructuredQueueHandler(log_queue))
+    root.setLevel(level)
+    return root
+
+
+def shutdown_logging():
+    """리스너 중지 (큐에 남은 로그 기록 후 종료)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
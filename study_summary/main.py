@@ -12,31 +12,33 @@ import subprocess
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, List, Optional, Tuple
 
 # 설정 모듈
-from config import LOG_DIR, OUTPUT_DIR
+from config import OUTPUT_DIR
 
-# 실행 완료 마커 디렉토리
-MARKER_DIR = LOG_DIR / "markers"
+logger = logging.getLogger(__name__)
 
 # NotebookLM CLI 경로
 NOTEBOOKLM_CLI = Path.home() / "AppData/Roaming/Python/Python314/Scripts/notebooklm.exe"
 
+# 인증 확인 결과 재사용 시간 (데몬 모드에서 연속 실행 시 subprocess 생략)
+AUTH_CHECK_TTL = 10 * 60  # seconds
+_auth_ok_until = 0.0
 
-def setup_logging():
-    """로깅 설정"""
-    log_file = LOG_DIR / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s [%(levelname)s] %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
+# 결과 전달 마감 전에 남겨둘 Slack 전송 시간
+DELIVERY_RESERVE_SECONDS = 120
+
+
+def setup_logging(name: str = "run"):
+    """
+    로깅 설정 (logs/{name}.jsonl + 콘솔, 큐 기반 - log_setup.py)
+
+    상주 프로세스(데몬/watch)는 자기 이름의 파일을 쓴다. Windows에서는 다른 프로세스가
+    열어 둔 파일을 로테이션(이름 변경)할 수 없으므로 프로세스끼리 로그 파일을 공유하지 않음.
+    """
+    from log_setup import setup_logging as _setup
+    _setup(name)
     return logging.getLogger(__name__)
 
 
@@ -47,8 +49,18 @@ def get_target_date() -> str:
     return target.strftime("%Y-%m-%d")
 
 
+def get_result_deadline(target_date: str) -> datetime:
+    """결과 전달 마감: 대상 날짜 다음 날 DEADLINE_HOUR시 + RESULT_DEADLINE_OFFSET_MINUTES분"""
+    from config import DEADLINE_HOUR, RESULT_DEADLINE_OFFSET_MINUTES
+    submission_deadline = datetime.strptime(target_date, "%Y-%m-%d") + timedelta(days=1, hours=DEADLINE_HOUR)
+    return submission_deadline + timedelta(minutes=RESULT_DEADLINE_OFFSET_MINUTES)
+
+
 def check_notebooklm_auth() -> bool:
-    """NotebookLM 인증 상태 확인"""
+    """NotebookLM 인증 상태 확인 (최근 AUTH_CHECK_TTL 안에 성공했으면 재확인 생략)"""
+    global _auth_ok_until
+    if time.monotonic() < _auth_ok_until:
+        return True
     if not NOTEBOOKLM_CLI.exists():
         return False
     try:
@@ -60,7 +72,10 @@ def check_notebooklm_auth() -> bool:
         )
         import json
         data = json.loads(result.stdout)
-        return data.get("status") == "ok"
+        ok = data.get("status") == "ok"
+        if ok:
+            _auth_ok_until = time.monotonic() + AUTH_CHECK_TTL
+        return ok
     except Exception:
         return False
 
@@ -100,8 +115,15 @@ def auto_login_notebooklm(wait_seconds: int = 30) -> bool:
 
 
 def refresh_session_via_playwright() -> bool:
-    """Playwright 영구 프로필로 세션 쿠키 갱신 시도"""
+    """Playwright 영구 프로필로 세션 쿠키 갱신 시도 (세션 유지 데몬이 있으면 데몬 사용)"""
     try:
+        from auth_daemon import request_refresh
+        result = request_refresh()
+        if result is not None:
+            # 데몬이 같은 브라우저 프로필을 열고 있으므로 직접 갱신하지 않음 (프로필 잠금 충돌)
+            print(f"세션 유지 데몬 갱신 {'성공' if result else '실패'}")
+            return result
+
         from keep_auth import refresh_session
         return refresh_session()
     except Exception as e:
@@ -111,6 +133,10 @@ def refresh_session_via_playwright() -> bool:
 
 def ensure_notebooklm_auth() -> bool:
     """NotebookLM 인증 확인 및 필요시 자동 갱신"""
+    import cassette
+    if cassette.replaying():
+        # 카세트 재생은 NotebookLM에 접속하지 않음
+        return True
     if check_notebooklm_auth():
         print("NotebookLM 인증: OK")
         return True
@@ -129,49 +155,14 @@ def ensure_notebooklm_auth() -> bool:
     return False
 
 
-def run_pipeline(test_mode: bool = False, target_date: str = None):
-    """
-    전체 파이프라인 실행 - 각 회원별 개별 인포그래픽 생성
-
-    Args:
-        test_mode: True면 테스트 데이터 사용
-        target_date: 대상 날짜 (YYYY-MM-DD), None이면 자동 계산
-    """
-    logger = setup_logging()
-    
-    logger.info("=" * 50)
-    logger.info("🚀 스터디 인포그래픽 자동 생성 시작")
-    logger.info("=" * 50)
-
-    # 0단계: NotebookLM 인증 확인
-    logger.info("\n🔐 0단계: NotebookLM 인증 확인")
-    if not ensure_notebooklm_auth():
-        logger.error("NotebookLM 인증 실패! 수동 로그인이 필요합니다.")
-        logger.error("실행: notebooklm login")
-        return False
-
-    if target_date is None:
-        target_date = get_target_date()
-    logger.info(f"📅 대상 날짜: {target_date}")
-
-    # 중복 실행 방지: 이미 완료된 날짜인지 확인
-    MARKER_DIR.mkdir(parents=True, exist_ok=True)
-    marker_file = MARKER_DIR / f"done_{target_date}.marker"
-    if marker_file.exists() and not test_mode:
-        logger.info(f"⏭️ {target_date}은 이미 처리 완료됨 (마커: {marker_file}). 스킵합니다.")
-        return True
-
-    try:
-        # 1단계: Google Drive 스캔 또는 테스트 데이터
-        logger.info("\n📂 1단계: 공부 내용 수집")
-        
-        if test_mode:
-            scan_results = [
-                {
-                    "name": "홍길동", 
-                    "date": target_date, 
-                    "has_submission": True,
-                    "text_content": """
+def _test_scan_results(target_date: str) -> List[Dict]:
+    """테스트 모드용 회원 데이터"""
+    return [
+        {
+            "name": "홍길동",
+            "date": target_date,
+            "has_submission": True,
+            "text_content": """
 # JavaScript 화살표 함수
 ## 기본 문법
 - 기존: function(x) { return x * 2; }
@@ -185,12 +176,12 @@ def run_pipeline(test_mode: bool = False, target_date: str = None):
 ## 예시
 const doubled = [1,2,3].map(n => n * 2);
 """
-                },
-                {
-                    "name": "김철수",
-                    "date": target_date,
-                    "has_submission": True,
-                    "text_content": """
+        },
+        {
+            "name": "김철수",
+            "date": target_date,
+            "has_submission": True,
+            "text_content": """
 # React useState 훅
 ## 상태 관리의 기본
 - 함수형 컴포넌트에서 상태 사용
@@ -204,122 +195,455 @@ const doubled = [1,2,3].map(n => n * 2);
 ## 예시
 const [count, setCount] = useState(0);
 """
-                },
-                {
-                    "name": "박민수",
-                    "date": target_date,
-                    "has_submission": False,
-                    "text_content": ""
-                },
-            ]
+        },
+        {
+            "name": "박민수",
+            "date": target_date,
+            "has_submission": False,
+            "text_content": ""
+        },
+    ]
+
+
+# 이미지만 제출한 회원 판단용 확장자
+IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.heic'}
+
+# 인포그래픽을 만들 최소 학습 내용 길이
+MIN_CONTENT_LENGTH = 50
+
+
+def is_image_only(result: dict) -> bool:
+    """제출 파일이 모두 이미지인지 여부"""
+    files = result.get("files", [])
+    if not files:
+        return False
+
+    def get_filename(f):
+        if isinstance(f, dict):
+            return f.get("이름", f.get("name", ""))
+        return str(f)
+
+    return all(
+        Path(get_filename(f).split("(")[0].strip()).suffix.lower() in IMAGE_EXTS
+        for f in files
+    )
+
+
+def select_submitted(scan_results: List[Dict], recorder) -> List[Dict]:
+    """제출한 회원 필터링 - 이미지만 제출한 회원은 인포그래픽 생성 스킵"""
+    submitted = [r for r in scan_results if r.get("has_submission") and not is_image_only(r)]
+    image_only = [r for r in scan_results if r.get("has_submission") and is_image_only(r)]
+    for r in image_only:
+        logger.info(f"  ⏭️ {r['name']}: 이미지 전용 제출 - 인포그래픽 스킵")
+        recorder.member(r["name"], "image_only")
+    logger.info(f"  제출 완료: {len(submitted)}/{len(scan_results)}명 (이미지 전용 {len(image_only)}명 스킵)")
+    return submitted
+
+
+def _generate_one(task, ledger_key, recorder, clock_start: float) -> Optional[Dict]:
+    """작업 1건 생성 (작업자 스레드에서 실행)"""
+    from infographic_generator import generate_educational_infographic
+
+    member = task.member
+    logger.info(f"\n  📝 {member['name']} 인포그래픽 생성 중... (예측 {task.predicted:.0f}초)")
+
+    started = time.perf_counter()
+    task.started = started - clock_start
+    result = None
+    try:
+        image_path = generate_educational_infographic(
+            member_name=member["name"],
+            study_content=member["text_content"],
+            date=member["date"],
+            detail=task.detail,
+            expected_seconds=task.predicted,
+        )
+
+        if image_path:
+            result = {
+                "name": member["name"],
+                "path": image_path,
+                "ledger_key": ledger_key,
+            }
+            logger.info(f"  ✅ {member['name']}: {image_path}", extra={
+                "member": member["name"], "stage": "generate",
+                "duration": time.perf_counter() - started,
+            })
+            member_status, member_error = "generated", None
+        else:
+            logger.warning(f"  ⚠️ {member['name']}: 이미지 생성 실패", extra={
+                "member": member["name"], "stage": "generate",
+                "duration": time.perf_counter() - started,
+            })
+            member_status, member_error = "failed", None
+    except Exception as e:
+        logger.error(f"  ❌ {member['name']}: 오류 - {e}", extra={
+            "member": member["name"], "stage": "generate",
+            "duration": time.perf_counter() - started,
+        })
+        member_status, member_error = "error", str(e)
+    task.finished = time.perf_counter() - clock_start
+    recorder.member(
+        member["name"], member_status,
+        content_length=task.content_length,
+        duration=task.actual,
+        error=member_error,
+        detail=task.detail,
+    )
+    return result
+
+
+def check_repeats(pending: List[Dict], ledger_keys: Dict, recorder) -> Tuple[Dict[str, Dict], set]:
+    """
+    과거 제출과 같은/거의 같은 내용 확인
+
+    Returns:
+        (재사용한 회원 {이름: 결과}, 거의 같은 내용이라 간략 모드로 생성할 회원 이름)
+    """
+    from config import NEAR_DUPLICATE_ACTION
+    from content_index import EXACT, find_match, record_submission
+    from infographic_generator import reuse_infographic
+
+    reused = {}
+    near = set()
+    for member in pending:
+        name = member["name"]
+        match = find_match(name, member["date"], member["text_content"])
+        if match is None:
+            continue
+        if match.kind == EXACT:
+            image_path = reuse_infographic(name, member["date"], match.date)
+            if image_path:
+                logger.info(
+                    f"  ♻️ {name}: {match.date} 제출과 같은 내용 - 인포그래픽 재사용 (조회 {match.lookup_ms:.2f}ms)",
+                    extra={"member": name, "stage": "generate"},
+                )
+                reused[name] = {"name": name, "path": image_path, "ledger_key": ledger_keys[name]}
+                recorder.member(name, "reused", content_length=len(member["text_content"].strip()))
+                record_submission(name, member["date"], member["text_content"])
+                continue
+            logger.info(f"  {name}: {match.date} 제출과 같은 내용이지만 원본 이미지가 없어 새로 생성",
+                        extra={"member": name, "stage": "generate"})
+            continue
+        logger.warning(
+            f"  🔁 {name}: {match.date} 제출과 거의 같은 내용 (SimHash 거리 {match.distance}, "
+            f"조회 {match.lookup_ms:.2f}ms)",
+            extra={"member": name, "stage": "generate"},
+        )
+        if NEAR_DUPLICATE_ACTION == "cheap":
+            near.add(name)
+    return reused, near
+
+
+def generate_members(submitted: List[Dict], recorder, test_mode: bool = False) -> List[Dict]:
+    """
+    회원별 인포그래픽 생성 (순서는 scheduler.plan)
+
+    같은 회원의 과거 제출과 내용이 같으면 그때 만든 인포그래픽을 재사용하고, 거의 같으면
+    NEAR_DUPLICATE_ACTION에 따라 간략 모드로 생성한다 (content_index).
+    동시 생성 수는 GENERATION_WORKERS부터 시작해, 실행 시간 예산(결과 전달 마감)에서
+    전송 몫(DELIVERY_RESERVE_SECONDS)을 뺀 시간 안에 끝나도록 GENERATION_MAX_WORKERS까지 늘린다.
+
+    Returns:
+        [{"name", "path", "ledger_key"}, ...] - 생성에 성공한 회원 (digest 순서)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from config import GENERATION_MAX_WORKERS, GENERATION_WORKERS
+    from delivery_ledger import is_delivered, make_key
+    from resilience import remaining_budget
+    from scheduler import DEFAULT_DETAIL, degrade_members, fit_to_deadline, plan, report
+
+    pending = []
+    ledger_keys = {}
+    for member in submitted:
+        content_length = len(member.get("text_content", "").strip())
+        if content_length < MIN_CONTENT_LENGTH:
+            logger.warning(f"  ⏭️ {member['name']}: 내용 부족 ({content_length}자 < {MIN_CONTENT_LENGTH}자) - 스킵")
+            recorder.member(member["name"], "skipped_short", content_length=content_length)
+            continue
+
+        # 같은 내용을 이미 Slack으로 보냈으면 생성부터 스킵 (재실행/백필/watch 모드에서 처리됨)
+        ledger_key = make_key(member["date"], member["name"], member["text_content"])
+        if not test_mode and is_delivered(ledger_key):
+            logger.info(f"  ⏭️ {member['name']}: 이미 전송됨 - 스킵")
+            recorder.member(member["name"], "already_delivered", content_length=content_length)
+            continue
+        pending.append(member)
+        ledger_keys[member["name"]] = ledger_key
+
+    results = {}
+    near_duplicates = set()
+    if not test_mode:
+        results, near_duplicates = check_repeats(pending, ledger_keys, recorder)
+    to_generate = [m for m in pending if m["name"] not in results]
+    if not to_generate:
+        return [results[m["name"]] for m in pending if results[m["name"]]]
+
+    workers = max(1, min(GENERATION_WORKERS, len(to_generate)))
+    tasks = plan(to_generate, workers)
+    if near_duplicates:
+        degrade_members(tasks, near_duplicates, "과거 제출과 거의 같은 내용")
+    available = remaining_budget() - DELIVERY_RESERVE_SECONDS
+    if available != float("inf"):
+        workers = fit_to_deadline(tasks, available, workers, max(workers, GENERATION_MAX_WORKERS))
+    logger.info(f"  생성 순서 (작업자 {workers}명): " + ", ".join(
+        f"{t.name}({t.predicted / 60:.1f}분{', 간략' if t.detail != DEFAULT_DETAIL else ''})" for t in tasks
+    ))
+
+    run_started = datetime.now()
+    clock_start = time.perf_counter()
+    with recorder.stage("generate"):
+        # 작업자가 비는 대로 목록 순서대로 가져감 (list scheduling)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="generate") as executor:
+            futures = {
+                t.name: executor.submit(_generate_one, t, ledger_keys[t.name], recorder, clock_start)
+                for t in tasks
+            }
+        results.update({name: future.result() for name, future in futures.items()})
+    report(tasks, workers, time.perf_counter() - clock_start, run_started)
+
+    if not test_mode:
+        from content_index import record_submission
+        for member in to_generate:
+            if results[member["name"]]:
+                record_submission(member["name"], member["date"], member["text_content"])
+
+    return [results[m["name"]] for m in pending if results[m["name"]]]
+
+
+def deliver_images(generated_images: List[Dict], target_date: str, recorder) -> int:
+    """
+    생성된 인포그래픽을 Slack으로 전송 (회원별 직접 전송 + 관리자 DM)
+
+    Returns:
+        전송에 성공한 회원 수
+    """
+    from config import (
+        MEMBER_SLACK_TARGETS,
+        SLACK_DELIVERY_MODE,
+        SLACK_MEMBER_DELIVERY,
+        SLACK_USER_ID,
+    )
+    from infographic_generator import take_rendered_bytes
+    from slack_delivery import SlackUpload, deliver_fanout
+
+    # 생성 직후 메모리에 있는 이미지는 디스크를 다시 읽지 않고 전송
+    uploads = {
+        img["name"]: SlackUpload(
+            filename=img["path"].name,
+            data=take_rendered_bytes(img["path"]),
+            path=img["path"],
+            ledger_key=img["ledger_key"],
+        )
+        for img in generated_images
+    }
+
+    # 회원별 직접 전송 대상과 관리자 DM 대상 분리
+    batches = []
+    relay = []
+    for img in generated_images:
+        target = MEMBER_SLACK_TARGETS.get(img["name"]) if SLACK_MEMBER_DELIVERY else None
+        if target:
+            batches.append((
+                target,
+                [uploads[img["name"]]],
+                f"📚 {target_date} {img['name']}님의 학습 인포그래픽입니다! 💪",
+            ))
+        else:
+            relay.append(img)
+    digest_pdf = None
+    if relay:
+        names = ", ".join(img["name"] for img in relay)
+        relay_uploads = [uploads[img["name"]] for img in relay]
+        if SLACK_DELIVERY_MODE == "digest" and len(relay) > 1:
+            # 관리자 DM은 회원별 이미지를 합친 PDF 한 개로 전송
+            from digest_compositor import build_daily_pdf
+            try:
+                digest_pdf = build_daily_pdf(target_date, images=[img["path"] for img in relay])
+            except Exception as e:
+                # 합본 실패(깨진 이미지 등)는 전송을 막지 않음 - 회원별 이미지로 전송
+                logger.error(f"❌ 다이제스트 PDF 생성 실패, 이미지별로 전송: {e}")
+            if digest_pdf:
+                relay_uploads = [SlackUpload(filename=digest_pdf.name, path=digest_pdf)]
+        batches.append((
+            SLACK_USER_ID,
+            relay_uploads,
+            f"📚 {target_date} 학습 인포그래픽 ({len(relay)}명: {names})\n"
+            f"Slack에 공유해주세요! 💪",
+        ))
+
+    with recorder.stage("deliver"):
+        failed_files = {u.filename for u in deliver_fanout(batches)}
+    if digest_pdf:
+        if digest_pdf.name in failed_files:
+            failed_files.update(img["path"].name for img in relay)
+        else:
+            # 합본 PDF는 여러 회원을 담으므로 원장에는 회원별로 기록
+            from delivery_ledger import record_delivery
+            for img in relay:
+                record_delivery(img["ledger_key"], SLACK_USER_ID)
+    delivered_count = 0
+    for img in generated_images:
+        if img["path"].name in failed_files:
+            logger.warning(f"  ⚠️ {img['name']} 전송 실패", extra={"member": img["name"], "stage": "deliver"})
+            recorder.member(img["name"], "delivery_failed")
+        else:
+            logger.info(f"  ✅ {img['name']} 이미지 전송 완료", extra={"member": img["name"], "stage": "deliver"})
+            recorder.member(img["name"], "delivered")
+            delivered_count += 1
+    return delivered_count
+
+
+def process_members(
+    submitted: List[Dict],
+    target_date: str,
+    recorder,
+    test_mode: bool = False,
+) -> Tuple[List[Dict], Optional[int]]:
+    """
+    인포그래픽 생성 → Slack 전송 (2~3단계)
+
+    Returns:
+        (생성된 이미지 목록, 전송 성공 수 - 전송하지 않았으면 None)
+    """
+    logger.info("\n🎨 2단계: 개별 인포그래픽 생성")
+    generated_images = generate_members(submitted, recorder, test_mode)
+    logger.info(f"\n📊 생성 결과: {len(generated_images)}/{len(submitted)}개 성공")
+
+    delivered_count = None
+    if generated_images and not test_mode:
+        logger.info("\n📤 3단계: Slack DM 전송")
+        delivered_count = deliver_images(generated_images, target_date, recorder)
+    elif test_mode:
+        logger.info("\n📤 3단계: Slack 전송 (테스트 모드 - 스킵)")
+        for img in generated_images:
+            logger.info(f"  📁 {img['name']}: {img['path']}")
+    return generated_images, delivered_count
+
+
+def run_budget_seconds(deadline: Optional[datetime], now: Optional[datetime] = None) -> float:
+    """
+    실행 시간 예산 (초, 0이면 무제한): RUN_TIME_BUDGET_MINUTES와 마감까지 남은 시간 중 짧은 쪽
+
+    마감이 이미 지났으면 (백필/늦은 재실행) 마감은 무시하고 RUN_TIME_BUDGET_MINUTES만 적용
+    """
+    from config import RUN_TIME_BUDGET_MINUTES
+    budget = RUN_TIME_BUDGET_MINUTES * 60 if RUN_TIME_BUDGET_MINUTES > 0 else float("inf")
+    if deadline is not None:
+        until_deadline = (deadline - (now or datetime.now())).total_seconds()
+        if until_deadline > 0:
+            budget = min(budget, until_deadline)
+        else:
+            logger.warning(f"  ⏰ 결과 전달 마감({deadline:%m-%d %H:%M})이 이미 지남 - 시간 예산만 적용")
+    return 0 if budget == float("inf") else budget
+
+
+def run_pipeline(test_mode: bool = False, target_date: str = None, deadline: datetime = None):
+    """
+    전체 파이프라인 실행 - 각 회원별 개별 인포그래픽 생성
+
+    Args:
+        test_mode: True면 테스트 데이터 사용
+        target_date: 대상 날짜 (YYYY-MM-DD), None이면 자동 계산
+        deadline: 결과 전달 마감, None이면 get_result_deadline(target_date)
+            (남은 시간에 맞춰 동시 생성 수/상세도/재시도를 조정)
+    """
+    setup_logging()
+
+    logger.info("=" * 50)
+    logger.info("🚀 스터디 인포그래픽 자동 생성 시작")
+    logger.info("=" * 50)
+
+    import cassette
+    if target_date is None:
+        # 카세트 재생은 녹화한 날짜를 그대로 사용
+        target_date = (cassette.current().meta.get("target_date") if cassette.replaying() else None) or get_target_date()
+    logger.info(f"📅 대상 날짜: {target_date}")
+    cassette.set_meta(target_date=target_date, test_mode=test_mode)
+
+    # 중복 실행 방지: 이미 완료된 날짜인지 확인 (실행 기록 DB, 예전 완료 마커 포함)
+    from run_db import RunRecorder, is_completed
+    if not test_mode and is_completed(target_date):
+        logger.info(f"⏭️ {target_date}은 이미 처리 완료됨. 스킵합니다.")
+        return True
+
+    from resilience import export_events, start_budget
+    if deadline is None and not test_mode:
+        deadline = get_result_deadline(target_date)
+    budget = run_budget_seconds(deadline)
+    if budget:
+        logger.info(f"⏰ 시간 예산: {budget / 60:.0f}분" + (f" (마감 {deadline:%m-%d %H:%M})" if deadline else ""))
+    recorder = RunRecorder.start(target_date, test_mode)
+    start_budget(budget)
+    status, error = "failed", None
+    submitted, generated_images, delivered_count = [], [], None
+
+    try:
+        # 0단계: NotebookLM 인증 확인
+        logger.info("\n🔐 0단계: NotebookLM 인증 확인")
+        with recorder.stage("auth"):
+            auth_ok = ensure_notebooklm_auth()
+        if not auth_ok:
+            logger.error("NotebookLM 인증 실패! 수동 로그인이 필요합니다.")
+            logger.error("실행: notebooklm login")
+            error = "NotebookLM 인증 실패"
+            return False
+
+        # 1단계: Google Drive 스캔 또는 테스트 데이터
+        logger.info("\n📂 1단계: 공부 내용 수집")
+
+        if test_mode:
+            scan_results = _test_scan_results(target_date)
             logger.info(f"  테스트 모드: {len(scan_results)}명 데이터")
         else:
             from drive_scanner import scan_all_members
-            scan_results = scan_all_members(target_date)
-        
-        # 제출한 회원 필터링 - 이미지만 제출한 회원은 인포그래픽 생성 스킵
-        IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.heic'}
-
-        def is_image_only(result: dict) -> bool:
-            files = result.get("files", [])
-            if not files:
-                return False
-
-            def get_filename(f):
-                if isinstance(f, dict):
-                    return f.get("이름", f.get("name", ""))
-                return str(f)
-
-            return all(
-                Path(get_filename(f).split("(")[0].strip()).suffix.lower() in IMAGE_EXTS
-                for f in files
-            )
-
-        submitted = [r for r in scan_results if r.get("has_submission") and not is_image_only(r)]
-        image_only = [r for r in scan_results if r.get("has_submission") and is_image_only(r)]
-        for r in image_only:
-            logger.info(f"  ⏭️ {r['name']}: 이미지 전용 제출 - 인포그래픽 스킵")
-        logger.info(f"  제출 완료: {len(submitted)}/{len(scan_results)}명 (이미지 전용 {len(image_only)}명 스킵)")
-        
+            with recorder.stage("scan"):
+                scan_results = scan_all_members(target_date)
+
+        submitted = select_submitted(scan_results, recorder)
         if not submitted:
             logger.warning("❌ 인포그래픽을 생성할 회원이 없습니다.")
+            status = "no_submissions"
             return True  # 에러는 아님
-        
-        # 2단계: 각 회원별 인포그래픽 생성
-        logger.info("\n🎨 2단계: 개별 인포그래픽 생성")
-        
-        from infographic_generator import generate_educational_infographic
-        
-        MIN_CONTENT_LENGTH = 50
-
-        generated_images = []
-        for member in submitted:
-            if len(member.get("text_content", "").strip()) < MIN_CONTENT_LENGTH:
-                logger.warning(f"  ⏭️ {member['name']}: 내용 부족 ({len(member.get('text_content', '').strip())}자 < {MIN_CONTENT_LENGTH}자) - 스킵")
-                continue
 
-            logger.info(f"\n  📝 {member['name']} 인포그래픽 생성 중...")
+        # 2~3단계: 회원별 인포그래픽 생성 → Slack 전송
+        generated_images, delivered_count = process_members(submitted, target_date, recorder, test_mode)
 
-            try:
-                image_path = generate_educational_infographic(
-                    member_name=member["name"],
-                    study_content=member["text_content"],
-                    date=member["date"]
-                )
-                
-                if image_path:
-                    generated_images.append({
-                        "name": member["name"],
-                        "path": image_path
-                    })
-                    logger.info(f"  ✅ {member['name']}: {image_path}")
-                else:
-                    logger.warning(f"  ⚠️ {member['name']}: 이미지 생성 실패")
-            except Exception as e:
-                logger.error(f"  ❌ {member['name']}: 오류 - {e}")
-        
-        logger.info(f"\n📊 생성 결과: {len(generated_images)}/{len(submitted)}개 성공")
-        
-        # 3단계: Slack DM 전송
-        if generated_images and not test_mode:
-            logger.info("\n📤 3단계: Slack DM 전송")
-            
-            from slack_sender import send_dm_with_image
-            
-            for img in generated_images:
-                message = f"📚 {target_date} {img['name']}님의 학습 인포그래픽\nSlack에 공유해주세요! 💪"
-                success = send_dm_with_image(img["path"], message)
-                if success:
-                    logger.info(f"  ✅ {img['name']} 이미지 전송 완료")
-                else:
-                    logger.warning(f"  ⚠️ {img['name']} 전송 실패")
-        elif test_mode:
-            logger.info("\n📤 3단계: Slack 전송 (테스트 모드 - 스킵)")
-            for img in generated_images:
-                logger.info(f"  📁 {img['name']}: {img['path']}")
-        
-        # 완료 마커 생성 (중복 실행 방지)
-        if not test_mode:
-            marker_file.write_text(
-                f"completed at {datetime.now().isoformat()}\n"
-                f"generated: {len(generated_images)}/{len(submitted)}\n",
-                encoding="utf-8",
-            )
-            logger.info(f"📌 완료 마커 생성: {marker_file}")
+        # 완료 기록 (중복 실행 방지는 runs.status = 'completed'로 판단)
+        status = "completed"
 
         logger.info("\n" + "=" * 50)
         logger.info("✅ 파이프라인 완료!")
         logger.info("=" * 50)
 
         return True
-        
+
     except Exception as e:
         logger.error(f"❌ 파이프라인 오류: {e}", exc_info=True)
+        error = str(e)
         return False
 
+    finally:
+        # 예산은 이번 실행에만 적용 (데몬/watch 모드의 다음 확인에 남기지 않음)
+        start_budget(0)
+        export_events(recorder)
+        recorder.finish(
+            status,
+            submitted=len(submitted),
+            generated=len(generated_images),
+            delivered=delivered_count,
+            error=error,
+        )
+        # 보존 정책 증분 정리 (백그라운드, 카세트 재생은 벤치마크라 생략)
+        if not test_mode and not cassette.replaying():
+            from retention import start_background_sweep
+            start_background_sweep()
+
 
 def run_tests():
     """연결 테스트 실행"""
+    setup_logging()
     print("=" * 50)
     print("🧪 연결 테스트")
     print("=" * 50)
@@ -352,6 +676,28 @@ def run_tests():
     return all([drive_ok, gemini_ok, slack_ok])
 
 
+def run_cassette(name: str, replay: bool, realtime: bool = False,
+                 test_mode: bool = False, target_date: str = None) -> bool:
+    """카세트 녹화/재생하며 파이프라인 실행 (재생은 전체 소요 시간을 벤치마크로 출력)"""
+    import cassette
+
+    setup_logging()
+    try:
+        cassette.start(name, cassette.REPLAY if replay else cassette.RECORD, realtime)
+    except FileNotFoundError:
+        logger.error(f"카세트 없음: {cassette.CASSETTE_DIR / name}")
+        return False
+    started = time.perf_counter()
+    try:
+        return run_pipeline(test_mode=test_mode, target_date=target_date)
+    finally:
+        elapsed = time.perf_counter() - started
+        cassette.stop()
+        if replay:
+            logger.info(f"📼 재생 완료: {elapsed:.2f}초 ({'녹화 속도' if realtime else '대기 없음'})",
+                        extra={"stage": "replay", "duration": elapsed})
+
+
 def main():
     """메인 함수"""
     import argparse
@@ -360,14 +706,71 @@ def main():
     parser.add_argument("--test", action="store_true", help="테스트 데이터로 실행")
     parser.add_argument("--check", action="store_true", help="연결 테스트만 실행")
     parser.add_argument("--date", type=str, help="대상 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--deadline", type=str, help="결과 전달 마감 (YYYY-MM-DD HH:MM, 기본: 다음 날 DEADLINE_HOUR시 + 오프셋)")
+    parser.add_argument("--gc", action="store_true", help="output/로그/마커 보존 정책 정리")
+    parser.add_argument("--dry-run", action="store_true", help="--gc와 함께 사용: 삭제 대상만 보고")
+    parser.add_argument("--cache-stats", action="store_true", help="요약 캐시 적중률 출력")
+    parser.add_argument("--stats", action="store_true", help="실행 기록 추세/소요 시간 백분위수 출력")
+    parser.add_argument("--days", type=int, default=30, help="--stats와 함께 사용: 조회 기간 (일)")
+    parser.add_argument("--daemon", action="store_true", help="상주 모드: 매일 DAILY_RUN_TIME 실행 + 로컬 실행 요청 수신")
+    parser.add_argument("--watch", action="store_true", help="오늘 digest를 주기적으로 확인해 새/변경 회원만 처리")
+    parser.add_argument("--once", action="store_true", help="--watch와 함께 사용: 한 번만 확인")
+    parser.add_argument("--monthly", nargs="?", const="", metavar="YYYY-MM", help="월간 분석 (로컬 digest 캐시 기반, 월 생략 시 전월)")
+    parser.add_argument("--fetch-missing", action="store_true", help="--monthly와 함께 사용: 캐시에 없는 날짜는 Apps Script에서 가져옴")
+    parser.add_argument("--no-ai", action="store_true", help="--monthly와 함께 사용: AI 분석 없이 통계만")
+    parser.add_argument("--attendance", nargs="?", const="", metavar="YYYY-MM", help="제출기록 내보내기로 주간/월간 출석 집계 (월 생략 시 이번 달)")
+    parser.add_argument("--export", type=str, metavar="PATH", help="--attendance와 함께 사용: 제출기록 CSV/JSON 파일 (생략 시 Apps Script에서 가져옴)")
+    parser.add_argument("--record", type=str, metavar="NAME", help="실행하며 외부 응답을 카세트 NAME에 녹화")
+    parser.add_argument("--replay", type=str, metavar="NAME", help="카세트 NAME의 녹화 응답으로 실행 (네트워크 없음)")
+    parser.add_argument("--realtime", action="store_true", help="--replay와 함께 사용: 녹화된 응답 시간만큼 대기")
 
     args = parser.parse_args()
 
-    if args.check:
+    if args.daemon:
+        from pipeline_daemon import run_daemon
+        success = run_daemon()
+        sys.exit(0 if success else 1)
+    elif args.watch:
+        from watch_mode import run_watch
+        success = run_watch(once=args.once)
+        sys.exit(0 if success else 1)
+    elif args.gc:
+        from retention import run_gc
+        success = run_gc(dry_run=args.dry_run)
+        sys.exit(0 if success else 1)
+    elif args.cache_stats:
+        from content_summarizer import print_cache_stats
+        success = print_cache_stats()
+        sys.exit(0 if success else 1)
+    elif args.stats:
+        from run_db import print_stats
+        success = print_stats(days=args.days)
+        sys.exit(0 if success else 1)
+    elif args.check:
         success = run_tests()
         sys.exit(0 if success else 1)
+    elif args.monthly is not None:
+        from monthly import run_monthly
+        setup_logging()
+        success = run_monthly(args.monthly or None, fetch_missing=args.fetch_missing, with_ai=not args.no_ai)
+        sys.exit(0 if success else 1)
+    elif args.attendance is not None:
+        from attendance import run_attendance
+        setup_logging()
+        success = run_attendance(args.attendance or None, export_path=args.export)
+        sys.exit(0 if success else 1)
+    elif args.record or args.replay:
+        success = run_cassette(
+            args.replay or args.record,
+            replay=bool(args.replay),
+            realtime=args.realtime,
+            test_mode=args.test,
+            target_date=args.date,
+        )
+        sys.exit(0 if success else 1)
     else:
-        success = run_pipeline(test_mode=args.test, target_date=args.date)
+        deadline = datetime.strptime(args.deadline, "%Y-%m-%d %H:%M") if args.deadline else None
+        success = run_pipeline(test_mode=args.test, target_date=args.date, deadline=deadline)
         sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,420 @@
+"""
+월간 분석 (Python)
+
+Apps Script의 월간AI분석실행/월간AI다이제스트생성은 실행 시간 제한 안에서 회원을 한 명씩
+처리한다. 이 모듈은 로컬에 보관한 날짜별 digest 파싱 결과(cache/digests)로 한 달치를 모아
+- 출석/분량/주제 통계를 pandas/NumPy로 한 번에 계산하고
+- 회원별 AI 분석을 Gemini 레이트 리밋 안에서 동시에 요청한 뒤
+- output/monthly/monthly-YYYY-MM.json / .md 로 저장한다.
+
+사용법:
+    python main.py --monthly                  # 전월
+    python main.py --monthly 2026-01          # 지정 월
+    python main.py --monthly 2026-01 --fetch-missing   # 캐시에 없는 날짜는 Apps Script에서 가져옴
+    python main.py --monthly 2026-01 --no-ai  # 통계만
+"""
+import asyncio
+import calendar
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from attendance import month_weeks
+from config import OUTPUT_DIR
+from rate_limit import run_sync
+
+logger = logging.getLogger(__name__)
+
+MONTHLY_OUTPUT_DIR = OUTPUT_DIR / "monthly"
+
+# 캐시에 없는 날짜를 가져올 때 동시 요청 수
+FETCH_WORKERS = 4
+
+# 회원 1명의 한 달 학습 내용 토큰 예산 (날짜별로 나눠 중요 문장만 추림)
+MONTH_TOKEN_BUDGET = 12000
+
+# 주제 통계에서 제외할 단어와 떼어낼 조사
+STOPWORDS = {
+    "그리고", "하지만", "그래서", "또한", "그러나", "이것", "저것", "그것", "있다", "없다", "한다",
+    "하는", "했다", "합니다", "있음", "없음", "정리", "공부", "내용", "오늘", "학습", "the", "and", "for",
+}
+JOSA_PATTERN = r"(으로|에서|에게|까지|부터|은|는|이|가|을|를|의|에|로|와|과|도|만)$"
+WORD_PATTERN = r"[가-힣A-Za-z][가-힣A-Za-z0-9]+"
+TOP_KEYWORDS = 15
+
+
+def previous_month(today: Optional[date] = None) -> str:
+    today = today or date.today()
+    return (today.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+
+def month_dates(year_month: str, today: Optional[date] = None) -> List[str]:
+    """해당 월의 날짜 목록 (이번 달이면 어제까지)"""
+    year, month = (int(x) for x in year_month.split("-"))
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    last = min(last, (today or date.today()) - timedelta(days=1))
+    return [
+        (date(year, month, 1) + timedelta(days=i)).strftime("%Y-%m-%d")
+        for i in range((last - date(year, month, 1)).days + 1)
+    ]
+
+
+def spillover_dates(year_month: str, today: Optional[date] = None) -> List[str]:
+    """이 달 마지막 주(월요일이 이 달인 주) 중 다음 달로 넘어간 날짜 (어제까지) - 주별 출석용"""
+    year, month = (int(x) for x in year_month.split("-"))
+    weeks = month_weeks(year, month)
+    if not weeks:
+        return []
+    first = date(year + month // 12, month % 12 + 1, 1)
+    last = min(weeks[-1] + timedelta(days=6), (today or date.today()) - timedelta(days=1))
+    return [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((last - first).days + 1)]
+
+
+# =========================================
+# 한 달치 데이터 모으기
+# =========================================
+
+def _fetch_and_cache(day: str) -> Optional[List[Dict]]:
+    from drive_scanner import fetch_digest_html, parse_digest_html, save_parsed_digest
+
+    try:
+        parsed = parse_digest_html(fetch_digest_html(day))
+    except RuntimeError as e:
+        logger.warning(f"  {day} digest 가져오기 실패: {e}")
+        return None
+    save_parsed_digest(day, parsed)
+    return parsed
+
+
+def load_month(year_month: str, fetch_missing: bool = False) -> Tuple[pd.DataFrame, List[str], List[str]]:
+    """
+    한 달치 제출 기록
+
+    Returns:
+        (DataFrame[date, member, text_content, chars, files], 대상 날짜 목록, 데이터가 없는 날짜 목록)
+    """
+    dates = month_dates(year_month)
+    df, missing = load_days(dates, fetch_missing)
+    return df, dates, missing
+
+
+def load_days(dates: List[str], fetch_missing: bool = False) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    날짜 목록의 제출 기록
+
+    Returns:
+        (DataFrame[date, member, text_content, chars, files], 데이터가 없는 날짜 목록)
+    """
+    from drive_scanner import load_parsed_digest
+
+    daily = {day: load_parsed_digest(day) for day in dates}
+    missing = [day for day, parsed in daily.items() if parsed is None]
+
+    if missing and fetch_missing:
+        logger.info(f"  캐시에 없는 {len(missing)}일 digest 가져오는 중 (동시 {FETCH_WORKERS}개)...")
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="monthly-fetch") as executor:
+            for day, parsed in zip(missing, executor.map(_fetch_and_cache, missing)):
+                daily[day] = parsed
+        missing = [day for day in missing if daily[day] is None]
+
+    records = [
+        {
+            "date": day,
+            "member": m["name"],
+            "text_content": m.get("text_content", ""),
+            "files": len(m.get("files", [])),
+        }
+        for day, parsed in daily.items() if parsed
+        for m in parsed
+    ]
+    df = pd.DataFrame.from_records(records, columns=["date", "member", "text_content", "files"])
+    df["date"] = pd.to_datetime(df["date"])
+    df["chars"] = df["text_content"].str.strip().str.len()
+    return df, missing
+
+
+# =========================================
+# 통계 (벡터 연산)
+# =========================================
+
+def _streaks(attended: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """회원×날짜 출석 행렬 → (최장 연속 출석일, 마지막 날 기준 연속 출석일)"""
+    if attended.size == 0:
+        zeros = np.zeros(attended.shape[0], dtype=int)
+        return zeros, zeros
+    counts = np.cumsum(attended, axis=1)
+    # 결석한 날의 누적값을 이후로 전파해서 빼면 연속 구간 길이
+    reset = np.maximum.accumulate(np.where(attended == 0, counts, 0), axis=1)
+    run = counts - reset
+    return run.max(axis=1), run[:, -1]
+
+
+def member_stats(df: pd.DataFrame, dates: List[str], members: List[str], missing: List[str] = ()) -> pd.DataFrame:
+    """
+    회원별 출석/분량 통계 (제출이 없는 회원 포함)
+
+    출석률과 연속 출석일은 데이터가 있는 날짜만 기준으로 한다. digest가 없는 날은
+    결석으로 치지 않고 건너뛰므로 그 앞뒤 출석은 한 연속 구간으로 이어진다.
+    """
+    all_dates = pd.to_datetime(dates)
+    names = sorted(set(members) | set(df["member"]))
+
+    attendance = (
+        pd.crosstab(df["member"], df["date"])
+        .reindex(index=names, columns=all_dates, fill_value=0)
+        .clip(upper=1)
+    )
+    observed = ~attendance.columns.isin(pd.to_datetime(list(missing)))
+    longest, current = _streaks(attendance.loc[:, observed].to_numpy())
+
+    volume = df.groupby("member").agg(
+        파일수=("files", "sum"),
+        총글자수=("chars", "sum"),
+        평균글자수=("chars", "mean"),
+        중앙글자수=("chars", "median"),
+        마지막제출일=("date", "max"),
+    ).reindex(names)
+
+    stats = pd.DataFrame(index=pd.Index(names, name="이름"))
+    stats["출석일수"] = attendance.sum(axis=1).to_numpy()
+    stats["출석률"] = (stats["출석일수"] / max(len(dates) - len(missing), 1)).round(3)
+    stats["최장연속"] = longest
+    stats["현재연속"] = current
+    stats = stats.join(volume)
+    stats[["파일수", "총글자수"]] = stats[["파일수", "총글자수"]].fillna(0).astype(int)
+    stats[["평균글자수", "중앙글자수"]] = stats[["평균글자수", "중앙글자수"]].fillna(0).round(0).astype(int)
+    return stats.sort_values(["출석일수", "총글자수"], ascending=False)
+
+
+def weekly_attendance(df: pd.DataFrame, members: List[str], year_month: str) -> pd.DataFrame:
+    """
+    회원×주 출석일수 (출석 집계와 같은 attendance.month_weeks 규칙)
+
+    월요일이 이 달인 주만 이 달의 주로 센다. 첫 월요일 전 날짜는 전월 마지막 주에 속하므로 빼고,
+    마지막 주는 다음 달로 넘어간 날짜(spillover_dates)까지 포함한다. 열 이름은 주 시작 월요일(MM/DD).
+    """
+    names = sorted(set(members) | set(df["member"]))
+    year, month = (int(x) for x in year_month.split("-"))
+    weeks = pd.to_datetime(month_weeks(year, month))
+    if df.empty:
+        return pd.DataFrame(index=names)
+    days = df.drop_duplicates(["member", "date"])
+    monday = days["date"] - pd.to_timedelta(days["date"].dt.weekday, unit="D")
+    days, monday = days[monday.isin(weeks)], monday[monday.isin(weeks)]
+    # 아직 시작하지 않은 주는 열에서 제외 (이번 달 분석)
+    weeks = weeks[weeks <= df["date"].max()]
+    labels = [f"{w:%m/%d}" for w in weeks]
+    return (
+        pd.crosstab(days["member"], monday.dt.strftime("%m/%d"))
+        .reindex(index=names, columns=labels, fill_value=0)
+    )
+
+
+def keyword_stats(df: pd.DataFrame, top: int = TOP_KEYWORDS) -> Tuple[Dict[str, List[Tuple[str, int]]], List[Tuple[str, int]]]:
+    """회원별/전체 자주 나온 단어 (조사 제거, 불용어 제외)"""
+    if df.empty:
+        return {}, []
+    words = (
+        df[["member", "text_content"]]
+        .assign(word=df["text_content"].str.findall(WORD_PATTERN))
+        .explode("word")
+        .dropna(subset=["word"])
+    )
+    words["word"] = words["word"].str.lower().str.replace(JOSA_PATTERN, "", regex=True)
+    words = words[(words["word"].str.len() >= 2) & ~words["word"].isin(STOPWORDS)]
+
+    counts = words.groupby(["member", "word"]).size().rename("count").reset_index()
+    counts = counts.sort_values(["member", "count"], ascending=[True, False])
+    per_member = {
+        member: list(zip(group["word"].head(top), group["count"].head(top).astype(int)))
+        for member, group in counts.groupby("member")
+    }
+    overall = words["word"].value_counts().head(top)
+    return per_member, list(zip(overall.index, overall.astype(int)))
+
+
+# =========================================
+# AI 분석 (동시 요청)
+# =========================================
+
+def build_corpus(df: pd.DataFrame, member: str, token_budget: int = MONTH_TOKEN_BUDGET) -> str:
+    """회원의 한 달 학습 내용 (날짜별로 예산을 나눠 중요 문장만 남기고 날짜 순서 유지)"""
+    from extractive import extract_to_budget
+
+    rows = df[df["member"] == member].sort_values("date")
+    per_day = max(200, token_budget // max(len(rows), 1))
+    return "\n".join(
+        f"[{day:%Y-%m-%d}]\n{extract_to_budget(text, per_day)}\n"
+        for day, text in zip(rows["date"], rows["text_content"])
+    )
+
+
+def _analysis_prompt(member: str, corpus: str, row: pd.Series, keywords: List[Tuple[str, int]]) -> str:
+    top_words = ", ".join(word for word, _ in keywords[:10]) or "-"
+    return f"""당신은 한의학 스터디 그룹의 학습 내용을 상세히 정리하는 전문가입니다.
+
+아래는 "{member}" 조원이 한 달 동안 공부한 내용입니다.
+- 출석일수: {row['출석일수']}일 (최장 연속 {row['최장연속']}일)
+- 제출 파일 수: {row['파일수']}개
+- 총 분량: {row['총글자수']}자
+- 자주 나온 단어: {top_words}
+
+학습 내용:
+{corpus}
+
+다음 형식으로 **풍부하고 상세하게** 분석해주세요:
+
+## 📚 주요 학습 주제
+- 이 조원이 집중적으로 공부한 핵심 주제 5-7개를 구체적으로 나열하고, 각 주제별로 어떤 내용을 다뤘는지 간단히 설명해주세요
+
+## 📖 학습 내용 상세 요약
+- 주요 개념, 이론, 원리, 한의학 용어, 처방, 약재, 경혈, 질환 등 구체적인 내용을 최소 10줄 이상으로 정리해주세요
+
+## 🔑 핵심 키워드 & 개념
+- 이번 달 학습에서 가장 중요한 키워드 10-15개
+
+## 📈 학습 흐름 분석
+- 초반/중반/후반에 어떤 주제를 다뤘는지, 연결성이 있는지 설명해주세요
+
+## 💡 주목할 만한 인사이트
+- 특별히 깊이 있게 다룬 부분이나 임상적으로 유용한 내용
+
+## 🌟 학습 특징 및 강점
+- 이 조원만의 학습 스타일이나 특징 2-3가지"""
+
+
+async def analyze_members_async(
+    df: pd.DataFrame,
+    stats: pd.DataFrame,
+    keywords: Dict[str, List[Tuple[str, int]]],
+) -> Dict[str, Optional[str]]:
+    """제출 기록이 있는 회원별 AI 분석을 동시에 요청 (레이트 리밋은 content_summarizer와 공유)"""
+    from content_summarizer import generate_text_async
+
+    async def _analyze(member: str) -> Optional[str]:
+        started = time.perf_counter()
+        try:
+            prompt = _analysis_prompt(member, build_corpus(df, member), stats.loc[member], keywords.get(member, []))
+            text = await generate_text_async(prompt)
+            logger.info(f"  ✅ {member} 분석 완료", extra={
+                "member": member, "stage": "monthly", "duration": time.perf_counter() - started,
+            })
+            return text
+        except Exception as e:
+            logger.error(f"  ❌ {member} 분석 실패: {e}", extra={"member": member, "stage": "monthly"})
+            return None
+
+    members = [m for m in stats.index if stats.loc[m, "출석일수"] > 0]
+    results = await asyncio.gather(*(_analyze(m) for m in members))
+    return dict(zip(members, results))
+
+
+# =========================================
+# 저장
+# =========================================
+
+def _to_markdown(year_month: str, stats: pd.DataFrame, weekly: pd.DataFrame,
+                 overall: List[Tuple[str, int]], analyses: Dict[str, Optional[str]]) -> str:
+    lines = [f"# 📊 {year_month} 월간 학습 다이제스트", ""]
+    lines += ["## 출석/분량", "", "| 이름 | 출석 | 출석률 | 최장연속 | 파일 | 총 글자 |", "|---|---|---|---|---|---|"]
+    for name, row in stats.iterrows():
+        lines.append(
+            f"| {name} | {row['출석일수']} | {row['출석률']:.0%} | {row['최장연속']} | {row['파일수']} | {row['총글자수']:,} |"
+        )
+    if not weekly.empty:
+        lines += ["", "## 주별 출석", "", "| 이름 | " + " | ".join(weekly.columns) + " |",
+                  "|---|" + "---|" * len(weekly.columns)]
+        for name, row in weekly.iterrows():
+            lines.append(f"| {name} | " + " | ".join(str(v) for v in row) + " |")
+    if overall:
+        lines += ["", "## 이번 달 자주 나온 단어", "", ", ".join(f"{w}({c})" for w, c in overall)]
+    for name, text in analyses.items():
+        lines += ["", f"## 👤 {name}", "", text or "_AI 분석 실패_"]
+    return "\n".join(lines) + "\n"
+
+
+def save_results(year_month: str, stats: pd.DataFrame, weekly: pd.DataFrame,
+                 keywords: Dict[str, List[Tuple[str, int]]], overall: List[Tuple[str, int]],
+                 analyses: Dict[str, Optional[str]], missing: List[str]):
+    """JSON(Apps Script 조원분석결과 형식 + 통계)과 Markdown 저장"""
+    MONTHLY_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    members = []
+    for name, row in stats.iterrows():
+        entry = {
+            "이름": name,
+            "출석일수": int(row["출석일수"]),
+            "파일수": int(row["파일수"]),
+            "분석내용": analyses.get(name),
+            "통계": {
+                "출석률": float(row["출석률"]),
+                "최장연속": int(row["최장연속"]),
+                "현재연속": int(row["현재연속"]),
+                "총글자수": int(row["총글자수"]),
+                "평균글자수": int(row["평균글자수"]),
+                "마지막제출일": None if pd.isna(row["마지막제출일"]) else f"{row['마지막제출일']:%Y-%m-%d}",
+                "주별출석": {k: int(v) for k, v in weekly.loc[name].items()} if name in weekly.index else {},
+                "키워드": [w for w, _ in keywords.get(name, [])],
+            },
+        }
+        members.append(entry)
+    data = {
+        "년월": year_month,
+        "생성일시": datetime.now().isoformat(timespec="seconds"),
+        "누락날짜": missing,
+        "전체키워드": [{"단어": w, "횟수": c} for w, c in overall],
+        "조원분석결과": members,
+    }
+    json_path = MONTHLY_OUTPUT_DIR / f"monthly-{year_month}.json"
+    json_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    md_path = MONTHLY_OUTPUT_DIR / f"monthly-{year_month}.md"
+    md_path.write_text(_to_markdown(year_month, stats, weekly, overall, analyses), encoding="utf-8")
+    logger.info(f"  💾 저장: {json_path}, {md_path}")
+    return json_path, md_path
+
+
+def run_monthly(year_month: Optional[str] = None, fetch_missing: bool = False, with_ai: bool = True) -> bool:
+    """월간 분석 실행"""
+    from drive_scanner import _load_member_names
+
+    year_month = year_month or previous_month()
+    started = time.perf_counter()
+    logger.info("=" * 50)
+    logger.info(f"📊 {year_month} 월간 분석 시작")
+    logger.info("=" * 50)
+
+    df, dates, missing = load_month(year_month, fetch_missing)
+    if not dates:
+        logger.error(f"❌ {year_month}: 분석할 날짜가 없습니다.")
+        return False
+    if missing:
+        logger.warning(f"  ⚠️ 데이터 없는 날짜 {len(missing)}일: {', '.join(d[5:] for d in missing)}"
+                       + ("" if fetch_missing else " (--fetch-missing으로 가져오기)"))
+    if df.empty:
+        logger.error("❌ 제출 기록이 없습니다. 일간 실행이 digest를 캐시에 남긴 뒤 다시 시도하세요.")
+        return False
+
+    members = _load_member_names()
+    stats = member_stats(df, dates, members, missing)
+    spillover, _ = load_days(spillover_dates(year_month), fetch_missing)
+    weekly = weekly_attendance(pd.concat([df, spillover], ignore_index=True), members, year_month)
+    keywords, overall = keyword_stats(df)
+    logger.info(f"  📈 통계 계산 완료: {len(df)}건, {len(stats)}명 ({time.perf_counter() - started:.1f}초)")
+
+    analyses: Dict[str, Optional[str]] = {}
+    if with_ai:
+        ai_started = time.perf_counter()
+        # 요약과 같은 공용 루프에서 실행 (Gemini 비동기 클라이언트가 처음 쓴 루프에 묶임)
+        analyses = run_sync(analyze_members_async(df, stats, keywords))
+        ok = sum(1 for text in analyses.values() if text)
+        logger.info(f"  🤖 AI 분석 {ok}/{len(analyses)}명 완료 ({time.perf_counter() - ai_started:.1f}초)",
+                    extra={"stage": "monthly", "duration": time.perf_counter() - ai_started})
+
+    save_results(year_month, stats, weekly, keywords, overall, analyses, missing)
+    logger.info(f"✅ 월간 분석 완료 ({time.perf_counter() - started:.1f}초)")
+    return True
@@ -0,0 +1,234 @@
+"""
+파이프라인 상주 데몬
+
+run_daily.bat은 매일 인터프리터를 새로 띄우고 모듈 import, 인증 확인 subprocess,
+HTTP 연결을 처음부터 다시 만든다. 이 데몬은 프로세스를 계속 띄워 두고
+- 모듈/클라이언트(Slack, HTTP 세션, 회원 목록)를 미리 준비해 두고
+- 매일 DAILY_RUN_TIME에 전날 날짜로 파이프라인을 실행하고
+- 로컬 소켓(127.0.0.1:PIPELINE_DAEMON_PORT)으로 "지금 X 날짜 실행" 요청을 받는다.
+SIGTERM/SIGINT를 받으면 진행 중인 실행을 마친 뒤 종료한다.
+
+사용법:
+    python main.py --daemon                     # 데몬 실행
+    python pipeline_daemon.py run [YYYY-MM-DD]  # 즉시 실행 요청 (날짜 생략 시 전날)
+    python pipeline_daemon.py status            # 상태 확인
+    python pipeline_daemon.py stop              # 데몬 종료
+"""
+import logging
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from config import DAILY_RUN_TIME, PIPELINE_DAEMON_PORT
+
+logger = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"
+
+# 실행 요청 큐: ("run", 날짜 또는 None) / ("stop", None)
+_commands: "queue.Queue[tuple]" = queue.Queue()
+# 종료 신호 플래그 (신호 처리기에서는 큐/로깅 락을 잡지 않도록 플래그만 설정)
+_stop_signal = threading.Event()
+# 현재 상태 (status 명령 응답용)
+_state = {"status": "idle", "date": None, "last": None}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """한 줄 명령 → 한 줄 응답 (ping / status / run [날짜] / stop)"""
+
+    def handle(self):
+        parts = self.rfile.readline().decode("utf-8", "replace").split()
+        command = parts[0].lower() if parts else ""
+        if command == "ping":
+            reply = "pong"
+        elif command == "status":
+            reply = f"{_state['status']} {_state['date'] or '-'} last={_state['last'] or '-'}"
+        elif command == "run":
+            date = parts[1] if len(parts) > 1 else None
+            if date and not _is_valid_date(date):
+                reply = "error invalid date"
+            else:
+                _commands.put(("run", date))
+                reply = f"queued {date or 'default'}"
+        elif command == "stop":
+            _commands.put(("stop", None))
+            reply = "ok"
+        else:
+            reply = "error unknown command"
+        self.wfile.write(f"{reply}\n".encode("utf-8"))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _is_valid_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def next_daily_run(now: datetime, run_time: str = DAILY_RUN_TIME) -> datetime:
+    """다음 자동 실행 시각"""
+    hour, minute = (int(x) for x in run_time.split(":"))
+    run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run <= now:
+        run += timedelta(days=1)
+    return run
+
+
+def warm_up():
+    """모듈 import와 재사용 클라이언트를 미리 준비 (실패해도 실행 시 다시 시도됨)"""
+    started = time.perf_counter()
+    import drive_scanner
+    import infographic_generator  # noqa: F401
+    import slack_delivery  # noqa: F401
+
+    drive_scanner.get_http_session()
+    drive_scanner._load_member_names()
+    try:
+        import notebooklm  # noqa: F401
+    except ImportError as e:
+        logger.warning(f"  notebooklm import 실패: {e}")
+    try:
+        from slack_sender import get_slack_client
+        get_slack_client()
+    except ValueError as e:
+        logger.warning(f"  Slack 클라이언트 준비 실패: {e}")
+    logger.info(f"  준비 완료 ({time.perf_counter() - started:.1f}초)")
+
+
+def _install_signal_handlers():
+    """SIGTERM/SIGINT → 진행 중인 실행을 마친 뒤 종료"""
+    def _handle(signum, frame):
+        _stop_signal.set()
+
+    for name in ("SIGTERM", "SIGINT", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), _handle)
+
+
+def run_daemon(run_time: str = DAILY_RUN_TIME) -> bool:
+    """
+    데몬 실행. 파이프라인은 한 번에 하나씩 이 (메인) 스레드에서 실행하고,
+    소켓 스레드는 요청을 큐에 넣기만 한다.
+    """
+    from main import run_pipeline, setup_logging
+
+    setup_logging("daemon")
+    _install_signal_handlers()
+    try:
+        server = _Server((HOST, PIPELINE_DAEMON_PORT), _Handler)
+    except OSError as e:
+        logger.error(f"제어 포트 {PIPELINE_DAEMON_PORT} 사용 불가 (이미 실행 중?): {e}")
+        return False
+    threading.Thread(target=server.serve_forever, name="pipeline-daemon-socket", daemon=True).start()
+    logger.info(f"파이프라인 데몬 시작: {HOST}:{PIPELINE_DAEMON_PORT} (매일 {run_time} 실행)")
+
+    warm_up()
+
+    next_run = next_daily_run(datetime.now(), run_time)
+    logger.info(f"  다음 자동 실행: {next_run:%Y-%m-%d %H:%M}")
+    try:
+        while not _stop_signal.is_set():
+            # 신호 플래그 확인을 위해 최대 1초 단위로 깨어남
+            timeout = min(1.0, max(0.0, (next_run - datetime.now()).total_seconds()))
+            try:
+                command, date = _commands.get(timeout=timeout)
+            except queue.Empty:
+                if datetime.now() < next_run:
+                    continue
+                command, date = "run", None
+                next_run = next_daily_run(datetime.now(), run_time)
+
+            if command == "stop":
+                break
+
+            _state.update(status="running", date=date or "default")
+            started = time.perf_counter()
+            try:
+                ok = run_pipeline(target_date=date)
+            except Exception as e:
+                logger.error(f"파이프라인 실행 오류: {e}", exc_info=True)
+                ok = False
+            _state.update(
+                status="idle",
+                date=None,
+                last=f"{date or 'default'}:{'ok' if ok else 'fail'}@{datetime.now():%m-%d %H:%M}",
+            )
+            logger.info(f"  실행 {'성공' if ok else '실패'} ({time.perf_counter() - started:.1f}초), "
+                        f"다음 자동 실행: {next_run:%Y-%m-%d %H:%M}")
+        if _stop_signal.is_set():
+            logger.info("종료 신호 수신")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    logger.info("파이프라인 데몬 종료")
+    return True
+
+
+def _send_command(command: str, timeout: float = 5) -> Optional[str]:
+    """데몬에 명령 전송, 데몬이 없으면 None"""
+    try:
+        with socket.create_connection((HOST, PIPELINE_DAEMON_PORT), timeout=timeout) as sock:
+            sock.sendall(f"{command}\n".encode("utf-8"))
+            with sock.makefile("r", encoding="utf-8") as f:
+                return f.readline().strip()
+    except OSError:
+        return None
+
+
+def is_running() -> bool:
+    """데몬 실행 여부"""
+    return _send_command("ping", timeout=2) == "pong"
+
+
+def request_run(date: str = None) -> Optional[bool]:
+    """
+    데몬에 즉시 실행 요청 (요청만 큐에 넣고 바로 반환)
+
+    Returns:
+        True: 요청 접수, False: 거부(잘못된 날짜 등), None: 데몬이 실행 중이 아님
+    """
+    result = _send_command(f"run {date}" if date else "run")
+    if result is None:
+        return None
+    return result.startswith("queued")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if command == "daemon":
+        return run_daemon()
+    if command == "run":
+        date = sys.argv[2] if len(sys.argv) > 2 else None
+        result = request_run(date)
+        print({None: "데몬이 실행 중이 아닙니다", True: "실행 요청 접수", False: "요청 거부 (날짜 형식: YYYY-MM-DD)"}[result])
+        return bool(result)
+    if command == "status":
+        result = _send_command("status")
+        print(result or "실행 중이 아님")
+        return result is not None
+    if command == "stop":
+        result = _send_command("stop")
+        print("종료 요청 전송" if result == "ok" else "데몬이 실행 중이 아닙니다")
+        return result == "ok"
+
+    print(__doc__)
+    return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+"""
+레이트 리밋 모듈
+- asyncio용 토큰 버킷 (분당 요청 수 / 분당 토큰 수 제한)
+- 429 응답 시 지터를 섞은 지수 백오프 계산
+- 비동기 클라이언트의 동기 래퍼용 코루틴 실행 (프로세스 공용 이벤트 루프 하나에서 실행)
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Optional
+
+# run_sync 공용 이벤트 루프 (처음 호출할 때 전용 스레드와 함께 만듦)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+class AsyncTokenBucket:
+    """
+    분당 rate_per_minute 만큼 채워지는 토큰 버킷.
+
+    await 사이에 상태를 바꾸지 않고 threading.Lock으로만 보호하므로
+    이벤트 루프에 묶이지 않아 모듈 전역으로 공유해도 된다.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _try_take(self, amount: float) -> float:
+        """토큰을 가져오면 0, 아니면 기다려야 할 초 반환"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    async def acquire(self, amount: float = 1):
+        """amount 만큼 토큰이 쌓일 때까지 대기 (용량보다 크면 용량으로 제한)"""
+        amount = min(amount, self.capacity)
+        while True:
+            wait = self._try_take(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """서버가 레이트 리밋을 알려온 경우 모든 호출자를 seconds 동안 멈춤"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """attempt(1부터)번째 재시도 대기 시간: 지수 증가 + 0.5~1.5배 지터"""
+    return min(cap, base * (2 ** (attempt - 1))) * random.uniform(0.5, 1.5)
+
+
+def _shared_loop() -> asyncio.AbstractEventLoop:
+    """run_sync가 쓰는 프로세스 공용 이벤트 루프 (전용 스레드에서 계속 실행)"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="async-runner", daemon=True).start()
+    return _loop
+
+
+def run_sync(coro):
+    """
+    코루틴을 프로세스 공용 이벤트 루프에서 실행하고 결과를 기다림 (여러 스레드에서 동시에 호출 가능)
+
+    호출마다 asyncio.run으로 새 루프를 만들면, 처음 쓴 루프에 묶인 비동기 클라이언트
+    (Gemini 모델의 gRPC 채널 등)를 이미 닫힌 루프에서 다시 쓰게 된다.
+    이미 이벤트 루프가 돌고 있는 스레드에서 호출해도 되지만, 공용 루프 안에서는 await를 써야 한다.
+    """
+    loop = _shared_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("공용 이벤트 루프 안에서는 run_sync 대신 await를 사용하세요.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
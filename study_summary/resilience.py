@@ -0,0 +1,290 @@
+"""
+외부 서비스 공통 복원력 계층
+- 서비스별 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 호출을 막고(fail fast),
+  이후 한 번 시험 호출해 회복 여부 확인
+- 실행 전체 시간 예산: 남은 시간으로 끝낼 수 없는 재시도는 하지 않음
+- 재시도 대기(지수 증가 + 지터)는 call_with_retry() 한 곳에서 처리
+- 브레이커 상태 변화는 drain_events()로 꺼내 실행 기록(run_db)에 남김
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from rate_limit import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# 서비스별 (연속 실패 허용 횟수, 차단 유지 시간(초))
+BREAKER_SETTINGS = {
+    "apps_script": (3, 300),
+    "notebooklm": (3, 900),
+    "slack": (5, 120),
+}
+DEFAULT_BREAKER_SETTING = (3, 300)
+
+
+class CircuitOpenError(RuntimeError):
+    """서비스가 차단 상태라 호출하지 않음"""
+
+
+class BudgetExceededError(RuntimeError):
+    """실행 시간 예산 초과"""
+
+
+_events: List[dict] = []
+_events_lock = threading.Lock()
+
+
+def _emit(service: str, old: str, new: str, reason: str):
+    event = {"service": service, "from": old, "to": new, "reason": reason, "at": time.time()}
+    with _events_lock:
+        _events.append(event)
+    log = logger.warning if new == OPEN else logger.info
+    log(f"  🔌 {service} 브레이커 {old} → {new} ({reason})", extra={"stage": "resilience"})
+
+
+def drain_events() -> List[dict]:
+    """쌓인 브레이커 상태 변화를 꺼냄"""
+    with _events_lock:
+        events = list(_events)
+        _events.clear()
+    return events
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커 (스레드 안전)"""
+
+    def __init__(self, service: str, failure_threshold: int, reset_timeout: float):
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        # 반열림 상태의 시험 호출 진행 시각 (None: 진행 중인 시험 호출 없음)
+        self.probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _set_state(self, new: str, reason: str):
+        old, self.state = self.state, new
+        if old != new:
+            _emit(self.service, old, new, reason)
+
+    def allow(self) -> bool:
+        """
+        호출 가능 여부
+
+        차단 시간이 지나면 시험 호출 1건만 허용하고, 그 결과가 기록될 때까지 다른 호출은 막는다
+        (결과가 기록되지 않은 채 차단 시간이 또 지나면 시험 호출을 다시 허용).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    return False
+                self._set_state(HALF_OPEN, "차단 시간 경과, 시험 호출")
+            if self.state == HALF_OPEN:
+                if self.probe_started is not None and now - self.probe_started < self.reset_timeout:
+                    return False
+                self.probe_started = now
+            return True
+
+    def release(self):
+        """성공/실패로 세지 않는 결과 (레이트 리밋 등) - 시험 호출 자리만 비움"""
+        with self._lock:
+            self.probe_started = None
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.probe_started = None
+            if self.state != CLOSED:
+                self._set_state(CLOSED, "호출 성공")
+
+    def record_failure(self, reason: str = ""):
+        with self._lock:
+            self.failures += 1
+            self.probe_started = None
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN, f"연속 실패 {self.failures}회: {reason}"[:200])
+
+    def retry_in(self) -> float:
+        """차단 해제까지 남은 초"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(service: str) -> CircuitBreaker:
+    """서비스별 브레이커 (프로세스 내 공유)"""
+    with _breakers_lock:
+        breaker = _breakers.get(service)
+        if breaker is None:
+            threshold, timeout = BREAKER_SETTINGS.get(service, DEFAULT_BREAKER_SETTING)
+            breaker = _breakers[service] = CircuitBreaker(service, threshold, timeout)
+        return breaker
+
+
+# =========================================
+# 실행 시간 예산
+# =========================================
+
+_deadline: Optional[float] = None
+
+
+def start_budget(seconds: float):
+    """실행 시간 예산 시작 (0 이하면 무제한)"""
+    global _deadline
+    _deadline = time.monotonic() + seconds if seconds > 0 else None
+
+
+def remaining_budget() -> float:
+    """남은 예산 (초), 무제한이면 inf"""
+    if _deadline is None:
+        return float("inf")
+    return max(0.0, _deadline - time.monotonic())
+
+
+def check(service: str):
+    """
+    호출 전 확인
+
+    Raises:
+        CircuitOpenError: 서비스 차단 중
+        BudgetExceededError: 실행 시간 예산 소진
+    """
+    if remaining_budget() <= 0:
+        raise BudgetExceededError("실행 시간 예산 소진")
+    breaker = get_breaker(service)
+    if not breaker.allow():
+        raise CircuitOpenError(f"{service} 차단 중 ({breaker.retry_in():.0f}초 후 재시도 가능)")
+
+
+def retry_delay(
+    attempt: int,
+    base: float,
+    cap: float = 60.0,
+    minimum: float = 0.0,
+    attempt_seconds: float = 0.0,
+) -> float:
+    """
+    재시도 전 대기 시간 (지수 증가 + 지터, 서버가 요청한 최소 대기 시간 보장)
+
+    Args:
+        attempt_seconds: 재시도 1회에 걸릴 예상 시간 - 대기 후 이 시간 안에 끝낼 수 없으면 재시도하지 않음
+
+    Raises:
+        BudgetExceededError: 대기 + 재시도가 예산을 넘는 경우
+    """
+    delay = max(minimum, backoff_delay(attempt, base=base, cap=cap))
+    needed = delay + attempt_seconds
+    if needed >= remaining_budget():
+        raise BudgetExceededError(
+            f"남은 예산 {remaining_budget():.0f}초 < 재시도 대기 {delay:.0f}초 + 예상 {attempt_seconds:.0f}초"
+        )
+    return delay
+
+
+def sleep_before_retry(
+    attempt: int,
+    base: float,
+    cap: float = 60.0,
+    minimum: float = 0.0,
+    attempt_seconds: float = 0.0,
+) -> float:
+    """retry_delay()만큼 대기 (asyncio 코드는 retry_delay()로 계산해 직접 await)"""
+    delay = retry_delay(attempt, base, cap, minimum, attempt_seconds)
+    time.sleep(delay)
+    return delay
+
+
+def call_with_retry(
+    service: str,
+    func: Callable,
+    *,
+    max_attempts: int = 3,
+    base_delay: float = 5.0,
+    max_delay: float = 60.0,
+    retry_if: Callable = None,
+    result_is_failure: bool = True,
+    retry_after: Callable = None,
+    on_error: Callable = None,
+    attempt_seconds: float = 0.0,
+    label: str = "",
+):
+    """
+    브레이커/예산/지터 재시도를 적용해 func() 호출
+
+    Args:
+        service: 서비스 이름 (브레이커 단위)
+        func: 인자 없는 호출 함수
+        retry_if: 결과를 보고 재시도할지 판단 (마지막 시도면 그 결과를 그대로 반환)
+        result_is_failure: retry_if에 걸린 결과를 브레이커 실패로 셀지 여부
+        retry_after: 예외 → 서버가 요청한 대기 시간(초) 또는 None (레이트 리밋은 장애로 세지 않음)
+        on_error: 예외 발생 시 호출 (캐시 무효화 등)
+        attempt_seconds: 1회 시도 예상 시간 (남은 예산으로 끝낼 수 없는 재시도는 생략)
+        label: 로그용 이름
+
+    Raises:
+        CircuitOpenError, BudgetExceededError, 또는 마지막 시도의 예외
+    """
+    breaker = get_breaker(service)
+    name = label or service
+    for attempt in range(1, max_attempts + 1):
+        check(service)
+        wait_hint = 0.0
+        try:
+            result = func()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            hint = retry_after(e) if retry_after else None
+            if hint is None:
+                breaker.record_failure(str(e))
+            else:
+                breaker.release()
+                wait_hint = hint
+            logger.warning(f"  {name} 실패 (시도 {attempt}/{max_attempts}): {e}")
+            if attempt == max_attempts:
+                raise
+        else:
+            if retry_if is None or not retry_if(result):
+                breaker.record_success()
+                return result
+            if result_is_failure:
+                breaker.record_failure("결과 없음")
+            else:
+                breaker.record_success()
+            logger.warning(f"  {name} 결과 불충분 (시도 {attempt}/{max_attempts})")
+            if attempt == max_attempts:
+                return result
+
+        delay = sleep_before_retry(attempt, base_delay, max_delay, wait_hint, attempt_seconds)
+        logger.info(f"  {name} {delay:.1f}초 대기 후 재시도")
+
+
+def summarize_events(events: List[dict]) -> str:
+    """실행 보고용 한 줄 요약"""
+    opened: Dict[str, int] = {}
+    for event in events:
+        if event["to"] == OPEN:
+            opened[event["service"]] = opened.get(event["service"], 0) + 1
+    if not opened:
+        return "브레이커 차단 없음"
+    return "브레이커 차단: " + ", ".join(f"{s} {n}회" for s, n in opened.items())
+
+
+def export_events(recorder):
+    """쌓인 브레이커 상태 변화를 실행 기록에 남기고 요약을 로그로 출력"""
+    events = drain_events()
+    if events:
+        recorder.breaker_events(events)
+    logger.info(f"  🔌 {summarize_events(events)}", extra={"stage": "resilience"})
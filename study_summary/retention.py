@@ -0,0 +1,289 @@
+"""
+보존 정책 모듈
+- output 이미지, logs 로그 파일, 완료 마커, digest 캐시, 인포그래픽 원본을 나이/개수/용량 기준으로 정리
+- 매 실행 종료 시 가벼운 증분 정리, main.py --gc 로 전체 정리 (--dry-run 지원)
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from config import (
+    CACHE_DIR,
+    DIGEST_CACHE_RETENTION_DAYS,
+    INFOGRAPHIC_SOURCE_RETENTION_DAYS,
+    OUTPUT_DIR,
+    LOG_DIR,
+    OUTPUT_RETENTION_DAYS,
+    OUTPUT_MAX_FILES,
+    OUTPUT_MAX_MB,
+    LOG_RETENTION_DAYS,
+    LOG_MAX_FILES,
+    LOG_MAX_MB,
+    MARKER_RETENTION_DAYS,
+    GC_INTERVAL_HOURS,
+)
+
+logger = logging.getLogger(__name__)
+
+# 마지막 정리 시각 기록 파일 (증분 정리 간격 판단용)
+STATE_FILE = LOG_DIR / ".retention_state.json"
+
+# 증분 정리 1회당 최대 삭제 파일 수 (밀린 파일은 다음 실행에서 이어서 정리)
+INCREMENTAL_MAX_DELETIONS = 200
+
+
+@dataclass
+class RetentionPolicy:
+    """디렉토리 하나에 대한 보존 정책 (None/0이면 해당 기준 미적용)"""
+    name: str
+    directory: Path
+    patterns: Tuple[str, ...]
+    max_age_days: Optional[int] = None
+    max_count: Optional[int] = None
+    max_mb: Optional[int] = None
+
+
+@dataclass
+class SweepResult:
+    """정책별 정리 결과"""
+    policy: str
+    candidates: int = 0
+    deleted: List[Path] = field(default_factory=list)
+    freed_bytes: int = 0
+    errors: int = 0
+
+
+def default_policies() -> List[RetentionPolicy]:
+    """config 설정 기반 기본 보존 정책 목록"""
+    return [
+        RetentionPolicy(
+            name="output",
+            directory=OUTPUT_DIR,
+            patterns=("*.png", "digest_*.pdf"),
+            max_age_days=OUTPUT_RETENTION_DAYS,
+            max_count=OUTPUT_MAX_FILES,
+            max_mb=OUTPUT_MAX_MB,
+        ),
+        RetentionPolicy(
+            name="logs",
+            directory=LOG_DIR,
+            # 로테이션된 JSON 로그(*.jsonl.N)와 예전 실행별 로그
+            patterns=("*.jsonl.*", "run_*.log", "keep_auth_*.log"),
+            max_age_days=LOG_RETENTION_DAYS,
+            max_count=LOG_MAX_FILES,
+            max_mb=LOG_MAX_MB,
+        ),
+        # 예전 버전이 남긴 완료 마커 (현재 완료 여부는 run_db에 기록)
+        RetentionPolicy(
+            name="markers",
+            directory=LOG_DIR / "markers",
+            patterns=("done_*.marker",),
+            max_age_days=MARKER_RETENTION_DAYS,
+        ),
+        # 날짜별 digest 파싱 결과 (월간 분석용)
+        RetentionPolicy(
+            name="digests",
+            directory=CACHE_DIR / "digests",
+            patterns=("*.json",),
+            max_age_days=DIGEST_CACHE_RETENTION_DAYS,
+        ),
+        # 라벨 오버레이 전 인포그래픽 원본 (같은 내용 재제출 시 재사용)
+        RetentionPolicy(
+            name="infographic_sources",
+            directory=CACHE_DIR / "infographic_sources",
+            patterns=("*.png",),
+            max_age_days=INFOGRAPHIC_SOURCE_RETENTION_DAYS,
+        ),
+    ]
+
+
+def _collect(policy: RetentionPolicy) -> List[Tuple[Path, float, int]]:
+    """정책 대상 파일 (경로, mtime, 크기) 목록 - 최신순 정렬"""
+    if not policy.directory.exists():
+        return []
+
+    seen = set()
+    entries = []
+    for pattern in policy.patterns:
+        for path in policy.directory.glob(pattern):
+            if path in seen or not path.is_file():
+                continue
+            seen.add(path)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((path, st.st_mtime, st.st_size))
+
+    entries.sort(key=lambda e: e[1], reverse=True)
+    return entries
+
+
+def select_expired(policy: RetentionPolicy, now: Optional[float] = None) -> List[Tuple[Path, int]]:
+    """
+    정책을 위반하는 파일 선택 (삭제는 하지 않음)
+
+    최신 파일부터 누적하면서 나이, 개수, 누적 용량 중 하나라도 넘으면 삭제 대상.
+
+    Returns:
+        [(경로, 크기), ...] - 오래된 파일이 뒤쪽
+    """
+    now = now or time.time()
+    max_age = policy.max_age_days * 86400 if policy.max_age_days else None
+    max_bytes = policy.max_mb * 1024 * 1024 if policy.max_mb else None
+
+    expired = []
+    kept_count = 0
+    kept_bytes = 0
+    for path, mtime, size in _collect(policy):
+        too_old = max_age is not None and now - mtime > max_age
+        too_many = bool(policy.max_count) and kept_count >= policy.max_count
+        too_big = max_bytes is not None and kept_bytes + size > max_bytes
+        if too_old or too_many or too_big:
+            expired.append((path, size))
+        else:
+            kept_count += 1
+            kept_bytes += size
+    return expired
+
+
+def sweep(
+    policies: Optional[List[RetentionPolicy]] = None,
+    dry_run: bool = False,
+    max_deletions: Optional[int] = None,
+) -> List[SweepResult]:
+    """
+    보존 정책 적용
+
+    Args:
+        policies: 적용할 정책 목록 (None이면 기본 정책)
+        dry_run: True면 삭제하지 않고 대상만 보고
+        max_deletions: 전체 삭제 파일 수 상한 (None이면 무제한)
+
+    Returns:
+        정책별 SweepResult 목록
+    """
+    if policies is None:
+        policies = default_policies()
+
+    results = []
+    budget = max_deletions
+    for policy in policies:
+        result = SweepResult(policy=policy.name)
+        expired = select_expired(policy)
+        result.candidates = len(expired)
+
+        # 가장 오래된 파일부터 삭제
+        for path, size in reversed(expired):
+            if budget is not None and budget <= 0:
+                break
+            if not dry_run:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    # Windows에서 사용 중인 로그 파일 등은 다음 정리에서 재시도
+                    logger.debug(f"  정리 실패: {path} ({e})")
+                    result.errors += 1
+                    continue
+            result.deleted.append(path)
+            result.freed_bytes += size
+            if budget is not None:
+                budget -= 1
+
+        results.append(result)
+    return results
+
+
+def _load_state() -> dict:
+    try:
+        return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: dict):
+    try:
+        STATE_FILE.write_text(json.dumps(state), encoding="utf-8")
+    except OSError as e:
+        logger.debug(f"  보존 정책 상태 저장 실패: {e}")
+
+
+def incremental_sweep(force: bool = False) -> Optional[List[SweepResult]]:
+    """
+    증분 정리: GC_INTERVAL_HOURS 이내에 정리한 적이 있으면 스킵하고,
+    한 번에 INCREMENTAL_MAX_DELETIONS개까지만 삭제한다.
+
+    Returns:
+        정리 결과, 스킵 시 None
+    """
+    state = _load_state()
+    last = state.get("last_sweep", 0)
+    if not force and time.time() - last < GC_INTERVAL_HOURS * 3600:
+        return None
+
+    results = sweep(max_deletions=INCREMENTAL_MAX_DELETIONS)
+    state["last_sweep"] = time.time()
+    _save_state(state)
+
+    deleted = sum(len(r.deleted) for r in results)
+    if deleted:
+        freed = sum(r.freed_bytes for r in results)
+        logger.info(f"🧹 보존 정책 정리: {deleted}개 파일 삭제 ({freed / 1024 / 1024:.1f}MB)")
+    return results
+
+
+def start_background_sweep() -> threading.Thread:
+    """
+    증분 정리를 백그라운드 스레드로 시작.
+    non-daemon 스레드라 프로세스 종료 전에 정리가 끝까지 수행된다.
+    """
+    def _run():
+        try:
+            incremental_sweep()
+        except Exception as e:
+            logger.warning(f"  보존 정책 정리 오류: {e}")
+
+    thread = threading.Thread(target=_run, name="retention-sweep")
+    thread.start()
+    return thread
+
+
+def format_report(results: List[SweepResult], dry_run: bool = False) -> str:
+    """정리 결과 보고서 문자열"""
+    verb = "삭제 예정" if dry_run else "삭제"
+    lines = []
+    for r in results:
+        lines.append(
+            f"  [{r.policy}] {verb} {len(r.deleted)}개 "
+            f"({r.freed_bytes / 1024 / 1024:.1f}MB)"
+            + (f", 실패 {r.errors}개" if r.errors else "")
+        )
+        if dry_run:
+            for path in r.deleted:
+                lines.append(f"    - {path.name}")
+    return "\n".join(lines)
+
+
+def run_gc(dry_run: bool = False) -> bool:
+    """전체 정리 실행 (main.py --gc)"""
+    print("=" * 50)
+    print(f"🧹 보존 정책 정리{' (dry-run)' if dry_run else ''}")
+    print("=" * 50)
+
+    results = sweep(dry_run=dry_run)
+    print(format_report(results, dry_run=dry_run))
+
+    if not dry_run:
+        state = _load_state()
+        state["last_sweep"] = time.time()
+        _save_state(state)
+
+    return all(r.errors == 0 for r in results)
+
+
+if __name__ == "__main__":
+    run_gc(dry_run=True)
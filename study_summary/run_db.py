@@ -0,0 +1,347 @@
+"""
+실행 기록 DB 모듈
+- 실행(runs), 회원별 작업(member_tasks), 단계별 소요 시간(stage_durations),
+  외부 서비스 브레이커 상태 변화(breaker_events)를 SQLite 하나에 기록 → 완료 마커 파일과 로그 grep을 대체
+- WAL 모드 + 실행 중에는 메모리에 모아 두었다가 단계/실행 종료 시 한 번에 기록
+- `python main.py --stats`로 추세와 백분위수 조회
+"""
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config import LOG_DIR
+
+logger = logging.getLogger(__name__)
+
+RUN_DB_FILE = LOG_DIR / "runs.sqlite3"
+# 예전 버전이 남긴 완료 마커 (done_{date}.marker) - 읽기만 함
+LEGACY_MARKER_DIR = LOG_DIR / "markers"
+
+_conn = None
+_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    target_date TEXT NOT NULL,
+    test_mode INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    duration REAL,
+    submitted INTEGER,
+    generated INTEGER,
+    delivered INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs (target_date, status);
+
+CREATE TABLE IF NOT EXISTS member_tasks (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    member TEXT NOT NULL,
+    status TEXT NOT NULL,
+    content_length INTEGER,
+    duration REAL,
+    error TEXT,
+    detail TEXT,
+    PRIMARY KEY (run_id, member)
+);
+CREATE INDEX IF NOT EXISTS idx_member_tasks_member ON member_tasks (member, status);
+
+CREATE TABLE IF NOT EXISTS stage_durations (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    stage TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stage_durations_stage ON stage_durations (stage);
+
+CREATE TABLE IF NOT EXISTS breaker_events (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    service TEXT NOT NULL,
+    from_state TEXT NOT NULL,
+    to_state TEXT NOT NULL,
+    reason TEXT,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_breaker_events_service ON breaker_events (service, to_state);
+"""
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(str(RUN_DB_FILE), check_same_thread=False)
+        # WAL: 기록 중에도 --stats 조회가 막히지 않고, 커밋마다 fsync하지 않음
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.executescript(_SCHEMA)
+        # 예전 DB: 인포그래픽 상세도 열 추가 (NULL = 기본 상세도)
+        columns = {row[1] for row in _conn.execute("PRAGMA table_info(member_tasks)")}
+        if "detail" not in columns:
+            _conn.execute("ALTER TABLE member_tasks ADD COLUMN detail TEXT")
+        _conn.commit()
+    return _conn
+
+
+class RunRecorder:
+    """
+    파이프라인 실행 1회의 기록기
+
+    사용:
+        recorder = RunRecorder.start(target_date)
+        with recorder.stage("scan"):
+            ...
+        recorder.member("홍길동", "generated", duration=42.0)
+        recorder.finish("completed", generated=3)
+    """
+
+    def __init__(self, run_id: int):
+        self.run_id = run_id
+        self._started = time.time()
+        self._members: Dict[str, dict] = {}
+        self._stages: List[tuple] = []
+        self._breaker_events: List[tuple] = []
+
+    @classmethod
+    def start(cls, target_date: str, test_mode: bool = False) -> "RunRecorder":
+        with _lock:
+            conn = _get_conn()
+            cursor = conn.execute(
+                "INSERT INTO runs (target_date, test_mode, status, started_at) VALUES (?, ?, 'running', ?)",
+                (target_date, int(test_mode), time.time()),
+            )
+            conn.commit()
+        return cls(cursor.lastrowid)
+
+    @contextmanager
+    def stage(self, name: str):
+        """단계 소요 시간 측정 (예외가 나도 기록)"""
+        started = time.time()
+        perf = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - perf
+            self._stages.append((self.run_id, name, started, duration))
+            logger.info(f"  ⏱️ {name} 단계 {duration:.1f}초", extra={"stage": name, "duration": duration})
+
+    def member(self, name: str, status: str, **fields):
+        """회원별 작업 상태 갱신 (content_length, duration, error, detail) - 같은 회원은 덮어씀"""
+        row = self._members.setdefault(
+            name, {"content_length": None, "duration": None, "error": None, "detail": None}
+        )
+        row["status"] = status
+        row.update((k, v) for k, v in fields.items() if v is not None)
+
+    def breaker_events(self, events: List[dict]):
+        """브레이커 상태 변화 기록 (resilience.drain_events() 결과)"""
+        self._breaker_events.extend(
+            (self.run_id, e["service"], e["from"], e["to"], e["reason"], e["at"]) for e in events
+        )
+
+    def flush(self):
+        """모아 둔 회원/단계/브레이커 기록을 한 트랜잭션으로 기록"""
+        if not self._members and not self._stages and not self._breaker_events:
+            return
+        members = [
+            (self.run_id, name, row["status"], row["content_length"], row["duration"], row["error"], row["detail"])
+            for name, row in self._members.items()
+        ]
+        stages, self._stages = self._stages, []
+        breaker_events, self._breaker_events = self._breaker_events, []
+        with _lock:
+            conn = _get_conn()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO member_tasks "
+                    "(run_id, member, status, content_length, duration, error, detail) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    members,
+                )
+                conn.executemany(
+                    "INSERT INTO stage_durations (run_id, stage, started_at, duration) VALUES (?, ?, ?, ?)",
+                    stages,
+                )
+                conn.executemany(
+                    "INSERT INTO breaker_events (run_id, service, from_state, to_state, reason, at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    breaker_events,
+                )
+
+    def finish(self, status: str, submitted: int = None, generated: int = None,
+               delivered: int = None, error: str = None):
+        """실행 종료 기록"""
+        self.flush()
+        finished = time.time()
+        with _lock:
+            conn = _get_conn()
+            with conn:
+                conn.execute(
+                    "UPDATE runs SET status = ?, finished_at = ?, duration = ?, "
+                    "submitted = ?, generated = ?, delivered = ?, error = ? WHERE id = ?",
+                    (status, finished, finished - self._started,
+                     submitted, generated, delivered, error, self.run_id),
+                )
+
+
+def is_completed(target_date: str) -> bool:
+    """해당 날짜가 이미 처리 완료되었는지 (DB 기록 또는 예전 완료 마커)"""
+    with _lock:
+        row = _get_conn().execute(
+            "SELECT 1 FROM runs WHERE target_date = ? AND status = 'completed' AND test_mode = 0 LIMIT 1",
+            (target_date,),
+        ).fetchone()
+    if row is not None:
+        return True
+    return (LEGACY_MARKER_DIR / f"done_{target_date}.marker").exists()
+
+
+# =========================================
+# 조회 (--stats)
+# =========================================
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """선형 보간 백분위수 (q: 0~100)"""
+    if not values:
+        return None
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if value >= 60:
+        return f"{value / 60:.1f}m"
+    return f"{value:.1f}s"
+
+
+def _distribution_line(label: str, values: List[float]) -> str:
+    p50, p90, p95 = (_percentile(values, q) for q in (50, 90, 95))
+    return (
+        f"  {label:<14} n={len(values):<4} p50={_format_seconds(p50):>7} "
+        f"p90={_format_seconds(p90):>7} p95={_format_seconds(p95):>7} "
+        f"max={_format_seconds(max(values) if values else None):>7}"
+    )
+
+
+# 인포그래픽 생성에 성공한 회원의 상태 (전송 단계에서 상태가 바뀜)
+GENERATED_STATUSES = ("generated", "delivered", "delivery_failed")
+
+
+def generation_samples(days: int = 30) -> List[Tuple[str, Optional[int], float, Optional[str]]]:
+    """최근 days일 동안 인포그래픽 생성 기록 [(회원, 내용 길이, 소요 시간, 상세도 - NULL이면 기본), ...]"""
+    since = time.time() - days * 86400
+    with _lock:
+        return _get_conn().execute(
+            "SELECT m.member, m.content_length, m.duration, m.detail FROM member_tasks m JOIN runs r ON r.id = m.run_id "
+            "WHERE r.started_at >= ? AND r.test_mode = 0 AND m.duration IS NOT NULL "
+            f"AND m.status IN ({', '.join('?' * len(GENERATED_STATUSES))})",
+            (since, *GENERATED_STATUSES),
+        ).fetchall()
+
+
+def member_durations(days: int = 30) -> Dict[str, List[float]]:
+    """최근 days일 동안 회원별 인포그래픽 생성 소요 시간 목록"""
+    durations: Dict[str, List[float]] = {}
+    for member, _, duration, _ in generation_samples(days):
+        durations.setdefault(member, []).append(duration)
+    return durations
+
+
+def print_stats(days: int = 30) -> bool:
+    """최근 days일 실행 추세, 단계/생성 소요 시간 백분위수, 회원별 실패 횟수 출력"""
+    if not RUN_DB_FILE.exists():
+        print("실행 기록이 없습니다.")
+        return False
+
+    since = time.time() - days * 86400
+    with _lock:
+        conn = _get_conn()
+        runs = conn.execute(
+            "SELECT target_date, status, started_at, duration, submitted, generated, delivered "
+            "FROM runs WHERE started_at >= ? AND test_mode = 0 ORDER BY started_at",
+            (since,),
+        ).fetchall()
+        stages = conn.execute(
+            "SELECT s.stage, s.duration FROM stage_durations s JOIN runs r ON r.id = s.run_id "
+            "WHERE r.started_at >= ? AND r.test_mode = 0",
+            (since,),
+        ).fetchall()
+        failures = conn.execute(
+            "SELECT m.member, COUNT(*) FROM member_tasks m JOIN runs r ON r.id = m.run_id "
+            "WHERE r.started_at >= ? AND r.test_mode = 0 AND m.status IN ('failed', 'error', 'delivery_failed') "
+            "GROUP BY m.member ORDER BY COUNT(*) DESC LIMIT 10",
+            (since,),
+        ).fetchall()
+        breaker_opens = conn.execute(
+            "SELECT b.service, COUNT(*), MAX(b.at) FROM breaker_events b JOIN runs r ON r.id = b.run_id "
+            "WHERE r.started_at >= ? AND r.test_mode = 0 AND b.to_state = 'open' "
+            "GROUP BY b.service ORDER BY COUNT(*) DESC",
+            (since,),
+        ).fetchall()
+
+    print("=" * 60)
+    print(f"📈 최근 {days}일 실행 통계 ({len(runs)}회)")
+    print("=" * 60)
+    if not runs:
+        print("  기록 없음")
+        return True
+
+    by_status: Dict[str, int] = {}
+    for run in runs:
+        by_status[run[1]] = by_status.get(run[1], 0) + 1
+    print("  " + ", ".join(f"{status} {count}회" for status, count in sorted(by_status.items())))
+
+    # 주별 추세
+    print("\n[주별 추세]")
+    weeks: Dict[str, List[tuple]] = {}
+    for run in runs:
+        start = datetime.fromtimestamp(run[2])
+        week = (start - timedelta(days=start.weekday())).strftime("%Y-%m-%d")
+        weeks.setdefault(week, []).append(run)
+    for week, week_runs in weeks.items():
+        durations = [r[3] for r in week_runs if r[3] is not None]
+        submitted = sum(r[4] or 0 for r in week_runs)
+        generated = sum(r[5] or 0 for r in week_runs)
+        failed = sum(1 for r in week_runs if r[1] == "failed")
+        print(
+            f"  {week} 주: 실행 {len(week_runs)}회 (실패 {failed}), 생성 {generated}/{submitted}, "
+            f"실행 시간 p50 {_format_seconds(_percentile(durations, 50))}"
+        )
+
+    print("\n[단계별 소요 시간]")
+    by_stage: Dict[str, List[float]] = {}
+    for stage, duration in stages:
+        by_stage.setdefault(stage, []).append(duration)
+    for stage, values in by_stage.items():
+        print(_distribution_line(stage, values))
+    print(_distribution_line("전체 실행", [r[3] for r in runs if r[3] is not None]))
+
+    print("\n[인포그래픽 생성 시간 (회원 1명)]")
+    all_durations = [d for values in member_durations(days).values() for d in values]
+    print(_distribution_line("생성", all_durations))
+
+    print("\n[회원별 실패 횟수]")
+    if failures:
+        for member, count in failures:
+            print(f"  {member}: {count}회")
+    else:
+        print("  없음")
+
+    print("\n[외부 서비스 차단(브레이커 open)]")
+    if breaker_opens:
+        for service, count, last in breaker_opens:
+            print(f"  {service}: {count}회 (마지막 {datetime.fromtimestamp(last):%m-%d %H:%M})")
+    else:
+        print("  없음")
+    print("=" * 60)
+    return True
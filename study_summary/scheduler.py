@@ -0,0 +1,276 @@
+"""
+인포그래픽 생성 작업 스케줄러
+- 회원별 생성 시간을 내용 길이와 실행 기록(run_db)으로 예측
+- 우선순위 → 마감 시각 → 예측 시간이 긴 순(LPT)으로 정렬해 동시 작업자에 배정
+  (긴 작업이 마지막에 시작되어 전체 완료 시각(makespan)이 늘어나는 것을 방지)
+- 결과 전달 마감까지 남은 시간에 맞춰 동시 작업자 수를 정하고, 그래도 부족하면
+  예측 시간이 긴 회원부터 간략(concise) 모드로 낮춤 (fit_to_deadline)
+- 실행 후 예측 makespan과 실제 makespan, 마감 초과 회원을 보고
+"""
+import heapq
+import logging
+import statistics
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config import MEMBER_DEADLINES, MEMBER_PRIORITIES
+
+logger = logging.getLogger(__name__)
+
+# 실행 기록이 없을 때의 예측값 (초): 기본 시간 + 글자당 시간
+DEFAULT_BASE_SECONDS = 150.0
+DEFAULT_SECONDS_PER_CHAR = 0.01
+# 예측에 사용할 실행 기록 기간 (일)
+HISTORY_DAYS = 60
+
+# 인포그래픽 상세도 (notebooklm InfographicDetail 이름)
+DEFAULT_DETAIL = "detailed"
+CHEAP_DETAIL = "concise"
+# 간략 모드 생성 시간 / 기본 모드 생성 시간 (예측용)
+CHEAP_MODE_FACTOR = 0.6
+
+
+@dataclass
+class GenerationTask:
+    """회원 1명의 인포그래픽 생성 작업"""
+    member: dict
+    predicted: float
+    priority: int = 0
+    deadline: Optional[datetime] = None
+    detail: str = DEFAULT_DETAIL
+    # 실행 결과 (실행 시작 기준 초)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.member["name"]
+
+    @property
+    def content_length(self) -> int:
+        return len(self.member.get("text_content", "").strip())
+
+    @property
+    def actual(self) -> Optional[float]:
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class DurationModel:
+    """
+    생성 시간 예측: 전체 기록으로 (기본 시간 + 길이 비례) 선형 모델을 맞추고,
+    회원별 기록이 있으면 그 회원의 실제/예측 비율(중앙값)을 곱한다.
+    간략 모드로 생성한 기록은 CHEAP_MODE_FACTOR로 나눠 기본 상세도 기준 시간으로 바꿔 사용한다.
+    """
+
+    def __init__(self, samples: List[Tuple[str, Optional[int], float, Optional[str]]]):
+        samples = [
+            (member, length, duration / CHEAP_MODE_FACTOR if detail == CHEAP_DETAIL else duration)
+            for member, length, duration, detail in samples
+        ]
+        self.base, self.per_char = self._fit(
+            [(length, duration) for _, length, duration in samples if length is not None]
+        )
+        ratios: Dict[str, List[float]] = {}
+        for member, length, duration in samples:
+            baseline = self._baseline(length or 0)
+            if baseline > 0:
+                ratios.setdefault(member, []).append(duration / baseline)
+        self.member_factor = {m: statistics.median(r) for m, r in ratios.items()}
+
+    @staticmethod
+    def _fit(points: List[Tuple[int, float]]) -> Tuple[float, float]:
+        if len(points) < 3:
+            return DEFAULT_BASE_SECONDS, DEFAULT_SECONDS_PER_CHAR
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        if var_x == 0:
+            return mean_y, 0.0
+        slope = max(0.0, sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x)
+        return max(1.0, mean_y - slope * mean_x), slope
+
+    def _baseline(self, content_length: int) -> float:
+        return self.base + self.per_char * content_length
+
+    def predict(self, member: str, content_length: int) -> float:
+        return self._baseline(content_length) * self.member_factor.get(member, 1.0)
+
+    @classmethod
+    def from_history(cls, days: int = HISTORY_DAYS) -> "DurationModel":
+        try:
+            from run_db import generation_samples
+            return cls(generation_samples(days))
+        except Exception as e:
+            logger.warning(f"  실행 기록을 읽지 못해 기본 예측값 사용: {e}")
+            return cls([])
+
+
+def _parse_deadline(value: Optional[str], now: datetime) -> Optional[datetime]:
+    """'HH:MM' → 오늘(지났으면 내일) 해당 시각"""
+    if not value:
+        return None
+    try:
+        hour, minute = (int(x) for x in value.split(":"))
+    except ValueError:
+        logger.warning(f"  잘못된 마감 시각 형식: {value} (HH:MM)")
+        return None
+    deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if deadline <= now:
+        deadline += timedelta(days=1)
+    return deadline
+
+
+def simulate(tasks: List[GenerationTask], workers: int) -> Dict[str, float]:
+    """목록 순서대로 빈 작업자에 배정했을 때 회원별 예측 완료 시각 (시작 기준 초)"""
+    free_at = [0.0] * max(1, workers)
+    finish = {}
+    for task in tasks:
+        start = heapq.heappop(free_at)
+        finish[task.name] = start + task.predicted
+        heapq.heappush(free_at, finish[task.name])
+    return finish
+
+
+def plan(
+    members: List[dict],
+    workers: int,
+    model: Optional[DurationModel] = None,
+    now: Optional[datetime] = None,
+) -> List[GenerationTask]:
+    """
+    생성 순서 결정
+
+    정렬 기준: 우선순위 높은 순 → 마감 시각 빠른 순 (마감 없는 회원은 뒤) → 예측 시간 긴 순
+    """
+    model = model or DurationModel.from_history()
+    now = now or datetime.now()
+    tasks = [
+        GenerationTask(
+            member=m,
+            predicted=model.predict(m["name"], len(m.get("text_content", "").strip())),
+            priority=MEMBER_PRIORITIES.get(m["name"], 0),
+            deadline=_parse_deadline(MEMBER_DEADLINES.get(m["name"]), now),
+        )
+        for m in members
+    ]
+    tasks.sort(key=_order_key)
+    return tasks
+
+
+def _order_key(task: GenerationTask):
+    return -task.priority, task.deadline or datetime.max, -task.predicted
+
+
+def _makespan(tasks: List[GenerationTask], workers: int) -> float:
+    return max(simulate(tasks, workers).values(), default=0.0)
+
+
+def degrade(task: GenerationTask) -> float:
+    """작업을 간략 모드로 바꾸고 이전 예측 시간을 반환 (순서는 호출한 쪽에서 다시 정렬)"""
+    old = task.predicted
+    if task.detail != CHEAP_DETAIL:
+        task.detail = CHEAP_DETAIL
+        task.predicted = old * CHEAP_MODE_FACTOR
+    return old
+
+
+def degrade_members(tasks: List[GenerationTask], names, reason: str):
+    """지정한 회원들의 작업을 간략 모드로 바꾸고 순서를 다시 정렬"""
+    for task in tasks:
+        if task.name in names and task.detail != CHEAP_DETAIL:
+            old = degrade(task)
+            logger.info(
+                f"  ⚙️ {task.name}: 간략 모드로 생성 (예측 {old / 60:.1f}분 → {task.predicted / 60:.1f}분, {reason})",
+                extra={"member": task.name, "stage": "degrade"},
+            )
+    tasks.sort(key=_order_key)
+
+
+def fit_to_deadline(
+    tasks: List[GenerationTask],
+    available: float,
+    min_workers: int,
+    max_workers: int,
+) -> int:
+    """
+    남은 시간(available초) 안에 끝나도록 동시 작업자 수를 정하고, 부족하면 작업을 낮춤
+
+    1. min_workers부터 하나씩 늘려 예측 makespan이 맞는 가장 적은 작업자 수 선택
+    2. max_workers로도 부족하면 예측 시간이 긴 회원부터 간략 모드로 바꿈
+       (tasks의 detail/predicted를 바꾸고 순서를 다시 정렬)
+
+    Returns:
+        사용할 작업자 수
+    """
+    max_workers = max(1, min(max_workers, len(tasks)))
+    min_workers = max(1, min(min_workers, max_workers))
+    for workers in range(min_workers, max_workers + 1):
+        makespan = _makespan(tasks, workers)
+        if makespan <= available:
+            if workers > min_workers:
+                logger.warning(
+                    f"  ⚙️ 마감까지 {available / 60:.1f}분: 동시 생성 {min_workers} → {workers}명 "
+                    f"(예측 {_makespan(tasks, min_workers) / 60:.1f}분 → {makespan / 60:.1f}분)",
+                    extra={"stage": "degrade"},
+                )
+            return workers
+
+    workers = max_workers
+    for task in sorted(tasks, key=lambda t: t.predicted, reverse=True):
+        if _makespan(tasks, workers) <= available:
+            break
+        if task.detail == CHEAP_DETAIL:
+            continue
+        old = degrade(task)
+        tasks.sort(key=_order_key)
+        logger.warning(
+            f"  ⚙️ {task.name}: 간략 모드로 생성 (예측 {old / 60:.1f}분 → {task.predicted / 60:.1f}분, "
+            f"마감까지 {available / 60:.1f}분, 작업자 {workers}명)",
+            extra={"member": task.name, "stage": "degrade"},
+        )
+
+    makespan = _makespan(tasks, workers)
+    if makespan > available:
+        logger.warning(
+            f"  ⚠️ 간략 모드로도 마감 초과 예상 (예측 {makespan / 60:.1f}분 > {available / 60:.1f}분) "
+            f"- 시간 예산을 넘는 재시도는 생략",
+            extra={"stage": "degrade"},
+        )
+    return workers
+
+
+def report(tasks: List[GenerationTask], workers: int, actual_makespan: float, run_started: datetime):
+    """예측 vs 실제 makespan, 예측 오차가 큰 회원, 마감 초과 회원 로그"""
+    if not tasks:
+        return
+    predicted_finish = simulate(tasks, workers)
+    predicted_makespan = max(predicted_finish.values())
+    logger.info(
+        f"  🗓️ makespan: 예측 {predicted_makespan / 60:.1f}분 / 실제 {actual_makespan / 60:.1f}분 "
+        f"(작업자 {workers}명, {len(tasks)}건)",
+        extra={"stage": "schedule", "duration": actual_makespan},
+    )
+
+    errors = [
+        (abs(t.actual - t.predicted), t) for t in tasks if t.actual is not None
+    ]
+    for _, task in sorted(errors, key=lambda e: e[0], reverse=True)[:3]:
+        logger.info(
+            f"    {task.name}: 예측 {task.predicted:.0f}초 / 실제 {task.actual:.0f}초 "
+            f"({task.content_length}자)",
+            extra={"member": task.name, "stage": "schedule", "duration": task.actual},
+        )
+
+    for task in tasks:
+        if task.deadline is None or task.finished is None:
+            continue
+        finished_at = run_started + timedelta(seconds=task.finished)
+        if finished_at > task.deadline:
+            logger.warning(
+                f"    ⏰ {task.name}: 마감 {task.deadline:%H:%M} 초과 (완료 {finished_at:%H:%M})",
+                extra={"member": task.name, "stage": "schedule"},
+            )
@@ -0,0 +1,268 @@
+"""
+Slack 비동기 전송 엔진
+- AsyncWebClient + 공유 aiohttp 세션으로 여러 업로드를 동시에 전송
+- Slack API 메서드별 전역 레이트 리미터: 한 호출자가 ratelimited를 받으면
+  같은 메서드를 쓰는 모든 호출자가 Retry-After 동안 함께 대기
+- 파일 경로뿐 아니라 메모리 bytes에서 바로 업로드 (생성 직후 디스크 재읽기 없음)
+- 이미지 전송의 유일한 경로: 파이프라인(main.deliver_images)은 deliver_fanout()만 사용
+"""
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from slack_sdk.errors import SlackApiError
+
+import cassette
+from config import SLACK_BOT_TOKEN, SLACK_CONCURRENCY
+from delivery_ledger import LedgerKey, file_ids_from_response, is_delivered, record_delivery
+from rate_limit import AsyncTokenBucket, run_sync
+from resilience import BudgetExceededError, check, get_breaker, remaining_budget, retry_delay
+from slack_sender import (
+    STALE_CHANNEL_ERRORS,
+    chunk_for_upload,
+    get_dm_channel_id,
+    invalidate_dm_channel,
+)
+
+logger = logging.getLogger(__name__)
+
+# 메서드별 분당 호출 한도 (Slack Web API rate limit tier 기준, 여유 있게 설정)
+METHOD_RATES = {
+    "files_upload_v2": 20,      # files.getUploadURLExternal/completeUploadExternal
+    "chat_postMessage": 60,
+    "conversations_open": 50,
+}
+DEFAULT_METHOD_RATE = 20
+
+# 메서드별 전역 리미터 (모든 엔진/스레드가 공유)
+_buckets: Dict[str, AsyncTokenBucket] = {}
+
+# 이벤트 루프별 동시 요청 수 제한
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _bucket(method: str) -> AsyncTokenBucket:
+    bucket = _buckets.get(method)
+    if bucket is None:
+        rate = METHOD_RATES.get(method, DEFAULT_METHOD_RATE)
+        # 순간 몰림을 줄이기 위해 버킷 용량은 분당 한도의 1/4
+        bucket = _buckets.setdefault(method, AsyncTokenBucket(rate, capacity=max(1, rate // 4)))
+    return bucket
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(SLACK_CONCURRENCY)
+        _semaphores[loop] = sem
+    return sem
+
+
+@dataclass
+class SlackUpload:
+    """
+    업로드할 파일 하나 (data가 있으면 메모리에서, 없으면 path에서 업로드)
+    ledger_key가 있으면 전송 원장으로 중복 전송을 막는다.
+    """
+    filename: str
+    data: Optional[bytes] = None
+    path: Optional[Path] = None
+    title: Optional[str] = None
+    ledger_key: Optional[LedgerKey] = None
+
+    @property
+    def size(self) -> int:
+        if self.data is not None:
+            return len(self.data)
+        return self.path.stat().st_size if self.path else 0
+
+    def to_file_upload(self) -> dict:
+        return {
+            "file": self.data if self.data is not None else str(self.path),
+            "filename": self.filename,
+            "title": self.title or Path(self.filename).stem,
+        }
+
+
+class SlackDeliveryEngine:
+    """
+    비동기 Slack 전송 엔진
+
+    사용:
+        async with SlackDeliveryEngine() as engine:
+            await engine.send_uploads(channel_id, uploads, message)
+    """
+
+    def __init__(self, token: str = SLACK_BOT_TOKEN, max_retries: int = 3):
+        # 카세트 재생은 Slack에 요청하지 않으므로 토큰 없이도 실행 (slack_sender.get_slack_client와 같음)
+        if not token and not cassette.replaying():
+            raise ValueError("SLACK_BOT_TOKEN이 설정되지 않았습니다. .env 파일을 확인하세요.")
+        self.token = token
+        self.max_retries = max_retries
+        self._session = None
+        self.client = None
+        # 채널 관련 오류(channel_not_found 등)가 난 채널 ID
+        self.stale_channels = set()
+
+    async def __aenter__(self):
+        import aiohttp
+        from slack_sdk.web.async_client import AsyncWebClient
+
+        # 엔진 수명 동안 하나의 aiohttp 세션(커넥션 풀)을 재사용
+        self._session = aiohttp.ClientSession()
+        self.client = cassette.wrap_slack(AsyncWebClient(token=self.token, session=self._session), is_async=True)
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self.client = None
+
+    async def call(self, method: str, **kwargs):
+        """
+        레이트 리밋/동시성 제한/재시도를 적용한 API 호출
+
+        Raises:
+            SlackApiError: 재시도 후에도 실패한 경우
+            CircuitOpenError: Slack 브레이커가 열려 있는 경우
+            BudgetExceededError: 실행 시간 예산 안에 재시도할 수 없는 경우
+        """
+        breaker = get_breaker("slack")
+        bucket = _bucket(method)
+        for attempt in range(1, self.max_retries + 1):
+            check("slack")
+            await bucket.acquire()
+            try:
+                async with _get_semaphore():
+                    response = await getattr(self.client, method)(**kwargs)
+                breaker.record_success()
+                return response
+            except SlackApiError as e:
+                error = e.response["error"]
+                if error == "ratelimited":
+                    breaker.release()
+                    retry_after = int(e.response.headers.get("Retry-After", 10))
+                    if attempt == self.max_retries:
+                        raise
+                    if retry_after >= remaining_budget():
+                        raise BudgetExceededError(f"레이트 리밋 대기 {retry_after}초가 남은 예산보다 김")
+                    # 같은 메서드를 쓰는 모든 호출자가 함께 대기 (장애로 세지 않음)
+                    bucket.penalize(retry_after)
+                    logger.warning(f"   ⏳ {method} 레이트 리밋 - 전체 {retry_after}초 대기...")
+                    continue
+                if error in STALE_CHANNEL_ERRORS:
+                    # 채널 캐시 문제는 호출자가 채널을 다시 열어 처리
+                    breaker.release()
+                    raise
+                breaker.record_failure(error)
+                if attempt == self.max_retries:
+                    raise
+                wait = retry_delay(attempt, base=5.0)
+                logger.warning(f"   ⏳ {method} 실패 ({error}), {wait:.1f}초 후 재시도...")
+                await asyncio.sleep(wait)
+
+    async def open_dm(self, user_id: str) -> str:
+        """DM 채널 ID (slack_sender의 채널 캐시를 공유)"""
+        # 캐시 적중 시 API 호출이 없고, 미스일 때만 동기 호출 1회
+        return await asyncio.to_thread(get_dm_channel_id, user_id)
+
+    async def resolve_target(self, target: str) -> str:
+        """사용자 ID(U.../W...)는 DM 채널로, 채널 ID(C.../G.../D...)는 그대로"""
+        if target[:1] in ("U", "W"):
+            return await self.open_dm(target)
+        return target
+
+    async def upload(self, channel_id: str, uploads: List[SlackUpload], comment: str = None):
+        """파일 여러 개를 하나의 files_upload_v2 호출로 업로드"""
+        return await self.call(
+            "files_upload_v2",
+            channel=channel_id,
+            file_uploads=[u.to_file_upload() for u in uploads],
+            initial_comment=comment,
+        )
+
+    async def send_uploads(
+        self,
+        channel_id: str,
+        uploads: List[SlackUpload],
+        message: str = None,
+    ) -> List[SlackUpload]:
+        """
+        업로드 목록을 묶음으로 나눠 전송 (원장에 있는 업로드는 제외)
+
+        메시지가 붙은 첫 묶음을 먼저 보내고, 성공한 뒤에만 나머지 묶음을 동시에 보낸다
+        (순번만 붙은 묶음이 본 메시지보다 먼저 도착하거나 메시지 없이 올라가지 않도록).
+        첫 묶음이 실패하면 모든 묶음을 실패로 반환한다.
+
+        Returns:
+            전송에 실패한 업로드 목록
+        """
+        pending = [u for u in uploads if not (u.ledger_key and is_delivered(u.ledger_key))]
+        if len(pending) < len(uploads):
+            logger.info(f"⏭️ 이미 전송된 파일 {len(uploads) - len(pending)}개 스킵")
+        if not pending:
+            return []
+        chunks = chunk_for_upload(pending, size_of=lambda u: u.size)
+
+        async def _send(i: int, chunk: List[SlackUpload]) -> List[SlackUpload]:
+            comment = (message or "📊 오늘의 스터디 인증 현황입니다!") if i == 0 else f"({i + 1}/{len(chunks)})"
+            try:
+                response = await self.upload(channel_id, chunk, comment)
+                file_ids = file_ids_from_response(response)
+                for u in chunk:
+                    if u.ledger_key:
+                        record_delivery(u.ledger_key, channel_id, file_ids.get(u.filename))
+                logger.info(f"✅ Slack 묶음 전송 완료 ({i + 1}/{len(chunks)}, {len(chunk)}개)")
+                return []
+            except SlackApiError as e:
+                logger.error(f"❌ Slack 묶음 전송 실패 ({i + 1}/{len(chunks)}): {e.response['error']}")
+                if e.response["error"] in STALE_CHANNEL_ERRORS:
+                    self.stale_channels.add(channel_id)
+                return chunk
+            except Exception as e:
+                logger.error(f"❌ Slack 묶음 전송 오류 ({i + 1}/{len(chunks)}): {e}")
+                return chunk
+
+        if await _send(0, chunks[0]):
+            return pending
+        results = await asyncio.gather(*(_send(i, c) for i, c in enumerate(chunks) if i > 0))
+        return [u for failed in results for u in failed]
+
+
+async def deliver_fanout_async(batches: List[Tuple[str, List[SlackUpload], str]]) -> List[SlackUpload]:
+    """
+    여러 수신자에게 동시에 전송 (하나의 세션과 전역 레이트 리미터 공유)
+
+    Args:
+        batches: [(수신자 사용자/채널 ID, 업로드 목록, 메시지), ...]
+
+    Returns:
+        전송에 실패한 업로드 목록
+    """
+    if not batches:
+        return []
+
+    async with SlackDeliveryEngine() as engine:
+        async def _deliver(target: str, uploads: List[SlackUpload], message: str) -> List[SlackUpload]:
+            try:
+                channel_id = await engine.resolve_target(target)
+            except Exception as e:
+                logger.error(f"❌ Slack 수신자 확인 실패 ({target}): {e}")
+                return uploads
+            failed = await engine.send_uploads(channel_id, uploads, message)
+            if channel_id in engine.stale_channels and target[:1] in ("U", "W"):
+                invalidate_dm_channel(target)
+            return failed
+
+        results = await asyncio.gather(*(_deliver(*batch) for batch in batches))
+    return [u for failed in results for u in failed]
+
+
+def deliver_fanout(batches: List[Tuple[str, List[SlackUpload], str]]) -> List[SlackUpload]:
+    """deliver_fanout_async()의 동기 래퍼"""
+    return run_sync(deliver_fanout_async(batches))
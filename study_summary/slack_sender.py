@@ -1,104 +1,120 @@
 """
-Slack 메시지 전송 모듈
-- 생성된 이미지를 Slack DM으로 전송
+Slack 클라이언트/채널 모듈
+- 동기 WebClient (프로세스 내 재사용), DM 채널 ID 디스크 캐시, 업로드 묶음 분할, 연결 테스트
+- 이미지 전송은 slack_delivery.deliver_fanout 한 경로만 사용 (비동기 엔진, 묶음 순서/재시도/원장 기록)
 """
+import json
+import logging
+import threading
 import time
-from pathlib import Path
+from typing import List
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
-from config import SLACK_BOT_TOKEN, SLACK_USER_ID
+import cassette
+from config import SLACK_BOT_TOKEN, SLACK_USER_ID, CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# DM 채널 ID 디스크 캐시 ({user_id: {"channel": ..., "saved_at": ...}})
+DM_CHANNEL_CACHE_FILE = CACHE_DIR / "slack_dm_channels.json"
+DM_CHANNEL_TTL = 7 * 86400  # seconds
+
+# 채널 캐시가 잘못되었을 때 Slack이 돌려주는 오류
+STALE_CHANNEL_ERRORS = {"channel_not_found", "not_in_channel", "is_archived"}
+
+# files_upload_v2 한 번에 올릴 수 있는 파일 수 / 묶음당 총 용량 상한
+MAX_FILES_PER_UPLOAD = 10
+MAX_BYTES_PER_UPLOAD = 50 * 1024 * 1024
+
+# 프로세스 내에서 재사용하는 클라이언트와 DM 채널 ID
+_client = None
+_dm_channels = {}
+_lock = threading.Lock()
 
 
 def get_slack_client() -> WebClient:
-    """Slack 클라이언트 생성"""
-    if not SLACK_BOT_TOKEN:
+    """Slack 클라이언트 (한 번만 만들고 재사용)"""
+    global _client
+    if _client is not None:
+        return _client
+
+    # 카세트 재생은 Slack에 요청하지 않으므로 토큰 없이도 실행 (벤치마크 환경)
+    if not SLACK_BOT_TOKEN and not cassette.replaying():
         raise ValueError("SLACK_BOT_TOKEN이 설정되지 않았습니다. .env 파일을 확인하세요.")
     
-    return WebClient(token=SLACK_BOT_TOKEN)
+    with _lock:
+        if _client is None:
+            # 카세트 녹화/재생 중이면 API 응답을 녹화하거나 녹화된 응답으로 대체
+            _client = cassette.wrap_slack(WebClient(token=SLACK_BOT_TOKEN))
+    return _client
 
 
-def send_dm_with_image(image_path: Path, message: str = None, max_retries: int = 3) -> bool:
-    """
-    Slack DM으로 이미지 전송 (재시도 포함)
+def _load_dm_channel_cache() -> dict:
+    try:
+        return json.loads(DM_CHANNEL_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
 
-    Args:
-        image_path: 전송할 이미지 파일 경로
-        message: 함께 보낼 메시지 (optional)
-        max_retries: 최대 재시도 횟수 (기본 3)
 
-    Returns:
-        성공 여부
-    """
-    if not SLACK_USER_ID:
-        raise ValueError("SLACK_USER_ID가 설정되지 않았습니다. .env 파일을 확인하세요.")
-
-    client = get_slack_client()
-
-    for attempt in range(1, max_retries + 1):
-        try:
-            # DM 채널 열기
-            response = client.conversations_open(users=[SLACK_USER_ID])
-            channel_id = response["channel"]["id"]
-
-            # 이미지 업로드 및 전송
-            with open(image_path, "rb") as file:
-                response = client.files_upload_v2(
-                    channel=channel_id,
-                    file=file,
-                    filename=image_path.name,
-                    initial_comment=message or "📊 오늘의 스터디 인증 현황입니다!"
-                )
-
-            print(f"✅ Slack DM 전송 완료!")
-            return True
-
-        except SlackApiError as e:
-            error = e.response['error']
-            print(f"❌ Slack 전송 실패 (시도 {attempt}/{max_retries}): {error}")
-            if error == 'ratelimited':
-                retry_after = int(e.response.headers.get('Retry-After', 10))
-                print(f"   ⏳ 레이트 리밋 - {retry_after}초 대기...")
-                time.sleep(retry_after)
-            elif attempt < max_retries:
-                wait = 5 * attempt
-                print(f"   ⏳ {wait}초 후 재시도...")
-                time.sleep(wait)
-        except Exception as e:
-            print(f"❌ Slack 전송 오류 (시도 {attempt}/{max_retries}): {e}")
-            if attempt < max_retries:
-                wait = 5 * attempt
-                print(f"   ⏳ {wait}초 후 재시도...")
-                time.sleep(wait)
-
-    print(f"❌ {max_retries}회 시도 모두 실패")
-    return False
-
-
-def send_text_message(message: str) -> bool:
+def _save_dm_channel_cache(cache: dict):
+    try:
+        DM_CHANNEL_CACHE_FILE.write_text(json.dumps(cache), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"⚠️ DM 채널 캐시 저장 실패: {e}")
+
+
+def get_dm_channel_id(user_id: str = SLACK_USER_ID) -> str:
     """
-    Slack DM으로 텍스트 메시지만 전송
+    사용자 DM 채널 ID 조회
+    프로세스 메모리 → 디스크 캐시(TTL) → conversations_open 순으로 확인
     """
-    if not SLACK_USER_ID:
-        raise ValueError("SLACK_USER_ID가 설정되지 않았습니다.")
-    
-    client = get_slack_client()
-    
-    try:
-        response = client.conversations_open(users=[SLACK_USER_ID])
+    channel_id = _dm_channels.get(user_id)
+    if channel_id:
+        return channel_id
+
+    with _lock:
+        cache = _load_dm_channel_cache()
+        entry = cache.get(user_id)
+        if entry and time.time() - entry.get("saved_at", 0) < DM_CHANNEL_TTL:
+            _dm_channels[user_id] = entry["channel"]
+            return entry["channel"]
+
+        response = get_slack_client().conversations_open(users=[user_id])
         channel_id = response["channel"]["id"]
-        
-        client.chat_postMessage(
-            channel=channel_id,
-            text=message
-        )
-        
-        print(f"✅ Slack 메시지 전송 완료!")
-        return True
-        
-    except SlackApiError as e:
-        print(f"❌ Slack 전송 실패: {e.response['error']}")
-        return False
+        _dm_channels[user_id] = channel_id
+        cache[user_id] = {"channel": channel_id, "saved_at": time.time()}
+        _save_dm_channel_cache(cache)
+        return channel_id
+
+
+def invalidate_dm_channel(user_id: str = SLACK_USER_ID):
+    """캐시된 DM 채널 ID 삭제 (다음 호출 시 다시 조회)"""
+    with _lock:
+        _dm_channels.pop(user_id, None)
+        cache = _load_dm_channel_cache()
+        if cache.pop(user_id, None) is not None:
+            _save_dm_channel_cache(cache)
+
+
+def chunk_for_upload(items: list, size_of=lambda path: path.stat().st_size) -> List[list]:
+    """파일 수/총 용량 제한에 맞춰 업로드 묶음으로 분할 (순서 유지)"""
+    chunks = []
+    current = []
+    current_bytes = 0
+    for item in items:
+        size = size_of(item)
+        if current and (
+            len(current) >= MAX_FILES_PER_UPLOAD
+            or current_bytes + size > MAX_BYTES_PER_UPLOAD
+        ):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(item)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 def test_connection() -> bool:
@@ -107,19 +123,21 @@ def test_connection() -> bool:
         client = get_slack_client()
         response = client.auth_test()
         
-        print(f"✅ Slack 연결 성공!")
-        print(f"   Bot: {response['user']}")
-        print(f"   Workspace: {response['team']}")
+        logger.info("✅ Slack 연결 성공!")
+        logger.info(f"   Bot: {response['user']}")
+        logger.info(f"   Workspace: {response['team']}")
         return True
         
     except SlackApiError as e:
-        print(f"❌ Slack 연결 실패: {e.response['error']}")
+        logger.error(f"❌ Slack 연결 실패: {e.response['error']}")
         return False
     except Exception as e:
-        print(f"❌ Slack 연결 오류: {e}")
+        logger.error(f"❌ Slack 연결 오류: {e}")
         return False
 
 
 if __name__ == "__main__":
+    from log_setup import setup_logging
+    setup_logging("slack_sender")
     print("=== Slack 연결 테스트 ===")
     test_connection()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 모듈이 study_summary/ 바로 아래에 있으므로 (python main.py와 같은 import 경로)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
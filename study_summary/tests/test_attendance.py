@@ -0,0 +1,202 @@
+"""
+attendance.py ↔ Apps Script 규칙 일치 확인
+(주간인증계산, 출석데이터인덱싱, 월별주목록가져오기, JSON파일생성)
+
+    cd study_summary && python -m pytest tests
+"""
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from attendance import (
+    ABSENT, LONG_OFF, NONE, OFF, PRESENT,
+    AttendanceMatrix, month_weeks, monthly_summary, weekly_summary,
+)
+
+MEMBERS = ["가영", "나래", "다온"]
+
+
+def make_records(rows):
+    """(이름, 날짜, 출석상태) 목록 → load_export가 돌려주는 형식의 DataFrame"""
+    records = pd.DataFrame(rows, columns=["name", "date", "status"])
+    records["date"] = pd.to_datetime(records["date"])
+    records["timestamp"] = ""
+    records["file_count"] = 1
+    records["links"] = ""
+    records["folder_link"] = ""
+    records["reason"] = ""
+    records["week_num"] = "1"
+    return records
+
+
+def no_long_off():
+    return pd.DataFrame({"name": [], "start": pd.to_datetime([]), "end": pd.to_datetime([])})
+
+
+def build(rows, year, month, long_off=None):
+    """run_attendance와 같은 범위(마지막 주의 일요일까지)로 행렬 만들기"""
+    weeks = month_weeks(year, month)
+    first = date(year, month, 1)
+    last = max(date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1), weeks[-1] + timedelta(days=6))
+    records = make_records(rows)
+    matrix = AttendanceMatrix(records, long_off if long_off is not None else no_long_off(), MEMBERS, first, last)
+    return matrix, records
+
+
+def reference_week(index, long_off_days, name, monday, completed):
+    """주간인증계산을 날짜별로 그대로 옮긴 참조 구현"""
+    certified = long_off = 0
+    for d in range(7):
+        day = monday + timedelta(days=d)
+        if (name, day) in long_off_days:
+            long_off += 1
+            continue
+        if index.get((name, day)) == "O":
+            certified += 1
+    required = max(0, 4 - long_off)
+    if long_off == 7:
+        return certified, long_off, 0, 0, True
+    absences = min(4, required - certified) if completed and certified < required else 0
+    return certified, long_off, required, absences, False
+
+
+def test_duplicate_records_prefer_o_then_last():
+    matrix, records = build([
+        ("가영", "2026-10-05", "X"),
+        ("가영", "2026-10-05", "O"),
+        ("가영", "2026-10-05", "OFF"),
+        ("나래", "2026-10-05", "X"),
+        ("나래", "2026-10-05", "OFF"),
+        ("다온", "2026-10-05", "O"),
+        ("다온", "2026-10-05", "O"),
+    ], 2026, 10)
+    day = 4
+    assert matrix.status[0, day] == PRESENT
+    assert matrix.row[0, day] == 1
+    assert matrix.status[1, day] == OFF
+    assert matrix.row[1, day] == 4
+    assert matrix.status[2, day] == PRESENT
+    assert matrix.row[2, day] == 6
+
+
+def test_records_outside_members_or_range_are_ignored():
+    matrix, _ = build([
+        ("외부인", "2026-10-05", "O"),
+        ("가영", "2026-09-30", "O"),
+        ("가영", "2026-11-09", "O"),
+    ], 2026, 10)
+    assert (matrix.status == NONE).all()
+
+
+def test_partial_weeks_follow_the_month_of_their_monday():
+    # 2026-10-01은 목요일: 9/28 주는 9월, 10/26~11/1 주는 10월 4주차
+    assert month_weeks(2026, 10) == [date(2026, 10, 5), date(2026, 10, 12), date(2026, 10, 19), date(2026, 10, 26)]
+    rows = [("가영", f"2026-10-0{d}", "O") for d in (1, 2, 3, 4)]
+    rows += [("가영", d, "O") for d in ("2026-10-26", "2026-10-28", "2026-10-30", "2026-11-01")]
+    matrix, _ = build(rows, 2026, 10)
+    weekly = weekly_summary(matrix, 2026, 10, today=date(2026, 11, 10))
+    assert weekly["인증"][0].tolist() == [0, 0, 0, 4]
+    assert weekly["결석"][0].tolist() == [4, 4, 4, 0]
+
+
+def test_only_completed_weeks_count_absences():
+    matrix, _ = build([("가영", "2026-10-19", "O")], 2026, 10)
+    # 10/19 주는 일요일(10/25)이 지나지 않았으므로 진행중
+    weekly = weekly_summary(matrix, 2026, 10, today=date(2026, 10, 25))
+    assert weekly["완료"].tolist() == [True, True, False, False]
+    assert weekly["결석"][0].tolist() == [4, 4, 0, 0]
+    weekly = weekly_summary(matrix, 2026, 10, today=date(2026, 10, 26))
+    assert weekly["결석"][0].tolist() == [4, 4, 3, 0]
+
+
+def test_long_off_reduces_required_and_skips_attendance():
+    long_off = pd.DataFrame({
+        "name": ["나래", "가영"],
+        "start": pd.to_datetime(["2026-10-05", "2026-10-12"]),
+        "end": pd.to_datetime(["2026-10-11", "2026-10-13"]),
+    })
+    rows = [("나래", "2026-10-06", "O"), ("가영", "2026-10-12", "O"), ("가영", "2026-10-14", "O")]
+    matrix, _ = build(rows, 2026, 10, long_off=long_off)
+    weekly = weekly_summary(matrix, 2026, 10, today=date(2026, 11, 10))
+
+    # 한 주 전체 장기오프: 출석이 있어도 필요 0, 결석 0, 인증에도 포함하지 않음
+    assert weekly["전체장기오프"][1].tolist() == [True, False, False, False]
+    assert weekly["필요"][1, 0] == 0
+    assert weekly["결석"][1, 0] == 0
+    assert weekly["인증"][1, 0] == 0
+    # 장기오프 이틀: 필요 2회, 장기오프 날의 출석은 인증에서 제외
+    assert weekly["장기오프"][0, 1] == 2
+    assert weekly["필요"][0, 1] == 2
+    assert weekly["인증"][0, 1] == 1
+    assert weekly["결석"][0, 1] == 1
+
+
+def test_long_off_record_counts_as_long_off_day():
+    matrix, _ = build([("다온", f"2026-10-{d}", "LONG_OFF") for d in range(5, 12)], 2026, 10)
+    weekly = weekly_summary(matrix, 2026, 10, today=date(2026, 11, 10))
+    assert bool(weekly["전체장기오프"][2, 0])
+    assert weekly["결석"][2, 0] == 0
+
+
+def test_weekly_summary_matches_reference_on_random_records():
+    rng = random.Random(7)
+    # 장기오프는 신청 기간으로만 (LONG_OFF 기록은 test_long_off_record_counts_as_long_off_day)
+    statuses = ["O", "O", "X", "OFF", "미제출"]
+    rows = []
+    for _ in range(250):
+        day = date(2026, 11, 23) + timedelta(days=rng.randrange(50))
+        rows.append((rng.choice(MEMBERS), day.isoformat(), rng.choice(statuses)))
+    long_off = pd.DataFrame({
+        "name": ["가영", "다온"],
+        "start": pd.to_datetime(["2026-12-08", "2026-12-26"]),
+        "end": pd.to_datetime(["2026-12-16", "2027-01-02"]),
+    })
+    today = date(2026, 12, 30)
+    matrix, _ = build(rows, 2026, 12, long_off=long_off)
+    weekly = weekly_summary(matrix, 2026, 12, today=today)
+
+    # 출석데이터인덱싱: 처음 기록, 단 O가 나오면 O
+    index = {}
+    for name, day, status in rows:
+        key = (name, date.fromisoformat(day))
+        if key not in index or status == "O":
+            index[key] = status
+    long_off_days = {(name, d.date()) for name, start, end in long_off.itertuples(index=False)
+                     for d in pd.date_range(start, end)}
+
+    for m, name in enumerate(MEMBERS):
+        for w, monday in enumerate(weekly["weeks"]):
+            completed = monday + timedelta(days=6) < today
+            expected = reference_week(index, long_off_days, name, monday, completed)
+            actual = (weekly["인증"][m, w], weekly["장기오프"][m, w], weekly["필요"][m, w],
+                      weekly["결석"][m, w], bool(weekly["전체장기오프"][m, w]))
+            assert tuple(int(x) if not isinstance(x, bool) else x for x in actual) == expected, (name, monday)
+
+
+def test_monthly_summary_december_rolls_over_to_january():
+    # 2026-12-28(월) 주는 2027-01-03까지 이어지지만 월간 집계는 12월 31일까지
+    rows = [
+        ("가영", "2026-12-01", "O"),
+        ("가영", "2026-12-31", "X"),
+        ("가영", "2027-01-01", "O"),
+        ("가영", "2027-01-02", "X"),
+        ("나래", "2026-12-15", "OFF"),
+        ("나래", "2026-12-16", "LONG_OFF"),
+    ]
+    matrix, records = build(rows, 2026, 12)
+    assert matrix.status.shape[1] == 34
+    summary = monthly_summary(matrix, records, 2026, 12)
+
+    assert (summary["가영"]["출석"], summary["가영"]["결석"]) == (1, 1)
+    assert sorted(summary["가영"]["기록"], key=int) == ["1", "31"]
+    assert (summary["나래"]["오프"], summary["나래"]["장기오프"]) == (1, 1)
+    assert summary["다온"]["기록"] == {}
+    assert np.array_equal(
+        [summary[name]["결석"] for name in MEMBERS],
+        (matrix.status[:, :31] == ABSENT).sum(axis=1),
+    )
+    assert month_weeks(2026, 12)[-1] == date(2026, 12, 28)
+    assert month_weeks(2027, 1)[0] == date(2027, 1, 4)
+    assert LONG_OFF in matrix.status[1]
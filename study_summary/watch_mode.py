@@ -0,0 +1,163 @@
+"""
+watch 모드 - 제출이 들어오는 대로 처리
+
+05:00에 전날 회원을 한꺼번에 생성하는 대신, 낮 동안 오늘 날짜 digest를 주기적으로 확인해
+새로 올라오거나 바뀐 회원만 바로 생성/전송한다. 전송 기록은 전송 원장(delivery_ledger)에
+남으므로 05:00 정기 실행은 남은 회원만 처리하게 된다.
+
+- digest HTML 전체 해시가 이전과 같으면 파싱 없이 종료
+- 회원 섹션별 내용 해시로 새/변경 회원 판단
+- 작성 중인 내용을 여러 번 보내지 않도록 같은 내용이 WATCH_SETTLE_POLLS번 연속
+  확인된 회원만 처리
+"""
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config import DEADLINE_HOUR, WATCH_INTERVAL_MINUTES, WATCH_SETTLE_POLLS
+from delivery_ledger import is_delivered, make_content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def current_study_date(now: Optional[datetime] = None) -> str:
+    """지금 제출을 받고 있는 날짜 (DEADLINE_HOUR시 이전이면 전날)"""
+    now = now or datetime.now()
+    return (now - timedelta(hours=DEADLINE_HOUR)).strftime("%Y-%m-%d")
+
+
+class DigestWatcher:
+    """하루치 digest의 변경 추적"""
+
+    def __init__(self, date: str, settle_polls: int = WATCH_SETTLE_POLLS):
+        self.date = date
+        self.settle_polls = max(1, settle_polls)
+        self._page_hash = None
+        self._members: List[Dict] = []
+        # {회원: (내용 해시, 연속 확인 횟수)}
+        self._seen: Dict[str, Tuple[str, int]] = {}
+        # {회원: 처리한 내용 해시}
+        self._processed: Dict[str, str] = {}
+
+    def _fetch(self) -> List[Dict]:
+        """digest를 가져와 제출 회원 목록 반환 (페이지가 그대로면 이전 파싱 결과 재사용)"""
+        from drive_scanner import fetch_digest_html, parse_digest_html, save_parsed_digest, submitted_results
+
+        html = fetch_digest_html(self.date)
+        page_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        if page_hash == self._page_hash:
+            logger.info(f"  digest 변경 없음 ({self.date})")
+            return self._members
+        self._page_hash = page_hash
+        parsed = parse_digest_html(html)
+        save_parsed_digest(self.date, parsed)
+        self._members = submitted_results(parsed, self.date)
+        logger.info(f"  digest 변경 감지 ({self.date}): 제출 {len(self._members)}명")
+        return self._members
+
+    def poll(self) -> List[Dict]:
+        """
+        digest 확인 후 지금 처리할 회원 목록 반환 (새로 제출했거나 내용이 바뀌고 안정된 회원)
+        """
+        ready = []
+        for member in self._fetch():
+            name = member["name"]
+            content_hash = make_content_hash(member["text_content"])
+            previous, count = self._seen.get(name, (None, 0))
+            count = count + 1 if previous == content_hash else 1
+            self._seen[name] = (content_hash, count)
+
+            if self._processed.get(name) == content_hash:
+                continue
+            if is_delivered((self.date, name, content_hash)):
+                # 다른 실행에서 이미 전송됨
+                self._processed[name] = content_hash
+                continue
+            if count < self.settle_polls:
+                logger.info(f"  ⏳ {name}: 내용 안정 대기 ({count}/{self.settle_polls})")
+                continue
+            ready.append(member)
+        return ready
+
+    def mark_processed(self, members: List[Dict]):
+        """처리 시도한 회원 기록 (실패한 회원은 정기 실행에서 다시 처리)"""
+        for member in members:
+            self._processed[member["name"]] = make_content_hash(member["text_content"])
+
+
+def process_ready(watcher: DigestWatcher, ready: List[Dict]) -> bool:
+    """준비된 회원만 생성 → 전송 (실행 기록은 status='watch'로 남아 정기 실행을 막지 않음)"""
+    from main import ensure_notebooklm_auth, process_members, run_budget_seconds, select_submitted
+    from resilience import export_events, start_budget
+    from run_db import RunRecorder
+
+    recorder = RunRecorder.start(watcher.date)
+    start_budget(run_budget_seconds(None))
+    status, error = "failed", None
+    submitted, generated, delivered = [], [], None
+    try:
+        with recorder.stage("auth"):
+            auth_ok = ensure_notebooklm_auth()
+        if not auth_ok:
+            error = "NotebookLM 인증 실패"
+            logger.error("NotebookLM 인증 실패 - 다음 확인 때 다시 시도")
+            return False
+
+        submitted = select_submitted(ready, recorder)
+        generated, delivered = process_members(submitted, watcher.date, recorder)
+        watcher.mark_processed(ready)
+        status = "watch"
+        return True
+    except Exception as e:
+        logger.error(f"❌ watch 처리 오류: {e}", exc_info=True)
+        error = str(e)
+        watcher.mark_processed(ready)
+        return False
+    finally:
+        # 예산은 이번 실행에만 적용 (데몬/watch 모드의 다음 확인에 남기지 않음)
+        start_budget(0)
+        export_events(recorder)
+        recorder.finish(
+            status,
+            submitted=len(submitted),
+            generated=len(generated),
+            delivered=delivered,
+            error=error,
+        )
+
+
+def run_watch(interval_minutes: float = WATCH_INTERVAL_MINUTES, once: bool = False) -> bool:
+    """
+    watch 모드 실행 (Ctrl+C로 종료)
+
+    Args:
+        interval_minutes: digest 확인 간격 (분)
+        once: True면 한 번만 확인하고 종료
+    """
+    from main import setup_logging
+    setup_logging("watch")
+    logger.info(f"👀 watch 모드 시작 ({interval_minutes:g}분 간격, 안정 확인 {WATCH_SETTLE_POLLS}회)")
+
+    watcher = None
+    try:
+        while True:
+            date = current_study_date()
+            if watcher is None or watcher.date != date:
+                # 날짜가 바뀌면 새로 추적 (전날 남은 회원은 정기 실행이 처리)
+                watcher = DigestWatcher(date)
+            try:
+                ready = watcher.poll()
+            except Exception as e:
+                logger.warning(f"  digest 확인 실패: {e}")
+                ready = []
+            if ready:
+                logger.info(f"  처리 대상: {', '.join(m['name'] for m in ready)}")
+                process_ready(watcher, ready)
+            if once:
+                return True
+            time.sleep(interval_minutes * 60)
+    except KeyboardInterrupt:
+        logger.info("watch 모드 종료")
+        return True